@@ -1,8 +1,25 @@
 # backend/app/agents/base.py
-from abc import ABC, abstractmethod
-from typing import Dict, Any
+import asyncio
+import hashlib
+from abc import ABC
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Tuple, TYPE_CHECKING
+from ..schemas.agent_data import AgentPayload
 from ..schemas.analysis import AnalysisRequest, AgentResult
 
+if TYPE_CHECKING:
+    from ..services.compute import ComputePools
+    from ..services.http import UpstreamClient
+
+
+# True while MasterAgent.run_batch screens a portfolio (see BaseAgent.portfolio_cpu_bound)
+portfolio_run: ContextVar[bool] = ContextVar("portfolio_run", default=False)
+
+
+def normalize_key_part(value: str | None) -> str:
+    return " ".join(value.lower().split()) if value else ""
+
 
 class BaseAgent(ABC):
     """
@@ -10,16 +27,109 @@ class BaseAgent(ABC):
     Every agent returns an AgentResult.
     """
 
+    # Time budget for a single run (seconds); None falls back to Settings.AGENT_TIMEOUT_SECONDS
+    timeout: float | None = None
+    # How long a result stays valid in the agent cache (seconds); None uses
+    # Settings.AGENT_CACHE_TTL_SECONDS, 0 disables caching for this agent
+    cache_ttl: float | None = None
+    # "thread" or "process": run() executes compute() on the shared compute pools instead of the
+    # event loop. "process" agents are pickled into the worker, so keep them free of open clients.
+    cpu_bound: str | None = None
+    # Pool used instead of cpu_bound while a portfolio is being screened, when many runs of this
+    # agent are in flight at once; "process" spreads them over every core. None keeps cpu_bound.
+    portfolio_cpu_bound: str | None = None
+    # Names of agents whose results this one reads. The MasterAgent starts it once they have all
+    # finished and passes their results to run_with_context(); a missing or failed upstream
+    # agent is simply absent from that mapping.
+    depends_on: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        # Checked when the class is defined, not when a pipeline first calls it. Subclasses that
+        # declare abstract methods of their own are intermediate bases and are left alone.
+        super().__init_subclass__(**kwargs)
+        if any(getattr(value, "__isabstractmethod__", False) for value in vars(cls).values()):
+            return
+        if cls.run is BaseAgent.run and (cls.cpu_bound is None or cls.compute is BaseAgent.compute):
+            raise TypeError(f"{cls.__name__} must implement run(), or declare cpu_bound and implement compute()")
+
     def __init__(self, name: str | None = None) -> None:
         self.name = name or self.__class__.__name__
+        # Set by the AgentRegistry; without pools, offloaded work falls back to asyncio.to_thread
+        self.compute_pools: "ComputePools | None" = None
+        # Pooled upstream clients by source ("clinicaltrials", "uspto", "pubmed", "iqvia"), set by
+        # the AgentRegistry when Settings.UPSTREAM_LIVE_DATA is on
+        self.upstream_clients: "Dict[str, UpstreamClient]" = {}
+
+    async def startup(self) -> None:
+        """Open long-lived resources (HTTP clients, caches). Called once by the registry."""
+
+    async def shutdown(self) -> None:
+        """Release whatever startup() acquired."""
+
+    async def data_version(self) -> str:
+        """
+        Version of the upstream data this agent reads (e.g. date of the latest USPTO filing).
+        A change marks previously stored results of this agent as stale.
+        """
+        return ""
+
+    async def fingerprint(self, request: AnalysisRequest) -> str:
+        """Identifies the inputs a result was computed from: agent, molecule, indication, data version."""
+        payload = "|".join(
+            (
+                self.name,
+                normalize_key_part(request.molecule_name),
+                normalize_key_part(request.target_indication),
+                await self.data_version(),
+            )
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
 
-    @abstractmethod
     async def run(self, request: AnalysisRequest) -> AgentResult:
-        ...
+        """Async agents override this; CPU-bound agents declare cpu_bound and implement compute()."""
+        return await self.offload(self.compute, request, kind=self.pool_kind())
+
+    def skip_reason(self, upstream: Dict[str, AgentResult]) -> str | None:
+        """Gate on upstream results: a reason string skips this agent (status SKIPPED)."""
+        return None
+
+    async def run_with_context(self, request: AnalysisRequest, upstream: Dict[str, AgentResult]) -> AgentResult:
+        """Entry point used by the MasterAgent; agents with depends_on override it to use upstream."""
+        return await self.run(request)
+
+    def compute(self, request: AnalysisRequest) -> AgentResult:
+        """Synchronous body of a CPU-bound agent; runs on a pool worker."""
+        raise NotImplementedError(f"{self.name} declares cpu_bound but does not implement compute()")
+
+    def pool_kind(self) -> str:
+        """Compute pool for this agent's CPU work in the current context."""
+        if portfolio_run.get() and self.portfolio_cpu_bound is not None:
+            return self.portfolio_cpu_bound
+        return self.cpu_bound or "thread"
+
+    async def offload(self, fn: Callable[..., Any], *args: Any, kind: str = "thread") -> Any:
+        """Runs fn(*args) on the managed thread or process pool (bounded; may raise PoolSaturatedError)."""
+        if self.compute_pools is None:
+            return await asyncio.to_thread(fn, *args)
+        return await self.compute_pools.get(kind).submit(fn, *args)
+
+    def upstream(self, source: str) -> "UpstreamClient | None":
+        """The shared client for one upstream source, or None to use offline data."""
+        return self.upstream_clients.get(source)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Pools hold executors and clients hold sockets; neither can cross into a worker process
+        state = self.__dict__.copy()
+        state["compute_pools"] = None
+        state["upstream_clients"] = {}
+        return state
 
-    def _result(self, summary: str, raw_data: Dict[str, Any] | None = None) -> AgentResult:
-        return AgentResult(
+    def _result(self, summary: str, raw_data: "AgentPayload | Dict[str, Any] | None" = None) -> AgentResult:
+        # Built from our own values, so skip validation (and its copy of raw_data); the payload
+        # stays typed and is serialized as it is
+        return AgentResult.model_construct(
             agent_name=self.name,
             summary=summary,
             raw_data=raw_data or {},
+            generated_at=datetime.now(timezone.utc),
         )
@@ -0,0 +1,228 @@
+# backend/app/agents/cache.py
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+from .base import BaseAgent, normalize_key_part
+from ..schemas.analysis import AnalysisRequest, AgentResult
+
+logger = logging.getLogger(__name__)
+
+
+def _stamped(result: AgentResult, fingerprint: str) -> AgentResult:
+    if result.input_fingerprint is not None:
+        return result
+    return result.model_copy(update={"input_fingerprint": fingerprint})
+
+
+class _Flight:
+    """One in-flight computation shared by every caller asking for the same key."""
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class AgentResultCache:
+    """
+    Two-tier cache of AgentResults keyed by agent, molecule, indication and input fingerprint.
+
+    - In-process LRU bounded by entry count, with a TTL per agent (BaseAgent.cache_ttl).
+    - Optional Redis tier shared between processes (results stored as JSON with the same TTL).
+    - Concurrent misses for the same key share one computation.
+
+    The fingerprint covers the agent's data_version(), so a version bump misses instead of
+    returning results computed from the old data. Cached results carry that fingerprint.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        default_ttl: float = 3600.0,
+        redis_url: str | None = None,
+        redis_client: Any = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, Tuple[float, AgentResult]]" = OrderedDict()
+        self._in_flight: Dict[str, _Flight] = {}
+        # A client passed in (the Coordinator's) is shared, so close() leaves it open
+        self._redis: Any = redis_client
+        self._owns_redis = False
+        self.hits = 0
+        self.misses = 0
+
+        if redis_client is None and redis_url:
+            try:
+                import redis.asyncio as redis_asyncio
+            except ImportError:
+                logger.warning("redis package not installed; agent cache stays in-process only")
+            else:
+                self._redis = redis_asyncio.from_url(redis_url)
+                self._owns_redis = True
+
+    @staticmethod
+    def base_key(agent: BaseAgent, request: AnalysisRequest) -> str:
+        """Prefix shared by every entry of one agent/request, whatever its fingerprint or upstream."""
+        return ":".join(
+            (
+                "agent-result",
+                agent.name,
+                normalize_key_part(request.molecule_name),
+                normalize_key_part(request.target_indication),
+            )
+        )
+
+    @classmethod
+    def key(
+        cls,
+        agent: BaseAgent,
+        request: AnalysisRequest,
+        fingerprint: str,
+        upstream: Dict[str, AgentResult] | None = None,
+    ) -> str:
+        key = f"{cls.base_key(agent, request)}|{fingerprint}"
+        if not agent.depends_on:
+            return key
+        # Results built on upstream outputs are only reusable with the same upstream inputs
+        upstream = upstream or {}
+        inputs = ",".join(
+            f"{name}={upstream[name].input_fingerprint if name in upstream else '-'}" for name in agent.depends_on
+        )
+        return f"{key}|{hashlib.sha256(inputs.encode()).hexdigest()[:16]}"
+
+    def ttl_for(self, agent: BaseAgent) -> float:
+        return agent.cache_ttl if agent.cache_ttl is not None else self.default_ttl
+
+    async def get_or_compute(
+        self,
+        agent: BaseAgent,
+        request: AnalysisRequest,
+        upstream: Dict[str, AgentResult] | None = None,
+        fingerprint: str | None = None,
+    ) -> AgentResult:
+        """Cached result for the agent's current inputs; `fingerprint` saves recomputing agent.fingerprint()."""
+        upstream = upstream or {}
+        if fingerprint is None:
+            fingerprint = await agent.fingerprint(request)
+        ttl = self.ttl_for(agent)
+        if ttl <= 0:
+            return _stamped(await agent.run_with_context(request, upstream), fingerprint)
+
+        key = self.key(agent, request, fingerprint, upstream)
+        cached = self._get_local(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        flight = self._in_flight.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.create_task(self._fill(key, ttl, agent, request, upstream, fingerprint)))
+            self._in_flight[key] = flight
+            flight.task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            # Only abandon the upstream call once nobody is waiting for it any more
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    async def _fill(
+        self,
+        key: str,
+        ttl: float,
+        agent: BaseAgent,
+        request: AnalysisRequest,
+        upstream: Dict[str, AgentResult],
+        fingerprint: str,
+    ) -> AgentResult:
+        result = await self._get_remote(key)
+        if result is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            result = _stamped(await agent.run_with_context(request, upstream), fingerprint)
+            await self._set_remote(key, ttl, result, index=self.base_key(agent, request))
+        self._set_local(key, ttl, result)
+        return result
+
+    def _get_local(self, key: str) -> AgentResult | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def _set_local(self, key: str, ttl: float, result: AgentResult) -> None:
+        self._entries[key] = (time.monotonic() + ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _get_remote(self, key: str) -> AgentResult | None:
+        if self._redis is None:
+            return None
+        try:
+            payload = await self._redis.get(key)
+        except Exception as exc:
+            logger.warning("Redis read failed for %s: %r", key, exc)
+            return None
+        return AgentResult.model_validate_json(payload) if payload else None
+
+    @staticmethod
+    def _index_key(base: str) -> str:
+        # Redis set of the keys stored under one base key, so discard() can find them without SCAN
+        return f"agent-result-keys:{base}"
+
+    async def _set_remote(self, key: str, ttl: float, result: AgentResult, index: str) -> None:
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(key, result.model_dump_json(), ex=max(1, int(ttl)))
+            await self._redis.sadd(self._index_key(index), key)
+            await self._redis.pexpire(self._index_key(index), max(1, int(ttl)) * 1000)
+        except Exception as exc:
+            logger.warning("Redis write failed for %s: %r", key, exc)
+
+    async def discard(self, agent: BaseAgent, request: AnalysisRequest) -> None:
+        """
+        Forgets every entry for one agent/request (any fingerprint or upstream inputs), locally and
+        in Redis, so the next call recomputes it.
+        """
+        base = self.base_key(agent, request)
+        for key in [k for k in self._entries if k.startswith(base + "|")]:
+            del self._entries[key]
+        if self._redis is None:
+            return
+        index = self._index_key(base)
+        try:
+            keys = await self._redis.smembers(index)
+            await self._redis.delete(index, *keys)
+        except Exception as exc:
+            logger.warning("Redis discard failed for %s: %r", base, exc)
+
+    def invalidate(self, agent_name: str | None = None) -> None:
+        """Drops local entries, for one agent or all of them."""
+        if agent_name is None:
+            self._entries.clear()
+            return
+        prefix = f"agent-result:{agent_name}:"
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            del self._entries[key]
+
+    async def close(self) -> None:
+        for flight in list(self._in_flight.values()):
+            flight.task.cancel()
+        if self._redis is not None and self._owns_redis:
+            await self._redis.aclose()
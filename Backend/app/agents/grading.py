@@ -1,8 +1,22 @@
 # backend/app/agents/grading.py
-from dataclasses import dataclass
-from typing import List, Dict
+from dataclasses import astuple, dataclass
+from typing import List, Dict, Sequence, Tuple, TYPE_CHECKING
+from ..schemas.agent_data import payload_field
 from ..schemas.analysis import AgentResult, GradingBreakdown
 
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# Grading dimensions, in the order used by GradingWeights and score matrices
+DIMENSIONS: Tuple[str, ...] = (
+    "market_demand",
+    "production_feasibility",
+    "demographics",
+    "patents_and_trials",
+    "competition",
+)
+
 
 @dataclass
 class GradingWeights:
@@ -16,6 +30,37 @@ class GradingWeights:
     patents_and_trials: float = 0.2
     competition: float = 0.15
 
+    def as_tuple(self) -> Tuple[float, ...]:
+        """Weights in DIMENSIONS order."""
+        return astuple(self)
+
+
+@dataclass(frozen=True)
+class DimensionSource:
+    """Which grading dimension an agent feeds, and the payload fields holding its 0–1 scores."""
+    dimension: str
+    score_keys: Tuple[str, ...]
+
+
+# agent_name -> where its scores go. Agents not listed here do not affect the grade.
+DIMENSION_SOURCES: Dict[str, DimensionSource] = {
+    "IQVIAInsightsAgent": DimensionSource("market_demand", ("market_demand_score",)),
+    "EXIMTrendAgent": DimensionSource("market_demand", ("overall_market_demand_score",)),
+    "ProcessDesignAgent": DimensionSource("production_feasibility", ("production_feasibility_score",)),
+    "TechnoEconomicAgent": DimensionSource("production_feasibility", ("production_feasibility_score",)),
+    "DemographicAgent": DimensionSource("demographics", ("demographic_overall_score",)),
+    "PatentLandscapeAgent": DimensionSource("patents_and_trials", ("patent_overall_score",)),
+    "ClinicalTrialAgent": DimensionSource("patents_and_trials", ("patents_and_trials_score",)),
+    "CompetitionAgent": DimensionSource("competition", ("competition_overall_score",)),
+}
+
+
+def register_dimension_source(agent_name: str, dimension: str, score_keys: Tuple[str, ...]) -> None:
+    """Lets plugin agents (see AgentRegistry.discover) contribute to a grading dimension."""
+    if dimension not in DIMENSIONS:
+        raise ValueError(f"Unknown grading dimension '{dimension}'")
+    DIMENSION_SOURCES[agent_name] = DimensionSource(dimension, tuple(score_keys))
+
 
 class GradingAgent:
     """
@@ -27,65 +72,53 @@ class GradingAgent:
 
     def _extract_scores(self, results: List[AgentResult]) -> Dict[str, float]:
         """
-        Reads raw_data fields from agents and computes average scores per dimension.
+        Reads the agents' payload scores and computes average scores per dimension.
         This is where your 'beautiful mathematical formula' can become sophisticated.
         """
-
-        market_scores = []
-        production_scores = []
-        demo_scores = []
-        patents_scores = []
-        competition_scores = []
+        collected: Dict[str, List[float]] = {dimension: [] for dimension in DIMENSIONS}
 
         for r in results:
-            rd = r.raw_data
-            name = r.agent_name.lower()
-
-            # Market, Sales & Demand group
-            if "iqvia" in name or "exim" in name:
-                if "market_demand_score" in rd:
-                    market_scores.append(rd["market_demand_score"])
-                if "overall_market_demand_score" in rd:
-                    market_scores.append(rd["overall_market_demand_score"])
-
-            # Production / Chemical Engineering group
-            if "processdesign" in name or "process design" in name:
-                if "production_feasibility_score" in rd:
-                    production_scores.append(rd["production_feasibility_score"])
-            if "techno" in name:
-                if "production_feasibility_score" in rd:
-                    production_scores.append(rd["production_feasibility_score"])
-
-            # Demographic group
-            if "demographic" in name:
-                if "demographic_overall_score" in rd:
-                    demo_scores.append(rd["demographic_overall_score"])
-
-            # Patent & Trials group
-            if "patent" in name:
-                if "patent_overall_score" in rd:
-                    patents_scores.append(rd["patent_overall_score"])
-            if "clinical" in name:
-                if "patents_and_trials_score" in rd:
-                    patents_scores.append(rd["patents_and_trials_score"])
-
-            # Competition group
-            if "competition" in name:
-                if "competition_overall_score" in rd:
-                    competition_scores.append(rd["competition_overall_score"])
+            source = DIMENSION_SOURCES.get(r.agent_name)
+            if source is None:
+                continue
+            for key in source.score_keys:
+                value = payload_field(r.raw_data, key)
+                if value is not None:
+                    collected[source.dimension].append(value)
 
         def avg(lst: List[float], default: float = 0.5) -> float:
             return sum(lst) / len(lst) if lst else default
 
-        scores = {
-            "market_demand": avg(market_scores),
-            "production_feasibility": avg(production_scores),
-            "demographics": avg(demo_scores),
-            "patents_and_trials": avg(patents_scores),
-            "competition": avg(competition_scores),
-        }
+        return {dimension: avg(values) for dimension, values in collected.items()}
 
-        return scores
+    @staticmethod
+    def dimension_for(agent_name: str) -> str | None:
+        source = DIMENSION_SOURCES.get(agent_name)
+        return source.dimension if source else None
+
+    def missing_dimensions(self, agent_statuses: Dict[str, str]) -> Dict[str, str]:
+        """
+        Dimensions where no contributing agent completed, with the reason.
+        TIMED_OUT wins over FAILED when the contributors missed for mixed reasons; SKIPPED only
+        when every contributor was gated out.
+        """
+        per_dimension: Dict[str, List[str]] = {}
+        for agent_name, status in agent_statuses.items():
+            dimension = self.dimension_for(agent_name)
+            if dimension is not None:
+                per_dimension.setdefault(dimension, []).append(status)
+
+        missing: Dict[str, str] = {}
+        for dimension, statuses in per_dimension.items():
+            if "COMPLETED" in statuses:
+                continue
+            if "TIMED_OUT" in statuses:
+                missing[dimension] = "TIMED_OUT"
+            elif all(status == "SKIPPED" for status in statuses):
+                missing[dimension] = "SKIPPED"
+            else:
+                missing[dimension] = "FAILED"
+        return missing
 
     def grade(self, results: List[AgentResult]) -> GradingBreakdown:
         scores = self._extract_scores(results)
@@ -106,3 +139,37 @@ class GradingAgent:
             competition=scores["competition"],
             overall_score=overall,
         )
+
+    def grade_many(self, portfolio: List[List[AgentResult]]) -> List[GradingBreakdown]:
+        """Grades many molecules in one vectorized pass (see GradingEngine)."""
+        from .grading_engine import GradingEngine
+
+        engine = GradingEngine()
+        scores = engine.score_matrix(portfolio)
+        overall = engine.overall(scores, [self.weights])[:, 0]
+        return [
+            GradingBreakdown(**dict(zip(DIMENSIONS, row.tolist())), overall_score=float(total))
+            for row, total in zip(scores, overall)
+        ]
+
+    def weight_sensitivity(
+        self,
+        portfolio: List[List[AgentResult]],
+        scenarios: "Sequence[GradingWeights] | np.ndarray | int",
+        seed: int | None = None,
+    ) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        How robust the portfolio ranking is to the choice of weights.
+        Returns each molecule's overall score and 0-based rank under the current weights, and its
+        (best, median, worst) rank across the scenarios, all from one GradingEngine.sweep.
+        An int draws that many random weightings (GradingEngine.random_weights) instead.
+        """
+        from .grading_engine import GradingEngine
+
+        engine = GradingEngine()
+        if isinstance(scenarios, int):
+            scenarios = engine.random_weights(scenarios, seed=seed)
+        scores = engine.score_matrix(portfolio)
+        current = engine.sweep(scores, [self.weights])
+        stability = engine.rank_stability(engine.sweep(scores, scenarios))
+        return current["overall"][:, 0], current["rank_of"][:, 0], stability
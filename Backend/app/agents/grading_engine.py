@@ -0,0 +1,109 @@
+# backend/app/agents/grading_engine.py
+from typing import Dict, Sequence
+import numpy as np
+from .grading import DIMENSIONS, DIMENSION_SOURCES, DimensionSource, GradingWeights
+from ..schemas.agent_data import payload_field
+from ..schemas.analysis import AgentResult
+
+
+class GradingEngine:
+    """
+    Bulk grading with NumPy.
+
+    score_matrix turns a portfolio (one list of AgentResults per molecule) into an
+    (n_molecules, n_dimensions) matrix; overall / sweep then apply one or many weight vectors
+    with a single matrix product, which is what makes weight-sensitivity analysis cheap.
+    """
+
+    def __init__(
+        self,
+        sources: Dict[str, DimensionSource] | None = None,
+        default_score: float = 0.5,
+    ) -> None:
+        self.sources = sources if sources is not None else DIMENSION_SOURCES
+        self.default_score = default_score
+        self._column = {dimension: i for i, dimension in enumerate(DIMENSIONS)}
+
+    def score_matrix(self, portfolio: Sequence[Sequence[AgentResult]]) -> np.ndarray:
+        """Per-dimension average scores; dimensions with no data get default_score."""
+        n = len(portfolio)
+        totals = np.zeros((n, len(DIMENSIONS)), dtype=np.float64)
+        counts = np.zeros((n, len(DIMENSIONS)), dtype=np.int32)
+
+        for row, results in enumerate(portfolio):
+            for r in results:
+                source = self.sources.get(r.agent_name)
+                if source is None:
+                    continue
+                col = self._column[source.dimension]
+                for key in source.score_keys:
+                    value = payload_field(r.raw_data, key)
+                    if value is not None:
+                        totals[row, col] += value
+                        counts[row, col] += 1
+
+        scores = np.full_like(totals, self.default_score)
+        np.divide(totals, counts, out=scores, where=counts > 0)
+        return scores
+
+    @staticmethod
+    def weight_matrix(weights: Sequence[GradingWeights] | np.ndarray) -> np.ndarray:
+        """(n_scenarios, n_dimensions) array; raw arrays are passed through unchanged."""
+        if isinstance(weights, np.ndarray):
+            matrix = np.atleast_2d(weights).astype(np.float64, copy=False)
+        else:
+            matrix = np.array([w.as_tuple() for w in weights], dtype=np.float64)
+        if matrix.shape[1] != len(DIMENSIONS):
+            raise ValueError(f"Expected {len(DIMENSIONS)} weights per scenario, got {matrix.shape[1]}")
+        return matrix
+
+    def overall(
+        self,
+        scores: np.ndarray,
+        weights: Sequence[GradingWeights] | np.ndarray,
+    ) -> np.ndarray:
+        """(n_molecules, n_scenarios) overall scores."""
+        return scores @ self.weight_matrix(weights).T
+
+    def sweep(
+        self,
+        scores: np.ndarray,
+        weights: Sequence[GradingWeights] | np.ndarray,
+        top_k: int | None = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Re-ranks the whole portfolio under every weight scenario at once.
+
+        Returns:
+        - "overall": (n_molecules, n_scenarios) scores
+        - "ranking": (k, n_scenarios) molecule row indices, best first, per scenario
+        - "rank_of": (n_molecules, n_scenarios) 0-based rank of each molecule (full sweeps only)
+        """
+        overall = self.overall(scores, weights)
+        n = overall.shape[0]
+
+        if top_k is not None and top_k < n:
+            # Partial selection is O(n) per scenario; only the top slice gets sorted
+            candidates = np.argpartition(-overall, top_k - 1, axis=0)[:top_k]
+            order = np.argsort(-np.take_along_axis(overall, candidates, axis=0), axis=0, kind="stable")
+            ranking = np.take_along_axis(candidates, order, axis=0)
+            return {"overall": overall, "ranking": ranking}
+
+        ranking = np.argsort(-overall, axis=0, kind="stable")
+        positions = np.broadcast_to(np.arange(n, dtype=ranking.dtype)[:, None], ranking.shape)
+        rank_of = np.empty_like(ranking)
+        np.put_along_axis(rank_of, ranking, positions, axis=0)
+        return {"overall": overall, "ranking": ranking, "rank_of": rank_of}
+
+    def rank_stability(self, sweep_result: Dict[str, np.ndarray]) -> np.ndarray:
+        """Per-molecule (min, median, max) rank across scenarios, from a full sweep."""
+        rank_of = sweep_result["rank_of"]
+        return np.stack(
+            [rank_of.min(axis=1), np.median(rank_of, axis=1), rank_of.max(axis=1)], axis=1
+        )
+
+    @staticmethod
+    def random_weights(n_scenarios: int, seed: int | None = None) -> np.ndarray:
+        """Weight vectors drawn uniformly from the simplex (each row sums to 1)."""
+        rng = np.random.default_rng(seed)
+        return rng.dirichlet(np.ones(len(DIMENSIONS)), size=n_scenarios)
@@ -1,24 +1,74 @@
 # backend/app/agents/market/exim_trends.py
-from typing import Any, Dict
+import asyncio
+from typing import Dict
 from ..base import BaseAgent
+from ...core.config import get_settings
+from ...schemas.agent_data import EXIMTrendData
 from ...schemas.analysis import AnalysisRequest
+from ...services.market_store import MarketStore
+
+
+def _growth(by_year: Dict[int, float]) -> float:
+    years = sorted(by_year)
+    if len(years) < 2 or by_year[years[0]] <= 0:
+        return 0.0
+    return (by_year[years[-1]] / by_year[years[0]]) ** (1 / (years[-1] - years[0])) - 1
 
 
 class EXIMTrendAgent(BaseAgent):
     """
-    Simulated EXIM trade trend agent.
+    EXIM trade trend agent.
+    Reads the columnar trade store (HS codes mapped from the molecule) when
+    Settings.MARKET_STORE_PATH is set; simulated otherwise.
     """
 
+    def __init__(self, name: str | None = None) -> None:
+        super().__init__(name)
+        self.settings = get_settings()
+        self.store: MarketStore | None = None
+
+    async def startup(self) -> None:
+        if self.settings.MARKET_STORE_PATH:
+            self.store = await asyncio.to_thread(MarketStore, self.settings.MARKET_STORE_PATH)
+
     async def run(self, request: AnalysisRequest):
-        data: Dict[str, Any] = {
-            "import_dependency_score": 0.3,   # lower is better (less dependency)
-            "export_opportunity_score": 0.75,
-            "overall_market_demand_score": 0.78,
-        }
-
-        summary = (
-            "EXIM analysis suggests moderate import dependency and strong export opportunities, "
-            "indicating a favourable landscape for generic manufacturing."
-        )
+        trade = None
+        if self.store is not None and request.molecule_name:
+            hs_codes = self.store.hs_codes_for(request.molecule_name)
+            trade = await self.offload(
+                self.store.trade_summary, hs_codes, self.settings.EXIM_REPORTER_COUNTRY
+            )
+
+        if trade is None:
+            data = EXIMTrendData(
+                import_dependency_score=0.3,   # lower is better (less dependency)
+                export_opportunity_score=0.75,
+                overall_market_demand_score=0.78,
+            )
+
+            summary = (
+                "EXIM analysis suggests moderate import dependency and strong export opportunities, "
+                "indicating a favourable landscape for generic manufacturing."
+            )
+        else:
+            imports, exports = trade["imports_by_year"], trade["exports_by_year"]
+            latest = max([*imports, *exports])
+            latest_imports, latest_exports = imports.get(latest, 0.0), exports.get(latest, 0.0)
+            total = latest_imports + latest_exports
+            import_dependency = latest_imports / total if total else 0.5
+            export_opportunity = min(1.0, max(0.0, 0.5 + _growth(exports) * 2.5))
+            data = EXIMTrendData(
+                import_dependency_score=round(import_dependency, 4),
+                export_opportunity_score=round(export_opportunity, 4),
+                overall_market_demand_score=round(
+                    0.5 * export_opportunity + 0.5 * (1 - import_dependency), 4
+                ),
+                data_year=latest,
+            )
+
+            summary = (
+                f"EXIM data for {latest} shows an import dependency of {import_dependency:.0%} of trade "
+                f"value and an export opportunity score of {export_opportunity:.2f} based on export growth."
+            )
 
         return self._result(summary=summary, raw_data=data)
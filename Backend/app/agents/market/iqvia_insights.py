@@ -1,31 +1,72 @@
 # backend/app/agents/market/iqvia_insights.py
-from typing import Any, Dict
+import asyncio
+import logging
 from ..base import BaseAgent
+from ...core.config import get_settings
+from ...schemas.agent_data import IQVIAInsightsData
 from ...schemas.analysis import AnalysisRequest
+from ...services.http import UPSTREAM_ERRORS
+from ...services.market_store import MarketStore
+
+logger = logging.getLogger(__name__)
 
 
 class IQVIAInsightsAgent(BaseAgent):
     """
-    Simulated agent for IQVIA-like market insights.
-    In a real system this would call external APIs.
+    Agent for IQVIA-like market insights.
+    Aggregates the columnar sales store when Settings.MARKET_STORE_PATH is set, else the
+    licensed IQVIA API when it is configured and live data is on; simulated otherwise.
     """
 
+    # Sales figures refresh intra-day
+    cache_ttl = 6 * 3600.0
+
+    def __init__(self, name: str | None = None) -> None:
+        super().__init__(name)
+        self.settings = get_settings()
+        self.store: MarketStore | None = None
+
+    async def startup(self) -> None:
+        if self.settings.MARKET_STORE_PATH:
+            self.store = await asyncio.to_thread(MarketStore, self.settings.MARKET_STORE_PATH)
+
     async def run(self, request: AnalysisRequest):
         molecule = request.molecule_name or "the molecule"
         indication = request.target_indication or "the indication"
 
-        data: Dict[str, Any] = {
-            "estimated_market_size_billion_usd": 1.8,
-            "cagr": 0.09,
-            "key_regions": ["US", "EU5", "India"],
-            # 0–1 score reflecting demand strength (hard-coded heuristic)
-            "market_demand_score": 0.82,
-        }
+        sales = None
+        if self.store is not None and request.molecule_name:
+            sales = await self.offload(self.store.sales_summary, request.molecule_name)
+        elif self.upstream("iqvia") is not None and request.molecule_name:
+            try:
+                sales = await self.upstream("iqvia").sales_summary(request.molecule_name)
+            except UPSTREAM_ERRORS as exc:
+                logger.warning("IQVIA sales lookup failed for %s: %r", request.molecule_name, exc)
+
+        if sales is None:
+            data = IQVIAInsightsData(
+                estimated_market_size_billion_usd=1.8,
+                cagr=0.09,
+                key_regions=["US", "EU5", "India"],
+                # 0–1 score reflecting demand strength (hard-coded heuristic)
+                market_demand_score=0.82,
+            )
+        else:
+            size_score = min(1.0, sales["market_size_usd"] / self.settings.MARKET_SIZE_REFERENCE_USD)
+            # 0% growth scores 0.5, +20% CAGR or better scores 1
+            growth_score = min(1.0, max(0.0, 0.5 + sales["cagr"] * 2.5))
+            data = IQVIAInsightsData(
+                estimated_market_size_billion_usd=round(sales["market_size_usd"] / 1e9, 3),
+                cagr=round(sales["cagr"], 4),
+                key_regions=sales["key_regions"],
+                data_year=sales["latest_year"],
+                market_demand_score=round(0.5 * size_score + 0.5 * growth_score, 4),
+            )
 
         summary = (
             f"For {molecule} in {indication}, the estimated global market size is "
-            f"~${data['estimated_market_size_billion_usd']}B with ~{int(data['cagr'] * 100)}% CAGR. "
-            f"Strong demand is observed in {', '.join(data['key_regions'])}."
+            f"~${data.estimated_market_size_billion_usd}B with ~{int(data.cagr * 100)}% CAGR. "
+            f"Strong demand is observed in {', '.join(data.key_regions)}."
         )
 
         return self._result(summary=summary, raw_data=data)
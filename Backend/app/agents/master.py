@@ -1,58 +1,574 @@
 # backend/app/agents/master.py
 import asyncio
+import logging
+import time
 import uuid
-from typing import List
-from .base import BaseAgent
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterator, List, Tuple, TYPE_CHECKING
+from .base import BaseAgent, normalize_key_part, portfolio_run
+from .cache import AgentResultCache
 from .grading import GradingAgent
+from .registry import AgentRegistry
 from .report_generator import ReportGeneratorAgent
 from ..schemas.analysis import (
     AnalysisRequest,
     AnalysisResponse,
     AgentResult,
+    BatchAnalysisItem,
+    GradingBreakdown,
 )
 from ..core.config import get_settings
+from ..core.logging import current_run_id
+from ..core.metrics import AGENT_LATENCY, PIPELINE_RUNS, STAGE_LATENCY
+from ..core.tracing import span
+
+if TYPE_CHECKING:
+    from ..services.coordination import Coordinator
+    from ..services.portfolio_index import PortfolioIndex
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AgentOutcome:
+    """
+    What happened to one agent during fan-out.
+    status is COMPLETED, TIMED_OUT, FAILED or SKIPPED (an upstream gate ruled it out);
+    result is set only when COMPLETED.
+    """
+    agent_name: str
+    status: str
+    result: AgentResult | None = None
+    error: str | None = None
+    # Seconds from the agent's start (in batch mode: once it holds its slot) until the outcome
+    # was known; None for skipped, reused and never-started agents
+    duration: float | None = None
+
+
+def dependency_order(agents: List[BaseAgent]) -> Tuple[List[str], Dict[str, Tuple[str, ...]]]:
+    """
+    Topological order of the agents and each agent's dependencies among them.
+    Dependencies on agents that are not present (disabled, or not registered) are dropped;
+    a cycle raises ValueError.
+    """
+    names = [agent.name for agent in agents]
+    present = set(names)
+    dependencies = {
+        agent.name: tuple(name for name in agent.depends_on if name in present) for agent in agents
+    }
+    order: List[str] = []
+    remaining = dict(dependencies)
+    while remaining:
+        ready = [name for name in names if name in remaining and all(d not in remaining for d in remaining[name])]
+        if not ready:
+            raise ValueError(f"Agent dependency cycle among: {', '.join(sorted(remaining))}")
+        for name in ready:
+            order.append(name)
+            del remaining[name]
+    return order, dependencies
 
 
 class MasterAgent:
     """
     Orchestrates all domain agents, grading, and report generation.
+    Agents run as a dependency graph (BaseAgent.depends_on): each starts as soon as its
+    upstream agents have finished, independent agents run concurrently.
+    Given a registry instead of agents, the agents are loaded on the first pipeline call
+    (unless the lifespan prewarmed them).
     """
 
-    def __init__(self, agents: List[BaseAgent]) -> None:
-        self.agents = agents
+    def __init__(
+        self,
+        agents: List[BaseAgent] | None = None,
+        cache: AgentResultCache | None = None,
+        report_generator: ReportGeneratorAgent | None = None,
+        registry: AgentRegistry | None = None,
+        portfolio_index: "PortfolioIndex | None" = None,
+        coordinator: "Coordinator | None" = None,
+    ) -> None:
+        if agents is None and registry is None:
+            raise ValueError("MasterAgent needs agents or an agent registry")
+        self.registry = registry
+        self.agents: List[BaseAgent] = []
+        self._order: List[str] = []
+        self._dependencies: Dict[str, Tuple[str, ...]] = {}
+        if agents is not None:
+            self._set_agents(agents)
+        self.cache = cache
+        # Every graded response is added, so pre-screening sees the latest runs
+        self.portfolio_index = portfolio_index
+        # Serializes runs of one molecule across workers, so the later ones hit the shared cache
+        self.coordinator = coordinator
         self.grading_agent = GradingAgent()
-        self.report_generator = ReportGeneratorAgent()
+        self.report_generator = report_generator or ReportGeneratorAgent()
         self.settings = get_settings()
 
-    async def _run_agents_parallel(self, request: AnalysisRequest) -> List[AgentResult]:
-        coros = [agent.run(request) for agent in self.agents]
-        results: List[AgentResult] = await asyncio.gather(*coros)
-        return results
+    def _set_agents(self, agents: List[BaseAgent]) -> None:
+        self._order, self._dependencies = dependency_order(agents)
+        self.agents = agents
 
-    async def run_pipeline(self, request: AnalysisRequest) -> AnalysisResponse:
-        # 1. Generate a run ID
-        run_id = str(uuid.uuid4())
+    async def ensure_agents(self) -> None:
+        """Loads the registry's agents on first use; a no-op once they are in place."""
+        if self.registry is None or self.agents:
+            return
+        await self.registry.ensure_started()
+        if not self.agents:
+            self._set_agents(self.registry.agents())
 
-        # 2. Fan out to all agents (parallel)
-        agent_results = await self._run_agents_parallel(request)
+    async def _call_agent(
+        self, agent: BaseAgent, request: AnalysisRequest, upstream: Dict[str, AgentResult]
+    ) -> AgentResult:
+        # Taken before the lookup: the cache keys on it, so a data_version() bump is a miss
+        fingerprint = await agent.fingerprint(request)
+        if self.cache is not None:
+            return await self.cache.get_or_compute(agent, request, upstream, fingerprint)
+        result = await agent.run_with_context(request, upstream)
+        if result.input_fingerprint is None:
+            result = result.model_copy(update={"input_fingerprint": fingerprint})
+        return result
 
-        # 3. Compute grading from agent outputs
-        grading = self.grading_agent.grade(agent_results)
+    async def _run_agent(
+        self,
+        agent: BaseAgent,
+        request: AnalysisRequest,
+        limits: Dict[str, asyncio.Semaphore] | None = None,
+        upstream: Dict[str, AgentResult] | None = None,
+        starts: Dict[str, float] | None = None,
+    ) -> AgentResult:
+        budget = agent.timeout or self.settings.AGENT_TIMEOUT_SECONDS
+        upstream = upstream or {}
+        starts = {} if starts is None else starts
+        if limits is None:
+            starts[agent.name] = time.monotonic()
+            with span("agent.run", agent=agent.name):
+                return await asyncio.wait_for(self._call_agent(agent, request, upstream), timeout=budget)
 
-        # 4. Generate report content (string)
-        report_content = self.report_generator.generate_report(
-            request=request,
-            grading=grading,
-            results=agent_results,
-        )
+        # Batch mode: the agent's budget (and its latency) starts once it gets a concurrency slot
+        async with limits[agent.name]:
+            starts[agent.name] = time.monotonic()
+            with span("agent.run", agent=agent.name):
+                return await asyncio.wait_for(self._call_agent(agent, request, upstream), timeout=budget)
+
+    async def _iter_agent_outcomes(
+        self,
+        request: AnalysisRequest,
+        limits: Dict[str, asyncio.Semaphore] | None = None,
+        agents: List[BaseAgent] | None = None,
+        upstream: Dict[str, AgentResult] | None = None,
+    ) -> AsyncIterator[AgentOutcome]:
+        """
+        Runs the agents (all of them by default) and yields each outcome as soon as it is known.
+        An agent starts once every agent it depends on has an outcome, with the completed
+        upstream results (plus any in `upstream`, e.g. results reused by a refresh); its
+        skip_reason() gate can mark it SKIPPED instead, which also skips its dependents. Agents
+        still running or waiting at the pipeline deadline are cancelled and reported TIMED_OUT.
+        The deadline runs from the first agent's start, so in batch mode time spent queueing for
+        the per-agent slots does not count against it.
+        """
+        # agent_name -> when it started running (see _run_agent)
+        starts: Dict[str, float] = {}
+        selected = self.agents if agents is None else agents
+        by_name = {agent.name: agent for agent in selected}
+        context: Dict[str, AgentResult] = dict(upstream or {})
+        waiting = {name: {d for d in self._dependencies[name] if d in by_name} for name in by_name}
+        skipped_names: set = set()
+        tasks: Dict[asyncio.Task, BaseAgent] = {}
+        pending: set = set()
+
+        def launch_ready() -> List[AgentOutcome]:
+            skipped: List[AgentOutcome] = []
+            for name in [n for n, deps in waiting.items() if not deps]:
+                del waiting[name]
+                agent = by_name[name]
+                inputs = {d: context[d] for d in self._dependencies[name] if d in context}
+                gated = [d for d in self._dependencies[name] if d in skipped_names]
+                reason = f"upstream {gated[0]} skipped" if gated else agent.skip_reason(inputs)
+                if reason is not None:
+                    skipped_names.add(name)
+                    skipped.append(AgentOutcome(agent_name=name, status="SKIPPED", error=reason))
+                    continue
+                task = asyncio.create_task(self._run_agent(agent, request, limits, inputs, starts))
+                tasks[task] = agent
+                pending.add(task)
+            return skipped
+
+        ready = launch_ready()
+        try:
+            while True:
+                # Every outcome unblocks its dependents; skips can cascade down the graph
+                while ready:
+                    outcome = ready.pop(0)
+                    if outcome.result is not None:
+                        context[outcome.agent_name] = outcome.result
+                    for deps in waiting.values():
+                        deps.discard(outcome.agent_name)
+                    yield self._observe(outcome, starts)
+                    ready.extend(launch_ready())
+
+                now = time.monotonic()
+                remaining = min(starts.values(), default=now) + self.settings.PIPELINE_TIMEOUT_SECONDS - now
+                if not pending or remaining <= 0:
+                    break
+                done, _ = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                pending.difference_update(done)
+                ready.extend(self._outcome(tasks[task], task) for task in done)
+
+            for task in list(pending):
+                if task.done():
+                    pending.discard(task)
+                    yield self._observe(self._outcome(tasks[task], task), starts)
+                    continue
+                task.cancel()
+                yield self._observe(
+                    AgentOutcome(
+                        agent_name=tasks[task].name,
+                        status="TIMED_OUT",
+                        error="pipeline deadline exceeded",
+                    ),
+                    starts,
+                )
+            for name in list(waiting):
+                yield self._observe(
+                    AgentOutcome(
+                        agent_name=name,
+                        status="TIMED_OUT",
+                        error="pipeline deadline exceeded before upstream agents finished",
+                    ),
+                    starts,
+                )
+        finally:
+            # Stragglers (or everything, if the caller went away) must not outlive the request
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    @staticmethod
+    def _observe(outcome: AgentOutcome, starts: Dict[str, float]) -> AgentOutcome:
+        # Skipped agents never ran; agents cancelled while queueing for a slot never started
+        started = starts.get(outcome.agent_name)
+        if outcome.status != "SKIPPED" and started is not None:
+            outcome.duration = time.monotonic() - started
+            AGENT_LATENCY.observe(outcome.duration, agent=outcome.agent_name, status=outcome.status)
+        return outcome
+
+    @staticmethod
+    def _outcome(agent: BaseAgent, task: asyncio.Task) -> AgentOutcome:
+        exc = task.exception()
+        if exc is None:
+            return AgentOutcome(agent_name=agent.name, status="COMPLETED", result=task.result())
+        if isinstance(exc, asyncio.TimeoutError):
+            return AgentOutcome(agent_name=agent.name, status="TIMED_OUT", error="agent timeout exceeded")
+
+        logger.warning("Agent %s failed: %r", agent.name, exc)
+        return AgentOutcome(agent_name=agent.name, status="FAILED", error=repr(exc))
+
+    async def _run_agents_parallel(
+        self,
+        request: AnalysisRequest,
+        limits: Dict[str, asyncio.Semaphore] | None = None,
+    ) -> Dict[str, AgentOutcome]:
+        outcomes: Dict[str, AgentOutcome] = {}
+        async for outcome in self._iter_agent_outcomes(request, limits):
+            outcomes[outcome.agent_name] = outcome
+        return outcomes
+
+    def _collect(
+        self, outcomes: Dict[str, AgentOutcome]
+    ) -> Tuple[List[AgentResult], Dict[str, str]]:
+        # Keep results in agent registration order so reports stay stable
+        results: List[AgentResult] = []
+        statuses: Dict[str, str] = {}
+        for agent in self.agents:
+            outcome = outcomes[agent.name]
+            statuses[agent.name] = outcome.status
+            if outcome.result is not None:
+                results.append(outcome.result)
+        return results, statuses
+
+    def _build_response(
+        self,
+        run_id: str,
+        request: AnalysisRequest,
+        outcomes: Dict[str, AgentOutcome],
+        started: float,
+        include_report: bool = True,
+        grading: GradingBreakdown | None = None,
+    ) -> AnalysisResponse:
+        agent_results, agent_statuses = self._collect(outcomes)
+        timings: Dict[str, float] = {
+            f"agent.{name}": outcome.duration * 1000
+            for name, outcome in outcomes.items()
+            if outcome.duration is not None
+        }
+        timings["agents"] = (time.perf_counter() - started) * 1000
 
-        # 5. (Optional) Persist to DB or enqueue for PDF conversion here
+        # Compute grading from whichever agents finished (run_batch grades the batch up front)
+        stage_start = time.perf_counter()
+        with span("grading"):
+            if grading is None:
+                grading = self.grading_agent.grade(agent_results)
+            missing_dimensions = self.grading_agent.missing_dimensions(agent_statuses)
+        timings["grading"] = self._stage_done("grading", stage_start)
 
-        # 6. Return a full response
-        return AnalysisResponse(
+        # Generate report content (string)
+        report_content = None
+        if include_report:
+            stage_start = time.perf_counter()
+            with span("report"):
+                report_content = self.report_generator.generate_report(
+                    request=request,
+                    grading=grading,
+                    results=agent_results,
+                )
+            timings["report"] = self._stage_done("report", stage_start)
+
+        # Persistence and queued report rendering live in job mode (services/jobs.py)
+
+        # A gated skip is a decision, not a gap in the analysis
+        complete = all(status in ("COMPLETED", "SKIPPED") for status in agent_statuses.values())
+        status = "COMPLETED" if complete else "PARTIAL"
+        timings["total"] = self._stage_done("total", started)
+        PIPELINE_RUNS.inc(status=status)
+
+        response = AnalysisResponse(
             run_id=run_id,
             grading=grading,
             results=agent_results,
             report_content=report_content,
-            status="COMPLETED",
+            status=status,
+            agent_statuses=agent_statuses,
+            missing_dimensions=missing_dimensions,
+            timings={k: round(v, 3) for k, v in timings.items()}
+            if self.settings.RESPONSE_TIMINGS_ENABLED
+            else None,
+        )
+        if self.portfolio_index is not None:
+            self.portfolio_index.add_response(request, response)
+        return response
+
+    @staticmethod
+    def _stage_done(stage: str, stage_start: float) -> float:
+        """Records a stage in the latency histogram; returns its duration in milliseconds."""
+        elapsed = time.perf_counter() - stage_start
+        STAGE_LATENCY.observe(elapsed, stage=stage)
+        return elapsed * 1000
+
+    async def run_pipeline(
+        self,
+        request: AnalysisRequest,
+        include_report: bool = True,
+        limits: Dict[str, asyncio.Semaphore] | None = None,
+        run_id: str | None = None,
+    ) -> AnalysisResponse:
+        # 1. Generate a run ID (job mode passes the one it already handed to the client)
+        run_id = run_id or str(uuid.uuid4())
+        started = time.perf_counter()
+        await self.ensure_agents()
+        with self._run_scope(run_id, request):
+            # 2. Fan out to all agents (parallel, bounded by per-agent and pipeline deadlines)
+            async with self._run_lock(request):
+                outcomes = await self._run_agents_parallel(request, limits)
+
+            # 3. Grade, build the report and return a full response
+            return self._build_response(
+                run_id, request, outcomes, started, include_report=include_report
+            )
+
+    @contextmanager
+    def _run_scope(self, run_id: str, request: AnalysisRequest) -> Iterator[None]:
+        """Log context (current_run_id) and trace span of one pipeline run."""
+        token = current_run_id.set(run_id)
+        try:
+            with span("analysis.pipeline", run_id=run_id, molecule=request.molecule_name):
+                yield
+        finally:
+            current_run_id.reset(token)
+
+    def _run_lock(self, request: AnalysisRequest) -> Any:
+        if self.coordinator is None or self.cache is None:
+            return nullcontext()
+        return self.coordinator.run_lock(request)
+
+    def _is_expired(self, agent: BaseAgent, result: AgentResult, now: datetime) -> bool:
+        ttl = agent.cache_ttl if agent.cache_ttl is not None else self.settings.AGENT_CACHE_TTL_SECONDS
+        if result.generated_at is None or ttl <= 0:
+            return True
+        return (now - result.generated_at).total_seconds() > ttl
+
+    async def refresh_pipeline(
+        self,
+        previous: AnalysisResponse,
+        request: AnalysisRequest,
+        force_agents: List[str] | None = None,
+    ) -> AnalysisResponse:
+        """
+        Incremental re-analysis of a stored run.
+        Agents whose fingerprint (inputs + upstream data version) is unchanged and whose result
+        has not outlived its TTL keep their stored AgentResult; the rest run again. Grading and
+        the report are always recomputed.
+        """
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        stored = {r.agent_name: r for r in previous.results}
+        forced = set(force_agents or ())
+        await self.ensure_agents()
+        fingerprints = await asyncio.gather(*(agent.fingerprint(request) for agent in self.agents))
+
+        by_name = {agent.name: agent for agent in self.agents}
+        fingerprint_of = {agent.name: fp for agent, fp in zip(self.agents, fingerprints)}
+
+        outcomes: Dict[str, AgentOutcome] = {}
+        stale_names: set = set()
+        # Dependency order, so an agent whose upstream is rerun is rerun too
+        for name in self._order:
+            agent, old = by_name[name], stored.get(name)
+            if (
+                old is not None
+                and name not in forced
+                and old.input_fingerprint == fingerprint_of[name]
+                and not self._is_expired(agent, old, now)
+                and not any(d in stale_names for d in self._dependencies[name])
+            ):
+                outcomes[name] = AgentOutcome(agent_name=name, status="COMPLETED", result=old)
+            else:
+                stale_names.add(name)
+                if self.cache is not None:
+                    await self.cache.discard(agent, request)
+        stale = [agent for agent in self.agents if agent.name in stale_names]
+
+        reused_results = {name: outcome.result for name, outcome in outcomes.items()}
+        async for outcome in self._iter_agent_outcomes(request, agents=stale, upstream=reused_results):
+            outcomes[outcome.agent_name] = outcome
+
+        response = self._build_response(str(uuid.uuid4()), request, outcomes, started)
+        reused = [agent.name for agent in self.agents if agent not in stale]
+        return response.model_copy(update={"parent_run_id": previous.run_id, "reused_agents": reused})
+
+    async def run_batch(
+        self,
+        requests: List[AnalysisRequest],
+        include_reports: bool = False,
+    ) -> List[BatchAnalysisItem]:
+        """
+        Screens many molecules at once.
+        Requests for the same molecule/indication share one pipeline run, agents are capped at
+        Settings.BATCH_AGENT_CONCURRENCY concurrent calls each, and at most
+        Settings.BATCH_PIPELINE_CONCURRENCY pipelines are in flight. CPU-heavy agents run on
+        their portfolio pool (BaseAgent.portfolio_cpu_bound). Once every fan-out is done the batch
+        is graded in one vectorized pass. Items come back ranked by overall_score; a failing item
+        carries its error instead of failing the batch.
+        """
+        await self.ensure_agents()
+        limits = {
+            agent.name: asyncio.Semaphore(self.settings.BATCH_AGENT_CONCURRENCY)
+            for agent in self.agents
+        }
+        pipeline_slots = asyncio.Semaphore(self.settings.BATCH_PIPELINE_CONCURRENCY)
+
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for index, request in enumerate(requests):
+            key = (
+                normalize_key_part(request.molecule_name),
+                normalize_key_part(request.target_indication),
+            )
+            groups.setdefault(key, []).append(index)
+
+        async def fan_out(request: AnalysisRequest) -> Tuple[str, Dict[str, AgentOutcome], float] | Exception:
+            run_id = str(uuid.uuid4())
+            try:
+                async with pipeline_slots:
+                    started = time.perf_counter()
+                    with self._run_scope(run_id, request):
+                        async with self._run_lock(request):
+                            outcomes = await self._run_agents_parallel(request, limits)
+            except Exception as exc:
+                logger.warning("Batch item %s failed: %r", request.molecule_name, exc)
+                return exc
+            return run_id, outcomes, started
+
+        # Agents with a portfolio_cpu_bound pool switch to it for every pipeline of the batch
+        token = portfolio_run.set(True)
+        try:
+            fanned = await asyncio.gather(*(fan_out(requests[indexes[0]]) for indexes in groups.values()))
+        finally:
+            portfolio_run.reset(token)
+
+        # The whole batch is graded in one vectorized pass (GradingAgent.grade_many)
+        graded = [run for run in fanned if not isinstance(run, Exception)]
+        stage_start = time.perf_counter()
+        with span("grading.batch", runs=len(graded)):
+            gradings = iter(
+                self.grading_agent.grade_many([self._collect(outcomes)[0] for _, outcomes, _ in graded])
+            )
+        self._stage_done("grading.batch", stage_start)
+
+        items: List[BatchAnalysisItem] = []
+        for indexes, run in zip(groups.values(), fanned):
+            first = requests[indexes[0]]
+            if isinstance(run, Exception):
+                items.extend(BatchAnalysisItem(index=i, request=requests[i], error=repr(run)) for i in indexes)
+                continue
+            run_id, outcomes, started = run
+            grading = next(gradings)
+            try:
+                response = self._build_response(
+                    run_id, first, outcomes, started, include_report=include_reports, grading=grading
+                )
+            except Exception as exc:
+                logger.warning("Batch item %s failed: %r", first.molecule_name, exc)
+                items.extend(BatchAnalysisItem(index=i, request=requests[i], error=repr(exc)) for i in indexes)
+                continue
+            items.extend(BatchAnalysisItem(index=i, request=requests[i], response=response) for i in indexes)
+
+        # Best opportunities first; failed items last, in submission order
+        items.sort(
+            key=lambda item: (
+                item.response is None,
+                -item.response.grading.overall_score if item.response else 0.0,
+                item.index,
+            )
         )
+        return items
+
+    async def stream_pipeline(
+        self, request: AnalysisRequest, run_id: str | None = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Same pipeline as run_pipeline (run log context, span, run lock, portfolio indexing), but
+        yields events while it runs: "agent" per finished agent, "grading" (provisional) after
+        each successful agent, and a final "response" carrying the full AnalysisResponse.
+        Persisting the run is up to the caller, as for run_pipeline.
+        """
+        run_id = run_id or str(uuid.uuid4())
+        started = time.perf_counter()
+        await self.ensure_agents()
+        with self._run_scope(run_id, request):
+            yield {"event": "started", "run_id": run_id, "agents": [agent.name for agent in self.agents]}
+
+            outcomes: Dict[str, AgentOutcome] = {}
+            async with self._run_lock(request):
+                async for outcome in self._iter_agent_outcomes(request):
+                    outcomes[outcome.agent_name] = outcome
+                    yield {
+                        "event": "agent",
+                        "run_id": run_id,
+                        "agent_name": outcome.agent_name,
+                        "status": outcome.status,
+                        "result": outcome.result.model_dump() if outcome.result else None,
+                        "error": outcome.error,
+                    }
+
+                    if outcome.result is not None:
+                        completed = [o.result for o in outcomes.values() if o.result is not None]
+                        yield {
+                            "event": "grading",
+                            "run_id": run_id,
+                            "provisional": True,
+                            "grading": self.grading_agent.grade(completed).model_dump(),
+                        }
+
+            response = self._build_response(run_id, request, outcomes, started)
+            yield {"event": "response", "run_id": run_id, "response": response}
@@ -1,21 +1,37 @@
-# backend/app/agents/patents_trials/clinical_trials.py
-from typing import Any, Dict
-from ..base import BaseAgent
+# backend/app/agents/patent_trials/clinical_trials.py
+import logging
+from typing import Any
+from ..base import BaseAgent, normalize_key_part
+from ...schemas.agent_data import ClinicalTrialData
 from ...schemas.analysis import AnalysisRequest
+from ...services.http import UPSTREAM_ERRORS
+
+logger = logging.getLogger(__name__)
+
+ONGOING_STATUSES = frozenset({"NOT_YET_RECRUITING", "RECRUITING", "ENROLLING_BY_INVITATION", "ACTIVE_NOT_RECRUITING"})
+HALTED_STATUSES = frozenset({"SUSPENDED", "TERMINATED", "WITHDRAWN"})
 
 
 class ClinicalTrialAgent(BaseAgent):
     """
-    Looks at ongoing trials / label expansions (simulated).
+    Looks at ongoing trials / label expansions.
+    Reads ClinicalTrials.gov when live data is on; simulated otherwise.
     """
 
     async def run(self, request: AnalysisRequest):
-        data: Dict[str, Any] = {
-            "ongoing_trials_count": 12,
-            "indication_expansion_potential_score": 0.7,
-            "safety_signal_risk_score": 0.2,
-            "patents_and_trials_score": 0.68,
-        }
+        client = self.upstream("clinicaltrials")
+        if client is not None and request.molecule_name:
+            try:
+                return await self._live(client, request)
+            except UPSTREAM_ERRORS as exc:
+                logger.warning("ClinicalTrials.gov lookup failed for %s: %r", request.molecule_name, exc)
+
+        data = ClinicalTrialData(
+            ongoing_trials_count=12,
+            indication_expansion_potential_score=0.7,
+            safety_signal_risk_score=0.2,
+            patents_and_trials_score=0.68,
+        )
 
         summary = (
             "Clinical trial activity is healthy with multiple ongoing studies and limited safety concerns, "
@@ -23,3 +39,34 @@ class ClinicalTrialAgent(BaseAgent):
         )
 
         return self._result(summary=summary, raw_data=data)
+
+    async def _live(self, client: Any, request: AnalysisRequest):
+        target = normalize_key_part(request.target_indication)
+        total = ongoing = halted = 0
+        other_conditions = set()
+        async for study in client.studies(request.molecule_name, max_pages=5):
+            protocol = study.get("protocolSection", {})
+            status = protocol.get("statusModule", {}).get("overallStatus")
+            total += 1
+            ongoing += status in ONGOING_STATUSES
+            halted += status in HALTED_STATUSES
+            for condition in protocol.get("conditionsModule", {}).get("conditions", []):
+                condition = normalize_key_part(condition)
+                if not target or (target not in condition and condition not in target):
+                    other_conditions.add(condition)
+
+        # Ten other indications under study saturate the expansion score
+        expansion = min(1.0, len(other_conditions) / 10)
+        safety_risk = halted / total if total else 0.0
+        score = 0.4 * min(1.0, ongoing / 10) + 0.3 * expansion + 0.3 * (1 - safety_risk)
+        data = ClinicalTrialData(
+            ongoing_trials_count=ongoing,
+            indication_expansion_potential_score=round(expansion, 4),
+            safety_signal_risk_score=round(safety_risk, 4),
+            patents_and_trials_score=round(score, 4),
+        )
+        summary = (
+            f"{ongoing} of {total} registered trials of {request.molecule_name} are ongoing and {halted} were "
+            f"halted early; the molecule is also studied in {len(other_conditions)} other condition(s)."
+        )
+        return self._result(summary=summary, raw_data=data)
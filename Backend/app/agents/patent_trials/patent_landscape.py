@@ -1,25 +1,126 @@
-# backend/app/agents/patents_trials/patent_landscape.py
-from typing import Any, Dict
+# backend/app/agents/patent_trials/patent_landscape.py
+import asyncio
+import logging
+from datetime import date
+from typing import Any
 from ..base import BaseAgent
+from ...core.config import get_settings
+from ...schemas.agent_data import PatentLandscapeData
 from ...schemas.analysis import AnalysisRequest
+from ...services.http import UPSTREAM_ERRORS
+from ...services.patent_index import PatentIndex
+
+logger = logging.getLogger(__name__)
+
+# Term counted from the grant date: USPTO search results carry no filing-date extensions
+PATENT_TERM_YEARS = 20
 
 
 class PatentLandscapeAgent(BaseAgent):
     """
-    Evaluates FTO (freedom to operate) based on a simplified heuristic.
+    Evaluates FTO (freedom to operate).
+    Looks the molecule up in the precomputed patent index when Settings.PATENT_INDEX_PATH
+    is set, else searches USPTO when live data is on; falls back to a simplified heuristic.
     """
 
+    # Patent status changes on the scale of weekly filings
+    cache_ttl = 7 * 24 * 3600.0
+
+    def __init__(self, name: str | None = None) -> None:
+        super().__init__(name)
+        self.settings = get_settings()
+        self.index: PatentIndex | None = None
+
+    async def startup(self) -> None:
+        if self.settings.PATENT_INDEX_PATH:
+            self.index = await asyncio.to_thread(PatentIndex.load, self.settings.PATENT_INDEX_PATH)
+
+    async def data_version(self) -> str:
+        # A weekly delta changes the version, so stored runs re-run this agent on refresh
+        return self.index.version if self.index is not None else ""
+
     async def run(self, request: AnalysisRequest):
-        data: Dict[str, Any] = {
-            "primary_patents_expired": True,
-            "secondary_patent_risk_score": 0.35,  # 0–1, higher = more risk
-            "litigation_risk_score": 0.25,
-            "patent_overall_score": 0.72,        # higher = safer
-        }
+        fto = None
+        if self.index is not None and request.molecule_name and self.index.patents_for(request.molecule_name):
+            fto = self.index.fto(request.molecule_name)
 
-        summary = (
-            "Patent landscape analysis indicates that core patents are largely expired with manageable "
-            "secondary and litigation risks, suggesting reasonable freedom to operate."
+        if fto is None and self.upstream("uspto") is not None and request.molecule_name:
+            try:
+                return await self._live(self.upstream("uspto"), request)
+            except UPSTREAM_ERRORS as exc:
+                logger.warning("USPTO search failed for %s: %r", request.molecule_name, exc)
+
+        if fto is None:
+            data = PatentLandscapeData(
+                primary_patents_expired=True,
+                secondary_patent_risk_score=0.35,  # 0–1, higher = more risk
+                litigation_risk_score=0.25,
+                patent_overall_score=0.72,        # higher = safer
+            )
+            summary = (
+                "Patent landscape analysis indicates that core patents are largely expired with manageable "
+                "secondary and litigation risks, suggesting reasonable freedom to operate."
+            )
+            return self._result(summary=summary, raw_data=data)
+
+        secondary = [p for p in fto.blocking_patents if p.kind != "primary"]
+        # Saturates at 5 live secondary patents / 3 open cases
+        secondary_risk = min(1.0, len(secondary) / 5)
+        litigation_risk = min(1.0, len(fto.open_litigation) / 3)
+        overall = _overall_score(fto.primary_patents_expired, secondary_risk, litigation_risk)
+        data = PatentLandscapeData(
+            primary_patents_expired=fto.primary_patents_expired,
+            secondary_patent_risk_score=round(secondary_risk, 4),
+            litigation_risk_score=round(litigation_risk, 4),
+            patent_overall_score=round(overall, 4),
+            blocking_patents=[p.patent_id for p in fto.blocking_patents],
+            open_litigation_cases=[c.case_id for c in fto.open_litigation],
+            clear_from=fto.clear_from.isoformat() if fto.clear_from else None,
         )
 
+        if fto.primary_patents_expired:
+            summary = (
+                f"Core patents for {request.molecule_name} have expired; {len(secondary)} secondary patent(s) "
+                f"and {len(fto.open_litigation)} open litigation case(s) remain."
+            )
+        else:
+            summary = (
+                f"Primary patents for {request.molecule_name} are still in force "
+                f"(no blocking patents after {data.clear_from}), limiting freedom to operate."
+            )
+
+        return self._result(summary=summary, raw_data=data)
+
+    async def _live(self, client: Any, request: AnalysisRequest):
+        today = date.today()
+        # (expiry, patent_id) of every patent mentioning the molecule, earliest grant first
+        patents = []
+        async for patent in client.patents(request.molecule_name, max_pages=3):
+            if patent.get("patent_date"):
+                granted = date.fromisoformat(patent["patent_date"][:10])
+                patents.append((granted.replace(year=granted.year + PATENT_TERM_YEARS), patent["patent_id"]))
+        patents.sort()
+        live = [(expiry, patent_id) for expiry, patent_id in patents if expiry > today]
+        # The earliest grant stands in for the compound patent
+        primary_expired = not patents or patents[0][0] <= today
+        secondary = live if primary_expired else live[1:]
+        secondary_risk = min(1.0, len(secondary) / 5)
+        # USPTO search has no litigation data; keep the heuristic estimate
+        litigation_risk = 0.25
+        data = PatentLandscapeData(
+            primary_patents_expired=primary_expired,
+            secondary_patent_risk_score=round(secondary_risk, 4),
+            litigation_risk_score=litigation_risk,
+            patent_overall_score=round(_overall_score(primary_expired, secondary_risk, litigation_risk), 4),
+            blocking_patents=[patent_id for _, patent_id in live],
+            clear_from=live[-1][0].isoformat() if live else None,
+        )
+        summary = (
+            f"USPTO lists {len(patents)} patent(s) mentioning {request.molecule_name}; {len(live)} are still "
+            f"in force" + (f" until {data.clear_from}." if live else ".")
+        )
         return self._result(summary=summary, raw_data=data)
+
+
+def _overall_score(primary_expired: bool, secondary_risk: float, litigation_risk: float) -> float:
+    return (1.0 if primary_expired else 0.2) * (1 - 0.5 * secondary_risk) * (1 - 0.3 * litigation_risk)
@@ -1,6 +1,6 @@
 # backend/app/agents/production/process_design.py
-from typing import Any, Dict
 from ..base import BaseAgent
+from ...schemas.agent_data import ProcessDesignData
 from ...schemas.analysis import AnalysisRequest
 
 
@@ -10,12 +10,12 @@ class ProcessDesignAgent(BaseAgent):
     """
 
     async def run(self, request: AnalysisRequest):
-        data: Dict[str, Any] = {
-            "process_complexity_score": 0.65,      # 0–1, higher = more complex
-            "scalability_score": 0.8,             # 0–1, higher = easier to scale
-            "continuous_manufacturing_fit": 0.7,  # 0–1
-            "production_feasibility_score": 0.76,
-        }
+        data = ProcessDesignData(
+            process_complexity_score=0.65,      # 0–1, higher = more complex
+            scalability_score=0.8,             # 0–1, higher = easier to scale
+            continuous_manufacturing_fit=0.7,  # 0–1
+            production_feasibility_score=0.76,
+        )
 
         summary = (
             "Process design assessment indicates moderate complexity but good scalability potential. "
@@ -0,0 +1,167 @@
+# backend/app/agents/registry.py
+import asyncio
+import importlib
+import logging
+import time
+from importlib.metadata import entry_points
+from typing import Callable, Dict, List, TYPE_CHECKING, Union
+from .base import BaseAgent
+from ..core.config import Settings
+from ..services.compute import ComputePools
+
+if TYPE_CHECKING:
+    from ..services.http import UpstreamClient
+
+logger = logging.getLogger(__name__)
+
+# A factory is an agent class, any zero-arg callable returning an agent,
+# or a "package.module:ClassName" import path resolved on startup.
+AgentFactory = Union[Callable[[], BaseAgent], str]
+
+
+def _resolve(factory: AgentFactory) -> Callable[[], BaseAgent]:
+    if not isinstance(factory, str):
+        return factory
+    module_name, _, attr = factory.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+class AgentRegistry:
+    """
+    Application-scoped set of domain agents.
+    Built once in the FastAPI lifespan so agent-owned clients and caches live across requests.
+    Registering is cheap: "module:Class" factories are only imported by startup(), which the
+    lifespan may run up front (Settings.AGENT_PREWARM) or leave to the first request.
+    Every agent gets the shared compute pools and upstream clients; the lifespan owns both.
+    """
+
+    def __init__(
+        self,
+        compute_pools: ComputePools | None = None,
+        upstream_clients: "Dict[str, UpstreamClient] | None" = None,
+    ) -> None:
+        self.compute_pools = compute_pools
+        self.upstream_clients = dict(upstream_clients or {})
+        self._factories: Dict[str, AgentFactory] = {}
+        self._agents: Dict[str, BaseAgent] = {}
+        self._started = False
+        self._starting: asyncio.Task | None = None
+        # Wall time of the last completed startup(), for the startup report
+        self.startup_seconds: float | None = None
+
+    def register(self, name: str, factory: AgentFactory) -> None:
+        if self._started:
+            raise RuntimeError("Cannot register agents after the registry has started")
+        if name in self._factories:
+            raise ValueError(f"Agent '{name}' is already registered")
+        self._factories[name] = factory
+
+    def discover(self, group: str) -> List[str]:
+        """
+        Registers every agent advertised under the given entry-point group.
+        Returns the names that were added.
+        """
+        added: List[str] = []
+        for ep in entry_points(group=group):
+            if ep.name in self._factories:
+                logger.info("Entry point %s ignored; agent already registered", ep.name)
+                continue
+            self.register(ep.name, ep.value)
+            added.append(ep.name)
+        return added
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._factories)
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    def get(self, name: str) -> BaseAgent:
+        try:
+            return self._agents[name]
+        except KeyError:
+            raise KeyError(f"Agent '{name}' is not registered or the registry has not started") from None
+
+    def agents(self, names: List[str] | None = None) -> List[BaseAgent]:
+        """Started agents in registration order, optionally restricted to a subset of names."""
+        selected = names if names is not None else self.names
+        return [self.get(name) for name in selected]
+
+    async def startup(self) -> None:
+        if self._started:
+            return
+        started = time.perf_counter()
+        try:
+            for name, factory in self._factories.items():
+                # Importing an agent module can pull in NumPy / pyarrow; keep it off the event loop
+                agent_factory = await asyncio.to_thread(_resolve, factory)
+                agent = agent_factory()
+                agent.name = name
+                agent.compute_pools = self.compute_pools
+                agent.upstream_clients = self.upstream_clients
+                await agent.startup()
+                self._agents[name] = agent
+        except BaseException:
+            await self.shutdown()
+            raise
+        self._started = True
+        self.startup_seconds = time.perf_counter() - started
+
+    async def ensure_started(self) -> None:
+        """startup() shared between concurrent callers (prewarm task, first requests)."""
+        if self._started:
+            return
+        if self._starting is None or self._starting.done():
+            # A failed attempt is retried by the next caller
+            self._starting = asyncio.create_task(self.startup())
+        await asyncio.shield(self._starting)
+
+    async def shutdown(self) -> None:
+        starting = self._starting
+        # (startup() itself calls shutdown() when an agent fails to start)
+        if starting is not None and not starting.done() and starting is not asyncio.current_task():
+            starting.cancel()
+            await asyncio.gather(starting, return_exceptions=True)
+        # Tear down in reverse start order so later agents can rely on earlier ones
+        for name in reversed(list(self._agents)):
+            try:
+                await self._agents[name].shutdown()
+            except Exception:
+                logger.exception("Agent %s failed to shut down cleanly", name)
+        self._agents.clear()
+        self._started = False
+
+
+# Built-in agents as import paths, so building the registry imports none of them.
+# The competition, demographics and knowledge agents live in top-level app packages.
+_APP_PACKAGE = __package__.rpartition(".")[0]
+DEFAULT_AGENTS: List[str] = [
+    f"{__package__}.market.iqvia_insights:IQVIAInsightsAgent",
+    f"{__package__}.market.exim_trends:EXIMTrendAgent",
+    f"{__package__}.production.process_design:ProcessDesignAgent",
+    f"{__package__}.production.techno_economic:TechnoEconomicAgent",
+    f"{__package__}.patent_trials.patent_landscape:PatentLandscapeAgent",
+    f"{__package__}.patent_trials.clinical_trials:ClinicalTrialAgent",
+    f"{_APP_PACKAGE}.demographics.demographics:DemographicAgent",
+    f"{_APP_PACKAGE}.competition.competition:CompetitionAgent",
+    f"{_APP_PACKAGE}.knowledge.web_intelligence:WebIntelligenceAgent",
+    f"{_APP_PACKAGE}.knowledge.internal_knowledge:InternalKnowledgeAgent",
+]
+
+
+def build_default_registry(
+    settings: Settings,
+    compute_pools: ComputePools | None = None,
+    upstream_clients: "Dict[str, UpstreamClient] | None" = None,
+) -> AgentRegistry:
+    registry = AgentRegistry(compute_pools, upstream_clients if settings.UPSTREAM_LIVE_DATA else None)
+    for path in DEFAULT_AGENTS:
+        name = path.rpartition(":")[2]
+        if settings.ENABLED_AGENTS is None or name in settings.ENABLED_AGENTS:
+            registry.register(name, path)
+
+    if settings.AGENT_ENTRY_POINT_GROUP:
+        registry.discover(settings.AGENT_ENTRY_POINT_GROUP)
+    return registry
@@ -1,44 +1,591 @@
-# backend/app/api/v1/endpoints/analysis.py
-from fastapi import APIRouter, Depends
-from ...schemas.analysis import AnalysisRequest, AnalysisResponse
-from ...agents.master import MasterAgent
-from ...agents.market.iqvia_insights import IQVIAInsightsAgent
-from ...agents.market.exim_trends import EXIMTrendAgent
-from ...agents.production.process_design import ProcessDesignAgent
-from ...agents.production.techno_economic import TechnoEconomicAgent
-from ...agents.patents_trials.patent_landscape import PatentLandscapeAgent
-from ...agents.patents_trials.clinical_trials import ClinicalTrialAgent
-from ...agents.demographics.demographic import DemographicAgent
-from ...agents.competition.competition import CompetitionAgent
-from ...agents.knowledge.web_intelligence import WebIntelligenceAgent
-from ...agents.knowledge.internal_knowledge import InternalKnowledgeAgent
+# backend/app/api/V1/endpoints/analysis.py
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Literal, TYPE_CHECKING
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from ....schemas.analysis import (
+    AnalysisRequest,
+    AgentResult,
+    AnalysisResponse,
+    BatchAnalysisRequest,
+    BatchAnalysisResponse,
+    MoleculeScore,
+    PortfolioReportRequest,
+    PrescreenItem,
+    PrescreenRequest,
+    PrescreenResponse,
+    RefreshRequest,
+    RunStatus,
+    ScoreTrendPoint,
+    SimilarMolecule,
+    WeightSweepItem,
+    WeightSweepRequest,
+    WeightSweepResponse,
+)
+from ....core.config import get_settings
+from ....core.serialization import json_dumps, model_response
+from ....agents.grading import DIMENSIONS, GradingWeights
+from ....agents.master import MasterAgent
+from ....agents.registry import AgentRegistry
+from ....db.run_store import TREND_BUCKETS, RunStore
+from ....services.admission import AdmissionController, OverloadedError
+from ....services.idempotency import IdempotencyKeyReuseError, RequestDeduplicator
+from ....services.jobs import JobRunner, QueueFullError
+from ....services.report_rendering import MEDIA_TYPES, ReportFileCache, ReportRenderer
+from ...deps import (
+    get_admission_controller,
+    get_agent_registry,
+    get_job_runner,
+    get_master_agent,
+    get_portfolio_index,
+    get_report_cache,
+    get_report_renderer,
+    get_request_deduplicator,
+    get_run_store,
+)
+
+if TYPE_CHECKING:
+    from ....services.portfolio_index import PortfolioIndex
 
 
 router = APIRouter()
 
 
-def get_master_agent() -> MasterAgent:
-    agents = [
-        IQVIAInsightsAgent(),
-        EXIMTrendAgent(),
-        ProcessDesignAgent(),
-        TechnoEconomicAgent(),
-        PatentLandscapeAgent(),
-        ClinicalTrialAgent(),
-        DemographicAgent(),
-        CompetitionAgent(),
-        WebIntelligenceAgent(),
-        InternalKnowledgeAgent(),
-    ]
-    return MasterAgent(agents=agents)
+def _tenant_of(request: Request) -> str:
+    tenant = request.headers.get(get_settings().ADMISSION_TENANT_HEADER)
+    if tenant:
+        return tenant
+    return request.client.host if request.client else "anonymous"
+
+
+def _response_exclude(include_raw_data: bool, include_report: bool) -> Dict[str, Any] | None:
+    """Fields left out of an AnalysisResponse; both can be fetched later from the stored run."""
+    exclude: Dict[str, Any] = {}
+    if not include_raw_data:
+        exclude["results"] = {"__all__": {"raw_data"}}
+    if not include_report:
+        exclude["report_content"] = True
+    return exclude or None
+
+
+def _overloaded(exc: OverloadedError) -> HTTPException:
+    return HTTPException(
+        status_code=exc.status_code, detail=exc.detail, headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+@router.get("/agents")
+async def list_agents(registry: AgentRegistry = Depends(get_agent_registry)) -> Dict[str, Any]:
+    """Agents currently registered with the application."""
+    return {"agents": registry.names}
 
 
 @router.post("/analyze", response_model=AnalysisResponse)
 async def analyze(
     payload: AnalysisRequest,
+    request: Request,
+    include_raw_data: bool = True,
+    include_report: bool = True,
+    idempotency_key: str | None = Header(None, max_length=255),
+    cache_control: str | None = Header(None),
     master_agent: MasterAgent = Depends(get_master_agent),
-) -> AnalysisResponse:
+    run_store: RunStore = Depends(get_run_store),
+    deduplicator: RequestDeduplicator = Depends(get_request_deduplicator),
+    admission: AdmissionController | None = Depends(get_admission_controller),
+) -> Response:
     """
     Main entry point: user query → Master Agent → agents → grading → report.
+
+    Identical requests (normalised molecule / indication / query, or the same Idempotency-Key)
+    share one pipeline run while it is in flight, and a recent response is replayed.
+    Send Cache-Control: no-cache to skip the replay.
+
+    include_raw_data=false / include_report=false leave agent raw_data and the report out of
+    the response (fetch them later via /runs/{run_id}/results/{agent_name} and
+    /runs/{run_id}/report). Send Accept: application/msgpack for a MessagePack body.
+
+    Only executions pass admission control: when the server is saturated the call fails fast
+    with 429 (this tenant's queue is full) or 503 (server-wide), both with Retry-After.
+    """
+    tenant = _tenant_of(request)
+
+    async def run() -> AnalysisResponse:
+        if admission is None:
+            result = await master_agent.run_pipeline(payload)
+        else:
+            async with admission.slot(tenant):
+                result = await master_agent.run_pipeline(payload)
+        # Kept so the run can later be refreshed incrementally (/runs/{run_id}/refresh)
+        await run_store.save(
+            RunStatus(run_id=result.run_id, status="COMPLETED", request=payload, response=result)
+        )
+        return result
+
+    try:
+        result, outcome = await deduplicator.run(
+            payload,
+            run,
+            idempotency_key=idempotency_key,
+            replay="no-cache" not in (cache_control or ""),
+        )
+    except IdempotencyKeyReuseError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    except OverloadedError as exc:
+        raise _overloaded(exc)
+    headers = {"X-Analysis-Dedup": outcome}
+    if outcome == "replayed":
+        headers["Idempotent-Replayed"] = "true"
+    return model_response(
+        result,
+        accept=request.headers.get("accept"),
+        exclude=_response_exclude(include_raw_data, include_report),
+        headers=headers,
+    )
+
+
+def _encode_ndjson(event: Dict[str, Any]) -> bytes:
+    return json_dumps(event) + b"\n"
+
+
+def _encode_sse(event: Dict[str, Any]) -> bytes:
+    return b"event: " + event["event"].encode() + b"\ndata: " + json_dumps(event) + b"\n\n"
+
+
+class _ClosingStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that always closes its body and then calls on_close, including when the
+    client goes away mid-stream (Starlette then neither exhausts the body nor runs background).
+    """
+
+    def __init__(self, *args: Any, on_close: Callable[[], None], **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.on_close = on_close
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            try:
+                await self.body_iterator.aclose()
+            finally:
+                self.on_close()
+
+
+@router.post("/analyze/stream")
+async def analyze_stream(
+    payload: AnalysisRequest,
+    request: Request,
+    master_agent: MasterAgent = Depends(get_master_agent),
+    run_store: RunStore = Depends(get_run_store),
+    admission: AdmissionController | None = Depends(get_admission_controller),
+) -> StreamingResponse:
+    """
+    Streaming variant of /analyze: agent results as they finish, provisional grades, then the
+    full response. Sends Server-Sent Events when the client accepts text/event-stream,
+    newline-delimited JSON otherwise. The run is stored like a job (RUNNING, then COMPLETED, or
+    FAILED if the stream ends early), so the run_id of the "started" event works with /jobs/{id}
+    and /runs/{id}/*.
+    """
+    use_sse = "text/event-stream" in request.headers.get("accept", "")
+    encode = _encode_sse if use_sse else _encode_ndjson
+    # Admitted before the response starts so overload is still a plain 429/503
+    started = None
+    if admission is not None:
+        try:
+            started = await admission.acquire(_tenant_of(request))
+        except OverloadedError as exc:
+            raise _overloaded(exc)
+
+    run = RunStatus(run_id=str(uuid.uuid4()), status="RUNNING", request=payload)
+
+    async def record(status: str, **changes: Any) -> None:
+        await run_store.save(
+            run.model_copy(update={"status": status, "updated_at": datetime.now(timezone.utc), **changes})
+        )
+
+    async def body() -> AsyncIterator[bytes]:
+        error, finished = "stream closed before the run finished", False
+        try:
+            await record("RUNNING")
+            async for event in master_agent.stream_pipeline(payload, run_id=run.run_id):
+                if event["event"] == "response":
+                    await record("COMPLETED", response=event["response"])
+                    finished = True
+                    event = {**event, "response": event["response"].model_dump()}
+                yield encode(event)
+        except Exception as exc:
+            error = repr(exc)
+            raise
+        finally:
+            if not finished:
+                await record("FAILED", error=error)
+
+    def release() -> None:
+        if admission is not None:
+            admission.release(started)
+
+    return _ClosingStreamingResponse(
+        body(),
+        media_type="text/event-stream" if use_sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        on_close=release,
+    )
+
+
+@router.post("/analyze/batch", response_model=BatchAnalysisResponse)
+async def analyze_batch(
+    payload: BatchAnalysisRequest,
+    request: Request,
+    include_raw_data: bool = True,
+    master_agent: MasterAgent = Depends(get_master_agent),
+    run_store: RunStore = Depends(get_run_store),
+) -> Response:
+    """
+    Portfolio screening: many molecules in one call, ranked by overall_score.
+    Reports are skipped unless include_reports is set; include_raw_data=false leaves agent
+    raw_data out (it stays available per run).
+    """
+    max_items = get_settings().BATCH_MAX_ITEMS
+    if len(payload.items) > max_items:
+        raise HTTPException(status_code=413, detail=f"Batch limited to {max_items} items")
+
+    items = await master_agent.run_batch(payload.items, include_reports=payload.include_reports)
+    # Recorded for the history views; the store writes them in bulk
+    for item in items:
+        if item.response is not None:
+            await run_store.save(
+                RunStatus(run_id=item.response.run_id, status="COMPLETED", request=item.request, response=item.response)
+            )
+    exclude = None
+    if not include_raw_data:
+        exclude = {"items": {"__all__": {"response": {"results": {"__all__": {"raw_data"}}}}}}
+    return model_response(
+        BatchAnalysisResponse(batch_id=str(uuid.uuid4()), items=items),
+        accept=request.headers.get("accept"),
+        exclude=exclude,
+    )
+
+
+@router.post("/jobs", response_model=RunStatus, status_code=202)
+async def submit_job(
+    payload: AnalysisRequest,
+    job_runner: JobRunner = Depends(get_job_runner),
+) -> RunStatus:
+    """
+    Job mode: returns a run_id immediately; the pipeline runs in the background worker pool
+    and the report is rendered from the report queue. Poll /jobs/{run_id} or subscribe to
+    /jobs/{run_id}/events.
+    """
+    try:
+        return await job_runner.submit(payload)
+    except QueueFullError as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "5"})
+
+
+@router.get("/jobs/{run_id}", response_model=RunStatus)
+async def get_job(
+    run_id: str,
+    job_runner: JobRunner = Depends(get_job_runner),
+) -> RunStatus:
+    run = await job_runner.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return run
+
+
+@router.get("/jobs/{run_id}/events")
+async def job_events(
+    run_id: str,
+    job_runner: JobRunner = Depends(get_job_runner),
+) -> StreamingResponse:
+    """Server-Sent Events with every status change of the run, ending once it finishes."""
+    if await job_runner.get(run_id) is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+
+    async def body() -> AsyncIterator[str]:
+        async for run in job_runner.subscribe(run_id):
+            yield f"event: {run.status.lower()}\ndata: {run.model_dump_json()}\n\n"
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/runs/{run_id}/refresh", response_model=AnalysisResponse)
+async def refresh_run(
+    run_id: str,
+    payload: RefreshRequest | None = None,
+    master_agent: MasterAgent = Depends(get_master_agent),
+    run_store: RunStore = Depends(get_run_store),
+) -> AnalysisResponse:
+    """
+    Incremental re-analysis: reruns only agents whose inputs changed or whose results expired,
+    reusing the stored results of the others, then regrades and rebuilds the report.
+    """
+    previous = await run_store.get(run_id)
+    if previous is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    if previous.response is None:
+        raise HTTPException(status_code=409, detail=f"Run is {previous.status}; nothing to refresh yet")
+
+    response = await master_agent.refresh_pipeline(
+        previous.response,
+        previous.request,
+        force_agents=payload.force_agents if payload else None,
+    )
+    await run_store.save(
+        RunStatus(run_id=response.run_id, status="COMPLETED", request=previous.request, response=response)
+    )
+    return response
+
+
+@router.get("/runs/{run_id}/results/{agent_name}", response_model=AgentResult)
+async def get_agent_result(
+    run_id: str,
+    agent_name: str,
+    request: Request,
+    run_store: RunStore = Depends(get_run_store),
+) -> Response:
+    """Full result (with raw_data) of one agent in a stored run, for responses fetched without it."""
+    run = await run_store.get(run_id)
+    if run is None or run.response is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    for result in run.response.results:
+        if result.agent_name == agent_name:
+            return model_response(result, accept=request.headers.get("accept"))
+    raise HTTPException(status_code=404, detail=f"No result from {agent_name} in run {run_id}")
+
+
+async def _require_report_runs(run_store: RunStore, run_ids: List[str]) -> List[RunStatus]:
+    """The stored runs, in order; 404 / 409 unless every one of them has a response."""
+    runs = []
+    for run_id in run_ids:
+        run = await run_store.get(run_id)
+        if run is None:
+            raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
+        if run.response is None:
+            raise HTTPException(status_code=409, detail=f"Run {run_id} is {run.status}; no report yet")
+        runs.append(run)
+    return runs
+
+
+async def _report_response(
+    request: Request,
+    run_ids: List[str],
+    fmt: str,
+    title: str,
+    filename: str,
+    run_store: RunStore,
+    renderer: ReportRenderer,
+    report_cache: ReportFileCache,
+) -> Response:
+    # Stored runs never change once they have a response (a refresh creates a new run_id),
+    # so the run ids alone identify the document
+    key = report_cache.key(fmt, [title, *run_ids])
+    headers = {
+        "ETag": f'"{key[:32]}"',
+        "Cache-Control": "private, max-age=86400",
+        "Content-Disposition": f'inline; filename="{filename}.{fmt if fmt != "text" else "txt"}"',
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    cached = await report_cache.get(key)
+    if cached is not None:
+        return FileResponse(cached, media_type=MEDIA_TYPES[fmt], headers=headers)
+
+    async def documents():
+        # Fetched one at a time so only the run being rendered is held
+        for run_id in run_ids:
+            run = await run_store.get(run_id)
+            yield run.request, run.response.grading, run.response.results
+
+    return StreamingResponse(
+        report_cache.tee(key, renderer.astream(fmt, documents(), title=title)),
+        media_type=MEDIA_TYPES[fmt],
+        headers=headers,
+    )
+
+
+@router.get("/runs/{run_id}/report")
+async def download_report(
+    run_id: str,
+    request: Request,
+    format: Literal["text", "md", "html", "pdf"] = "pdf",
+    run_store: RunStore = Depends(get_run_store),
+    renderer: ReportRenderer = Depends(get_report_renderer),
+    report_cache: ReportFileCache = Depends(get_report_cache),
+) -> Response:
+    """Report of a stored run as text, Markdown, HTML or PDF; streamed, then served from cache."""
+    await _require_report_runs(run_store, [run_id])
+    return await _report_response(
+        request, [run_id], format, "Generic Opportunity Report", f"report-{run_id}",
+        run_store, renderer, report_cache,
+    )
+
+
+@router.post("/reports/portfolio")
+async def portfolio_report(
+    payload: PortfolioReportRequest,
+    request: Request,
+    run_store: RunStore = Depends(get_run_store),
+    renderer: ReportRenderer = Depends(get_report_renderer),
+    report_cache: ReportFileCache = Depends(get_report_cache),
+) -> Response:
+    """One document covering many stored runs, rendered section by section as it streams."""
+    max_runs = get_settings().REPORT_PORTFOLIO_MAX_RUNS
+    if len(payload.run_ids) > max_runs:
+        raise HTTPException(status_code=413, detail=f"Portfolio reports are limited to {max_runs} runs")
+    await _require_report_runs(run_store, payload.run_ids)
+    return await _report_response(
+        request, payload.run_ids, payload.format, payload.title, "portfolio-report",
+        run_store, renderer, report_cache,
+    )
+
+
+@router.post("/reports/portfolio/sweep", response_model=WeightSweepResponse)
+async def portfolio_weight_sweep(
+    payload: WeightSweepRequest,
+    run_store: RunStore = Depends(get_run_store),
+    master_agent: MasterAgent = Depends(get_master_agent),
+) -> WeightSweepResponse:
+    """
+    Weight-sensitivity analysis over stored runs: every run is re-ranked under each weighting
+    in one vectorized pass, reporting its rank under the current weights and its best, median
+    and worst rank across the scenarios. Nothing is re-analysed.
+    """
+    max_runs = get_settings().WEIGHT_SWEEP_MAX_RUNS
+    if len(payload.run_ids) > max_runs:
+        raise HTTPException(status_code=413, detail=f"Weight sweeps are limited to {max_runs} runs")
+    unknown = {key for weights in payload.weights for key in weights} - set(DIMENSIONS)
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown grading dimensions: {sorted(unknown)}")
+
+    runs = await _require_report_runs(run_store, payload.run_ids)
+    # Explicit weightings, or a number of random ones drawn inside the grading agent
+    scenarios: List[GradingWeights] | int = [
+        GradingWeights(**{d: weights.get(d, 0.0) for d in DIMENSIONS}) for weights in payload.weights
+    ] or payload.scenarios
+
+    overall, rank, stability = await asyncio.to_thread(
+        master_agent.grading_agent.weight_sensitivity,
+        [run.response.results for run in runs],
+        scenarios,
+        payload.seed,
+    )
+    items = [
+        WeightSweepItem(
+            run_id=run.run_id,
+            molecule_name=run.request.molecule_name,
+            target_indication=run.request.target_indication,
+            overall_score=float(overall[i]),
+            rank=int(rank[i]),
+            best_rank=int(stability[i, 0]),
+            median_rank=float(stability[i, 1]),
+            worst_rank=int(stability[i, 2]),
+        )
+        for i, run in enumerate(runs)
+    ]
+    items.sort(key=lambda item: item.rank)
+    return WeightSweepResponse(scenarios=len(payload.weights) or payload.scenarios, items=items)
+
+
+@router.get("/history/top", response_model=List[MoleculeScore])
+async def top_molecules(
+    days: int = Query(30, ge=1, le=3650),
+    limit: int = Query(10, ge=1, le=1000),
+    indication: str | None = None,
+    run_store: RunStore = Depends(get_run_store),
+) -> List[MoleculeScore]:
+    """Best-scoring molecules over the last `days` days, from stored runs (no re-analysis)."""
+    return await run_store.top_molecules(days=days, limit=limit, indication=indication)
+
+
+@router.get("/history/trend", response_model=List[ScoreTrendPoint])
+async def score_trend(
+    molecule: str,
+    indication: str | None = None,
+    days: int | None = Query(None, ge=1, le=3650),
+    bucket: str = Query("day", pattern="^(" + "|".join(TREND_BUCKETS) + ")$"),
+    run_store: RunStore = Depends(get_run_store),
+) -> List[ScoreTrendPoint]:
+    """Overall score of one molecule over time, aggregated per day, week or month."""
+    return await run_store.score_trend(molecule, indication=indication, days=days, bucket=bucket)
+
+
+def _require_index(index: "PortfolioIndex | None") -> "PortfolioIndex":
+    if index is None:
+        raise HTTPException(status_code=503, detail="Portfolio index is disabled")
+    return index
+
+
+@router.get("/portfolio/similar", response_model=List[SimilarMolecule])
+async def similar_molecules(
+    molecule: str,
+    indication: str | None = None,
+    k: int = Query(10, ge=1, le=100),
+    basis: Literal["profile", "descriptor"] = "profile",
+    index: "PortfolioIndex | None" = Depends(get_portfolio_index),
+) -> List[SimilarMolecule]:
+    """
+    Analysed molecules nearest to one molecule. basis=profile compares agent findings and
+    grades (the molecule must have been analysed); basis=descriptor compares names and
+    indications and works for untested molecules too.
     """
-    return await master_agent.run_pipeline(payload)
+    index = _require_index(index)
+    try:
+        return await asyncio.to_thread(index.similar, molecule, indication, k, basis)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=exc.args[0]) from None
+
+
+@router.post("/portfolio/prescreen", response_model=PrescreenResponse)
+async def prescreen(
+    payload: PrescreenRequest,
+    request: Request,
+    index: "PortfolioIndex | None" = Depends(get_portfolio_index),
+) -> Response:
+    """
+    Cheap triage before any pipeline runs: each candidate's grade is estimated from the
+    analysed molecules most similar to it, and candidates come back ranked by that estimate.
+    Confidence is the mean similarity of the neighbours used; no estimate means nothing
+    similar enough has been analysed yet.
+    """
+    index = _require_index(index)
+    settings = get_settings()
+    if len(payload.items) > settings.PRESCREEN_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Pre-screen limited to {settings.PRESCREEN_MAX_ITEMS} items")
+
+    estimates = await asyncio.to_thread(
+        index.prescreen,
+        [(item.molecule_name, item.target_indication) for item in payload.items],
+        payload.neighbours or settings.PRESCREEN_NEIGHBOURS,
+        settings.PRESCREEN_MIN_SIMILARITY,
+        payload.include_neighbours,
+    )
+    items = [
+        PrescreenItem(
+            index=i,
+            request=item,
+            estimated_grading=estimate.grading,
+            confidence=estimate.confidence,
+            analysed=estimate.analysed,
+            neighbours=estimate.neighbours,
+        )
+        for i, (item, estimate) in enumerate(zip(payload.items, estimates))
+    ]
+    # Best estimates first; candidates without one last, in submission order
+    items.sort(
+        key=lambda item: (
+            item.estimated_grading is None,
+            -item.estimated_grading.overall_score if item.estimated_grading else 0.0,
+            item.index,
+        )
+    )
+    return model_response(
+        PrescreenResponse(indexed_molecules=len(index), items=items), accept=request.headers.get("accept")
+    )
@@ -1,4 +1,4 @@
-# backend/app/api/v1/router.py
+# backend/app/api/V1/router.py
 from fastapi import APIRouter
 from .endpoints import analysis
 
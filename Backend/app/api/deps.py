@@ -0,0 +1,53 @@
+# backend/app/api/deps.py
+from typing import TYPE_CHECKING
+from fastapi import Request
+from ..agents.master import MasterAgent
+from ..agents.registry import AgentRegistry
+from ..db.run_store import RunStore
+from ..services.admission import AdmissionController
+from ..services.idempotency import RequestDeduplicator
+from ..services.jobs import JobRunner
+from ..services.report_rendering import ReportFileCache, ReportRenderer
+
+if TYPE_CHECKING:
+    # Imported lazily by main.py: it pulls in NumPy
+    from ..services.portfolio_index import PortfolioIndex
+
+
+def get_agent_registry(request: Request) -> AgentRegistry:
+    return request.app.state.agent_registry
+
+
+def get_master_agent(request: Request) -> MasterAgent:
+    # Built once in the application lifespan (see main.py), shared by every request
+    return request.app.state.master_agent
+
+
+def get_job_runner(request: Request) -> JobRunner:
+    return request.app.state.job_runner
+
+
+def get_run_store(request: Request) -> RunStore:
+    return request.app.state.run_store
+
+
+def get_report_renderer(request: Request) -> ReportRenderer:
+    return request.app.state.report_renderer
+
+
+def get_report_cache(request: Request) -> ReportFileCache:
+    return request.app.state.report_cache
+
+
+def get_request_deduplicator(request: Request) -> RequestDeduplicator:
+    return request.app.state.request_deduplicator
+
+
+def get_admission_controller(request: Request) -> AdmissionController | None:
+    # None when ADMISSION_ENABLED is off
+    return request.app.state.admission
+
+
+def get_portfolio_index(request: Request) -> "PortfolioIndex | None":
+    # None when PORTFOLIO_INDEX_ENABLED is off
+    return request.app.state.portfolio_index
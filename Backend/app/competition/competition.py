@@ -1,25 +1,63 @@
-# backend/app/agents/competition/competition.py
-from typing import Any, Dict
-from ..base import BaseAgent
-from ...schemas.analysis import AnalysisRequest
+# backend/app/competition/competition.py
+from typing import Dict
+from ..agents.base import BaseAgent
+from ..schemas.agent_data import CompetitionData, PatentLandscapeData, payload_of
+from ..schemas.analysis import AgentResult, AnalysisRequest
 
 
 class CompetitionAgent(BaseAgent):
     """
     Assesses generic competition intensity and price erosion.
+    Builds on PatentLandscapeAgent: skipped while primary patents are in force (no generic
+    market to compete in yet), and live secondary patents delay generic entry.
     """
 
+    depends_on = ("PatentLandscapeAgent",)
+
+    @staticmethod
+    def _patents(upstream: Dict[str, AgentResult]) -> PatentLandscapeData | None:
+        result = upstream.get("PatentLandscapeAgent")
+        return payload_of(result.agent_name, result.raw_data) if result is not None else None
+
+    def skip_reason(self, upstream: Dict[str, AgentResult]) -> str | None:
+        patents = self._patents(upstream)
+        if patents is not None and not patents.primary_patents_expired:
+            return "primary patents still in force"
+        return None
+
     async def run(self, request: AnalysisRequest):
-        data: Dict[str, Any] = {
-            "number_of_generic_players": 6,
-            "price_erosion_score": 0.6,  # higher = more price pressure
-            "differentiation_potential_score": 0.7,
-            "competition_overall_score": 0.55,  # higher = more favourable competition
-        }
+        return await self.run_with_context(request, {})
+
+    async def run_with_context(self, request: AnalysisRequest, upstream: Dict[str, AgentResult]):
+        data = CompetitionData(
+            number_of_generic_players=6,
+            price_erosion_score=0.6,  # higher = more price pressure
+            differentiation_potential_score=0.7,
+            competition_overall_score=0.55,  # higher = more favourable competition
+        )
 
         summary = (
             "Competition analysis shows multiple generic players and moderate price erosion, but "
             "there is still room for differentiation via cost, quality or supply reliability."
         )
 
+        patents = self._patents(upstream)
+        if patents is not None:
+            # Secondary patents keep some generics out, which slows price erosion
+            risk = patents.secondary_patent_risk_score
+            price_erosion = round(0.6 * (1 - 0.4 * risk), 4)
+            data = CompetitionData(
+                number_of_generic_players=max(1, round(6 * (1 - 0.5 * risk))),
+                price_erosion_score=price_erosion,
+                differentiation_potential_score=data.differentiation_potential_score,
+                competition_overall_score=round(
+                    0.5 * (1 - price_erosion) + 0.5 * data.differentiation_potential_score, 4
+                ),
+                expected_generic_entry=patents.clear_from,
+            )
+            summary += (
+                f" Secondary patent risk of {risk:.2f} limits entry to about "
+                f"{data.number_of_generic_players} generic players."
+            )
+
         return self._result(summary=summary, raw_data=data)
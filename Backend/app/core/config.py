@@ -2,6 +2,7 @@
 from pydantic_settings import BaseSettings
 from pydantic import AnyHttpUrl
 from functools import lru_cache
+from typing import Any, Dict, List, Literal
 
 
 class Settings(BaseSettings):
@@ -17,6 +18,156 @@ class Settings(BaseSettings):
     # Queue (used logically, real queue optional)
     REPORT_QUEUE_NAME: str = "report-generation"
 
+    LOG_LEVEL: str = "INFO"
+    # Include per-stage timings in every AnalysisResponse
+    RESPONSE_TIMINGS_ENABLED: bool = True
+
+    # Agent fan-out budgets (seconds)
+    AGENT_TIMEOUT_SECONDS: float = 10.0
+    PIPELINE_TIMEOUT_SECONDS: float = 20.0
+
+    # Agent registry: None enables every built-in agent; plugins are discovered via entry points
+    ENABLED_AGENTS: List[str] | None = None
+    AGENT_ENTRY_POINT_GROUP: str | None = "ey_agentic.agents"
+    # When agent modules are imported: "blocking" before the app serves, "background" right
+    # after it starts serving, "off" on the first pipeline request
+    AGENT_PREWARM: Literal["off", "background", "blocking"] = "background"
+    # Number of modules listed in /health/startup
+    STARTUP_REPORT_TOP_IMPORTS: int = 25
+
+    # Agent result cache (in-process LRU, optionally backed by Redis at REDIS_URL; always shared
+    # through the coordination backend when COORDINATION_BACKEND is on)
+    AGENT_CACHE_ENABLED: bool = True
+    AGENT_CACHE_MAX_ENTRIES: int = 10_000
+    AGENT_CACHE_TTL_SECONDS: float = 3600.0
+    AGENT_CACHE_USE_REDIS: bool = False
+
+    # Batch screening
+    BATCH_MAX_ITEMS: int = 1000
+    BATCH_PIPELINE_CONCURRENCY: int = 32
+    BATCH_AGENT_CONCURRENCY: int = 16
+
+    # Job mode: background pipeline workers and the report-generation queue
+    JOB_WORKERS: int = 4
+    REPORT_WORKERS: int = 2
+    JOB_QUEUE_MAX_SIZE: int = 1000
+    # Graded runs waiting for their report, per process (the report queue is not shared)
+    REPORT_QUEUE_MAX_SIZE: int = 100
+    RUN_RETENTION_SECONDS: float = 24 * 3600.0
+
+    # /analyze deduplication: identical requests replay a completed response for this long
+    # (0 disables replay; in-flight sharing always applies); Idempotency-Key responses are kept longer
+    ANALYZE_REPLAY_SECONDS: float = 10.0
+    IDEMPOTENCY_KEY_TTL_SECONDS: float = 24 * 3600.0
+    IDEMPOTENCY_MAX_ENTRIES: int = 10_000
+
+    # Admission control for /analyze (see services/admission.py): the concurrency limit adapts
+    # to pipeline latency within [MIN, MAX]; excess requests queue per tenant, then are shed
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_INITIAL_LIMIT: int = 16
+    ADMISSION_MIN_LIMIT: int = 4
+    ADMISSION_MAX_LIMIT: int = 256
+    ADMISSION_MAX_QUEUE: int = 128
+    ADMISSION_MAX_QUEUE_PER_TENANT: int = 16
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    # Header naming the tenant for fair queuing; requests without it are keyed by client address
+    ADMISSION_TENANT_HEADER: str = "X-Tenant-ID"
+
+    # Portfolio similarity index (see services/portfolio_index.py): every graded run is indexed,
+    # the latest PORTFOLIO_INDEX_WARM_RUNS are loaded from the run store on startup
+    PORTFOLIO_INDEX_ENABLED: bool = True
+    PORTFOLIO_INDEX_WARM_RUNS: int = 50_000
+    # /portfolio/prescreen: neighbours per estimate, similarity floor, candidates per call
+    PRESCREEN_NEIGHBOURS: int = 10
+    PRESCREEN_MIN_SIMILARITY: float = 0.2
+    PRESCREEN_MAX_ITEMS: int = 10_000
+
+    # Multi-worker coordination (see services/coordination.py): "redis" shares locks, job queues and
+    # the agent cache through REDIS_URL, "local" uses an in-process stand-in (tests, single process)
+    COORDINATION_BACKEND: Literal["off", "redis", "local"] = "off"
+    COORDINATION_NAMESPACE: str = "ey-agentic"
+    # Per molecule/indication run lock: lease length (renewed while held) and how long to wait for it
+    RUN_LOCK_TTL_SECONDS: float = 30.0
+    RUN_LOCK_WAIT_SECONDS: float = 60.0
+    # Workers missing three heartbeats have their queued and claimed jobs requeued
+    WORKER_HEARTBEAT_SECONDS: float = 5.0
+    # How often an idle worker looks for jobs to steal from its peers
+    JOB_STEAL_INTERVAL_SECONDS: float = 0.2
+
+    # Run history: "memory" (RUN_RETENTION_SECONDS only), "sqlite" (embedded file) or "mongo" (MONGO_URI)
+    RUN_STORE_BACKEND: Literal["memory", "sqlite", "mongo"] = "sqlite"
+    RUN_STORE_PATH: str = "data/runs.sqlite"
+    MONGO_DB_NAME: str = "ey_agentic"
+    # Write-behind: pending runs are written in bulk at this interval or batch size
+    RUN_STORE_FLUSH_INTERVAL_SECONDS: float = 0.5
+    RUN_STORE_BATCH_SIZE: int = 500
+    # sqlite / mongo: finished runs older than this are pruned every RUN_STORE_PRUNE_INTERVAL_SECONDS;
+    # None keeps the history forever
+    RUN_HISTORY_RETENTION_DAYS: float | None = 365.0
+    RUN_STORE_PRUNE_INTERVAL_SECONDS: float = 3600.0
+
+    # Upstream data sources. With UPSTREAM_LIVE_DATA the agents query them through the pooled
+    # clients (falling back to offline data when a source fails); off, they use offline data only
+    UPSTREAM_LIVE_DATA: bool = False
+    PUBMED_BASE_URL: str = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+    NCBI_API_KEY: str | None = None
+    CLINICALTRIALS_BASE_URL: str = "https://clinicaltrials.gov/api/v2"
+    CLINICALTRIALS_RATE_PER_SECOND: float = 5.0
+    USPTO_BASE_URL: str = "https://search.patentsview.org/api/v1"
+    USPTO_API_KEY: str | None = None
+    USPTO_RATE_PER_SECOND: float = 0.75
+    IQVIA_BASE_URL: str | None = None  # licensed endpoint, deployment-specific
+    IQVIA_API_KEY: str | None = None
+    IQVIA_RATE_PER_SECOND: float = 10.0
+
+    # Local knowledge indexes (see services/vector_index.py); None keeps the built-in heuristics
+    INTERNAL_KNOWLEDGE_INDEX_PATH: str | None = None
+    WEB_INTELLIGENCE_INDEX_PATH: str | None = None
+    KNOWLEDGE_TOP_K: int = 8
+    KNOWLEDGE_NPROBE: int = 8
+
+    # Columnar IQVIA/EXIM store (see services/market_store.py); None keeps simulated market data
+    MARKET_STORE_PATH: str | None = None
+    EXIM_REPORTER_COUNTRY: str = "IN"
+    # Market size that maps to a full size score in IQVIAInsightsAgent
+    MARKET_SIZE_REFERENCE_USD: float = 5e9
+
+    # Pickled patent index snapshot (see services/patent_index.py); None keeps the FTO heuristic
+    PATENT_INDEX_PATH: str | None = None
+
+    # Monte Carlo techno-economics (see agents/production/techno_economic_engine.py)
+    TECHNO_ECONOMIC_SCENARIOS: int = 100_000
+    TECHNO_ECONOMIC_DISCOUNT_RATE: float = 0.10
+
+    # Pools for CPU-bound agent work (see BaseAgent.cpu_bound); requests beyond the queue are rejected
+    COMPUTE_THREAD_WORKERS: int = 4
+    COMPUTE_PROCESS_WORKERS: int = 2
+    COMPUTE_QUEUE_MAX_SIZE: int = 64
+
+    # Report rendering (see services/report_rendering.py); None puts the download cache in the temp dir
+    REPORT_CACHE_DIR: str | None = None
+    REPORT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    REPORT_SECTION_CACHE_ENTRIES: int = 4096
+    REPORT_PORTFOLIO_MAX_RUNS: int = 1000
+    # /reports/portfolio/sweep: runs per weight-sensitivity analysis (no rendering, so far more)
+    WEIGHT_SWEEP_MAX_RUNS: int = 10_000
+
+    # Shared HTTP client pool
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_PER_HOST_CONCURRENCY: int = 10
+    HTTP_MAX_RETRIES: int = 3
+
+    def http_client_options(self) -> Dict[str, Any]:
+        return {
+            "timeout": self.HTTP_TIMEOUT_SECONDS,
+            "max_connections": self.HTTP_MAX_CONNECTIONS,
+            "max_keepalive_connections": self.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            "per_host_concurrency": self.HTTP_PER_HOST_CONCURRENCY,
+            "max_retries": self.HTTP_MAX_RETRIES,
+        }
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,23 @@
+# backend/app/core/logging.py
+import logging
+from contextvars import ContextVar
+
+# Set by MasterAgent for the duration of a pipeline run; stamped on every log record
+current_run_id: ContextVar[str] = ContextVar("current_run_id", default="-")
+
+
+class RunIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.run_id = current_run_id.get()
+        return True
+
+
+def configure_logging(level: str = "INFO") -> None:
+    handler = logging.StreamHandler()
+    handler.addFilter(RunIdFilter())
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s [run=%(run_id)s] %(name)s: %(message)s")
+    )
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level)
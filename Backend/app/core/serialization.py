@@ -0,0 +1,59 @@
+# backend/app/core/serialization.py
+import dataclasses
+import json
+from typing import Any, Dict
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional: application/msgpack is only offered when installed
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    return str(value)
+
+
+def json_dumps(value: Any) -> bytes:
+    """JSON bytes for plain data (dicts, lists, datetimes, nested models); orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, default=_default).encode()
+
+
+def wants_msgpack(accept: str | None) -> bool:
+    return msgpack is not None and MSGPACK_MEDIA_TYPE in (accept or "")
+
+
+def model_response(
+    model: BaseModel,
+    accept: str | None = None,
+    exclude: Dict[str, Any] | None = None,
+    status_code: int = 200,
+    headers: Dict[str, str] | None = None,
+) -> Response:
+    """
+    Encodes a response model directly, skipping FastAPI's dump -> validate -> encode round trip
+    for response_model. JSON comes straight from pydantic-core; MessagePack when the client
+    accepts application/msgpack and msgpack is installed.
+    """
+    headers = {**(headers or {}), "Vary": "Accept"}
+    if wants_msgpack(accept):
+        body = msgpack.packb(model.model_dump(mode="json", exclude=exclude), use_bin_type=True)
+        media_type = MSGPACK_MEDIA_TYPE
+    else:
+        body = model.__pydantic_serializer__.to_json(model, exclude=exclude)
+        media_type = "application/json"
+    return Response(content=body, status_code=status_code, media_type=media_type, headers=headers)
@@ -0,0 +1,140 @@
+# backend/app/core/startup.py
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+from typing import Any, Dict, Iterator, List
+
+
+class _TimedLoader:
+    """Wraps a module loader to time create_module + exec_module; restores the real loader."""
+
+    def __init__(self, profiler: "ImportProfiler", loader: Any) -> None:
+        self._profiler = profiler
+        self._loader = loader
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        with self._profiler.timing(spec.name):
+            return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        # Everything after the import sees the original loader (inspect, importlib.resources)
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        with self._profiler.timing(module.__name__):
+            self._loader.exec_module(module)
+
+
+class ImportProfiler(MetaPathFinder):
+    """
+    In-process equivalent of `python -X importtime`: records how long each module took to
+    import, with and without the modules it imported in turn. Installed first thing in
+    main.py so the startup report covers the app's own import graph and the agents loaded later.
+    """
+
+    def __init__(self) -> None:
+        # module -> [self seconds, inclusive seconds]
+        self.timings: Dict[str, List[float]] = {}
+        self._local = threading.local()
+        self._installed = False
+
+    def install(self) -> None:
+        if not self._installed:
+            sys.meta_path.insert(0, self)
+            self._installed = True
+
+    def uninstall(self) -> None:
+        if self._installed:
+            sys.meta_path.remove(self)
+            self._installed = False
+
+    def find_spec(self, fullname, path=None, target=None):
+        # Resolve with the finders behind us, then wrap the loader of real (file-backed) modules
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.has_location and spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(self, spec.loader)
+            return spec
+        return None
+
+    @contextmanager
+    def timing(self, name: str) -> Iterator[None]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)  # time spent in nested imports
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            entry = self.timings.setdefault(name, [0.0, 0.0])
+            entry[0] += elapsed - nested
+            entry[1] += elapsed
+
+    def top(self, limit: int = 25) -> List[Dict[str, Any]]:
+        """Slowest modules by self time."""
+        ranked = sorted(self.timings.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        return [
+            {"module": name, "self_ms": round(own * 1000, 3), "cumulative_ms": round(total * 1000, 3)}
+            for name, (own, total) in ranked
+        ]
+
+    def total_ms(self, prefix: str | None = None) -> float:
+        """Summed self time, optionally only for modules under a package prefix."""
+        return round(
+            sum(own for name, (own, _) in self.timings.items() if prefix is None or name.startswith(prefix)) * 1000,
+            3,
+        )
+
+
+class StartupReport:
+    """Wall time of the cold-start phases (imports, lifespan, agent loading)."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.ready_at: float | None = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round((time.perf_counter() - started) * 1000, 3)
+
+    def checkpoint(self, name: str) -> None:
+        """Records a phase that began when the process started (e.g. module imports)."""
+        self.phases[name] = round((time.perf_counter() - self.started) * 1000, 3)
+
+    def mark_ready(self) -> None:
+        self.ready_at = time.perf_counter()
+
+    def as_dict(self, profiler: ImportProfiler, top_imports: int = 25) -> Dict[str, Any]:
+        return {
+            "phases_ms": dict(self.phases),
+            "time_to_ready_ms": round((self.ready_at - self.started) * 1000, 3) if self.ready_at else None,
+            "import_ms": {
+                "total": profiler.total_ms(),
+                "app": profiler.total_ms("app."),
+                "modules": len(profiler.timings),
+            },
+            "slowest_imports": profiler.top(top_imports),
+        }
+
+
+IMPORT_PROFILER = ImportProfiler()
+STARTUP = StartupReport()
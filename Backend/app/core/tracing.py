@@ -0,0 +1,27 @@
+# backend/app/core/tracing.py
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+try:
+    from opentelemetry import trace as _otel_trace
+except ImportError:  # tracing is optional; spans become no-ops
+    _otel_trace = None
+
+_tracer = _otel_trace.get_tracer("ey_agentic.pipeline") if _otel_trace else None
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[None]:
+    """
+    OpenTelemetry span when opentelemetry-api is installed (exported by whatever SDK the
+    deployment configures), otherwise nothing. Child spans nest through contextvars, so agent
+    spans created inside asyncio tasks attach to the run's root span.
+    """
+    if _tracer is None:
+        yield
+        return
+    with _tracer.start_as_current_span(name) as current:
+        for key, value in attributes.items():
+            if value is not None:
+                current.set_attribute(key, value)
+        yield
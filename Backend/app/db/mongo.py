@@ -0,0 +1,206 @@
+# backend/app/db/mongo.py
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+from .run_store import TREND_BUCKETS, BufferedRunStore, run_row
+from ..agents.base import normalize_key_part
+from ..schemas.agent_data import payload_of, raw_dict
+from ..schemas.analysis import MoleculeScore, RunStatus, ScoreTrendPoint
+
+# $dateToString formats matching run_store.period_of
+_PERIOD_FORMATS = {"day": "%Y-%m-%d", "week": "%G-W%V", "month": "%Y-%m"}
+
+
+class MongoRunStore(BufferedRunStore):
+    """
+    Run history in MongoDB (motor).
+
+    Collections:
+      runs           one document per run: indexed fields + the full RunStatus under `run`
+      agent_results  one document per (run, agent) for per-agent history
+    Writes go out as unordered bulk upserts from the BufferedRunStore flusher.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        database: str,
+        flush_interval: float = 0.5,
+        batch_size: int = 500,
+        retention_days: float | None = None,
+        prune_interval: float = 3600.0,
+    ) -> None:
+        super().__init__(flush_interval, batch_size, retention_days, prune_interval)
+        try:
+            from motor.motor_asyncio import AsyncIOMotorClient
+        except ImportError as exc:
+            raise RuntimeError("RUN_STORE_BACKEND=mongo requires the motor package") from exc
+        self._client = AsyncIOMotorClient(uri, tz_aware=True)
+        self._db = self._client[database]
+        self._runs = self._db["runs"]
+        self._agent_results = self._db["agent_results"]
+
+    async def _setup(self) -> None:
+        await self._runs.create_index("run_id", unique=True)
+        await self._runs.create_index([("molecule_key", 1), ("created_at", 1)])
+        await self._runs.create_index([("indication_key", 1), ("created_at", 1)])
+        await self._runs.create_index([("status", 1), ("created_at", -1), ("overall_score", -1)])
+        await self._runs.create_index([("overall_score", -1)])
+        await self._agent_results.create_index([("run_id", 1), ("agent_name", 1)], unique=True)
+        await self._agent_results.create_index([("agent_name", 1), ("molecule_key", 1)])
+
+    async def _teardown(self) -> None:
+        self._client.close()
+
+    async def _write_batch(self, runs: List[RunStatus]) -> None:
+        from pymongo import ReplaceOne
+
+        run_ops, result_ops = [], []
+        for run in runs:
+            doc: Dict[str, Any] = run_row(run)
+            doc["run"] = run.model_dump(mode="json")
+            run_ops.append(ReplaceOne({"run_id": run.run_id}, doc, upsert=True))
+            if run.response is not None:
+                for r in run.response.results:
+                    result_ops.append(
+                        ReplaceOne(
+                            {"run_id": run.run_id, "agent_name": r.agent_name},
+                            {
+                                "run_id": run.run_id,
+                                "agent_name": r.agent_name,
+                                "molecule_key": doc["molecule_key"],
+                                "input_fingerprint": r.input_fingerprint,
+                                "generated_at": r.generated_at,
+                                "summary": r.summary,
+                                "raw_data": raw_dict(r.raw_data),
+                            },
+                            upsert=True,
+                        )
+                    )
+        if run_ops:
+            await self._runs.bulk_write(run_ops, ordered=False)
+        if result_ops:
+            await self._agent_results.bulk_write(result_ops, ordered=False)
+
+    async def _fetch(self, run_id: str) -> RunStatus | None:
+        doc = await self._runs.find_one({"run_id": run_id}, {"run": 1, "_id": 0})
+        return RunStatus.model_validate(doc["run"]) if doc else None
+
+    async def prune(self, before: datetime) -> int:
+        match = {"status": {"$in": list(self.TERMINAL_STATUSES)}, "created_at": {"$lt": before}}
+        deleted = 0
+        # In batch_size slices, so each delete stays a bounded operation
+        while True:
+            cursor = self._runs.find(match, {"run_id": 1, "_id": 0}).limit(self.batch_size)
+            run_ids = [doc["run_id"] async for doc in cursor]
+            if not run_ids:
+                return deleted
+            await self._agent_results.delete_many({"run_id": {"$in": run_ids}})
+            deleted += (await self._runs.delete_many({"run_id": {"$in": run_ids}})).deleted_count
+
+    def _completed_match(self, indication: str | None, since: datetime | None) -> Dict[str, Any]:
+        match: Dict[str, Any] = {"status": "COMPLETED", "overall_score": {"$ne": None}}
+        if indication is not None:
+            match["indication_key"] = normalize_key_part(indication)
+        if since is not None:
+            match["created_at"] = {"$gte": since}
+        return match
+
+    async def top_molecules(
+        self, days: int = 30, limit: int = 10, indication: str | None = None
+    ) -> List[MoleculeScore]:
+        await self.flush()
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        pipeline = [
+            {"$match": self._completed_match(indication, since)},
+            {"$sort": {"created_at": 1}},
+            {
+                "$group": {
+                    "_id": "$molecule_key",
+                    "molecule_name": {"$last": "$molecule_name"},
+                    "best_score": {"$max": "$overall_score"},
+                    "latest_score": {"$last": "$overall_score"},
+                    "runs": {"$sum": 1},
+                    "last_run_at": {"$last": "$created_at"},
+                }
+            },
+            {"$sort": {"best_score": -1}},
+            {"$limit": limit},
+        ]
+        return [
+            MoleculeScore(
+                molecule_name=doc["molecule_name"] or doc["_id"],
+                best_score=doc["best_score"],
+                latest_score=doc["latest_score"],
+                runs=doc["runs"],
+                last_run_at=doc["last_run_at"],
+            )
+            async for doc in self._runs.aggregate(pipeline)
+        ]
+
+    async def score_trend(
+        self, molecule: str, indication: str | None = None, days: int | None = None, bucket: str = "day"
+    ) -> List[ScoreTrendPoint]:
+        if bucket not in TREND_BUCKETS:
+            raise ValueError(f"Unknown trend bucket '{bucket}'")
+        await self.flush()
+        since = datetime.now(timezone.utc) - timedelta(days=days) if days is not None else None
+        match = self._completed_match(indication, since)
+        match["molecule_key"] = normalize_key_part(molecule)
+        pipeline = [
+            {"$match": match},
+            {
+                "$group": {
+                    "_id": {"$dateToString": {"format": _PERIOD_FORMATS[bucket], "date": "$created_at"}},
+                    "runs": {"$sum": 1},
+                    "avg_score": {"$avg": "$overall_score"},
+                    "min_score": {"$min": "$overall_score"},
+                    "max_score": {"$max": "$overall_score"},
+                    "first": {"$min": "$created_at"},
+                }
+            },
+            {"$sort": {"first": 1}},
+        ]
+        return [
+            ScoreTrendPoint(
+                period=doc["_id"],
+                runs=doc["runs"],
+                avg_score=doc["avg_score"],
+                min_score=doc["min_score"],
+                max_score=doc["max_score"],
+            )
+            async for doc in self._runs.aggregate(pipeline)
+        ]
+
+    async def latest_graded(self, limit: int = 50_000) -> List[Dict[str, Any]]:
+        await self.flush()
+        pipeline = [
+            {"$match": self._completed_match(None, None)},
+            {"$sort": {"created_at": -1}},
+            {
+                "$group": {
+                    "_id": {"molecule": "$molecule_key", "indication": "$indication_key"},
+                    "run_id": {"$first": "$run_id"},
+                    "molecule_name": {"$first": "$molecule_name"},
+                    "target_indication": {"$first": "$target_indication"},
+                    "created_at": {"$first": "$created_at"},
+                    "grading": {"$first": "$run.response.grading"},
+                    "results": {"$first": "$run.response.results"},
+                }
+            },
+            {"$sort": {"created_at": -1}},
+            {"$limit": limit},
+        ]
+        return [
+            {
+                "run_id": doc["run_id"],
+                "molecule_name": doc["molecule_name"],
+                "target_indication": doc["target_indication"],
+                "created_at": doc["created_at"],
+                "grading": doc["grading"],
+                "results": {
+                    r["agent_name"]: payload_of(r["agent_name"], r.get("raw_data", {})) or r.get("raw_data", {})
+                    for r in doc["results"] or ()
+                },
+            }
+            async for doc in self._runs.aggregate(pipeline, allowDiskUse=True)
+        ]
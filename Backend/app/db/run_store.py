@@ -0,0 +1,319 @@
+# backend/app/db/run_store.py
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+from ..core.config import Settings
+from ..agents.base import normalize_key_part
+from ..schemas.analysis import MoleculeScore, RunStatus, ScoreTrendPoint
+
+logger = logging.getLogger(__name__)
+
+TREND_BUCKETS = ("day", "week", "month")
+
+
+def period_of(moment: datetime, bucket: str) -> str:
+    if bucket == "day":
+        return moment.strftime("%Y-%m-%d")
+    if bucket == "week":
+        year, week, _ = moment.isocalendar()
+        return f"{year}-W{week:02d}"
+    if bucket == "month":
+        return moment.strftime("%Y-%m")
+    raise ValueError(f"Unknown trend bucket '{bucket}'")
+
+
+def run_row(run: RunStatus) -> Dict[str, Any]:
+    """Flat, indexable fields of a run shared by the persistent stores."""
+    grading = run.response.grading if run.response is not None else None
+    return {
+        "run_id": run.run_id,
+        "status": run.status,
+        "molecule_key": normalize_key_part(run.request.molecule_name),
+        "molecule_name": run.request.molecule_name,
+        "indication_key": normalize_key_part(run.request.target_indication),
+        "target_indication": run.request.target_indication,
+        "overall_score": grading.overall_score if grading is not None else None,
+        "created_at": run.created_at,
+        "updated_at": run.updated_at,
+    }
+
+
+def graded_row(run: RunStatus) -> Dict[str, Any]:
+    """Row of RunStore.latest_graded(): grading vector plus raw_data per agent."""
+    return {
+        "run_id": run.run_id,
+        "molecule_name": run.request.molecule_name,
+        "target_indication": run.request.target_indication,
+        "created_at": run.created_at,
+        "grading": run.response.grading.model_dump(),
+        "results": {r.agent_name: r.raw_data for r in run.response.results},
+    }
+
+
+class RunStore:
+    """
+    Interface of the run stores.
+    get/save serve job mode and report downloads; the history queries serve dashboards.
+    """
+
+    TERMINAL_STATUSES = ("COMPLETED", "FAILED")
+
+    async def start(self) -> None:
+        """Open connections / create indexes. Called once from the application lifespan."""
+
+    async def close(self) -> None:
+        """Flush pending writes and release connections."""
+
+    async def save(self, run: RunStatus) -> None:
+        raise NotImplementedError
+
+    async def flush(self) -> None:
+        """Write pending saves now, so other processes sharing the store can read them."""
+
+    async def get(self, run_id: str) -> RunStatus | None:
+        raise NotImplementedError
+
+    async def top_molecules(
+        self, days: int = 30, limit: int = 10, indication: str | None = None
+    ) -> List[MoleculeScore]:
+        """Best-scoring molecules among completed runs created in the last `days` days."""
+        raise NotImplementedError
+
+    async def score_trend(
+        self, molecule: str, indication: str | None = None, days: int | None = None, bucket: str = "day"
+    ) -> List[ScoreTrendPoint]:
+        """Overall score of one molecule over time, oldest bucket first."""
+        raise NotImplementedError
+
+    async def latest_graded(self, limit: int = 50_000) -> List[Dict[str, Any]]:
+        """
+        Latest completed run of each molecule / indication pair, newest first, as graded_row()
+        dicts. Feeds the portfolio similarity index (services/portfolio_index.py).
+        """
+        raise NotImplementedError
+
+    async def prune(self, before: datetime) -> int:
+        """Deletes finished runs created before `before`; returns how many were deleted."""
+        return 0
+
+
+class InMemoryRunStore(RunStore):
+    """
+    Process-local store of runs (tests, benchmarks, single-process dev).
+    Finished runs are dropped after retention_seconds so the store cannot grow without bound.
+    """
+
+    def __init__(self, retention_seconds: float = 24 * 3600.0) -> None:
+        self.retention_seconds = retention_seconds
+        self._runs: Dict[str, RunStatus] = {}
+        self._finished_at: Dict[str, float] = {}
+
+    async def save(self, run: RunStatus) -> None:
+        self._runs[run.run_id] = run
+        if run.status in self.TERMINAL_STATUSES:
+            self._finished_at.setdefault(run.run_id, time.monotonic())
+        self._prune()
+
+    async def get(self, run_id: str) -> RunStatus | None:
+        return self._runs.get(run_id)
+
+    def _prune(self) -> None:
+        # _finished_at is in completion order, so expired runs are always at the front
+        cutoff = time.monotonic() - self.retention_seconds
+        while self._finished_at:
+            run_id, finished = next(iter(self._finished_at.items()))
+            if finished >= cutoff:
+                break
+            self._runs.pop(run_id, None)
+            del self._finished_at[run_id]
+
+    def _completed(self, indication: str | None, since: datetime | None) -> List[Dict[str, Any]]:
+        rows = []
+        for run in self._runs.values():
+            row = run_row(run)
+            if row["status"] != "COMPLETED" or row["overall_score"] is None:
+                continue
+            if indication is not None and row["indication_key"] != normalize_key_part(indication):
+                continue
+            if since is not None and row["created_at"] < since:
+                continue
+            rows.append(row)
+        return sorted(rows, key=lambda r: r["created_at"])
+
+    async def top_molecules(
+        self, days: int = 30, limit: int = 10, indication: str | None = None
+    ) -> List[MoleculeScore]:
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        by_molecule: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for row in self._completed(indication, since):
+            by_molecule[row["molecule_key"]].append(row)
+        scores = [
+            MoleculeScore(
+                molecule_name=rows[-1]["molecule_name"] or key,
+                best_score=max(r["overall_score"] for r in rows),
+                latest_score=rows[-1]["overall_score"],
+                runs=len(rows),
+                last_run_at=rows[-1]["created_at"],
+            )
+            for key, rows in by_molecule.items()
+        ]
+        return sorted(scores, key=lambda s: -s.best_score)[:limit]
+
+    async def score_trend(
+        self, molecule: str, indication: str | None = None, days: int | None = None, bucket: str = "day"
+    ) -> List[ScoreTrendPoint]:
+        since = datetime.now(timezone.utc) - timedelta(days=days) if days is not None else None
+        buckets: Dict[str, List[float]] = defaultdict(list)
+        key = normalize_key_part(molecule)
+        for row in self._completed(indication, since):
+            if row["molecule_key"] == key:
+                buckets[period_of(row["created_at"], bucket)].append(row["overall_score"])
+        return [
+            ScoreTrendPoint(
+                period=period, runs=len(s), avg_score=sum(s) / len(s), min_score=min(s), max_score=max(s)
+            )
+            for period, s in sorted(buckets.items())
+        ]
+
+    async def latest_graded(self, limit: int = 50_000) -> List[Dict[str, Any]]:
+        latest: Dict[Tuple[str, str], RunStatus] = {}
+        for run in self._runs.values():
+            if run.status != "COMPLETED" or run.response is None:
+                continue
+            key = (normalize_key_part(run.request.molecule_name), normalize_key_part(run.request.target_indication))
+            if key not in latest or run.created_at >= latest[key].created_at:
+                latest[key] = run
+        runs = sorted(latest.values(), key=lambda run: run.created_at, reverse=True)[:limit]
+        return [graded_row(run) for run in runs]
+
+
+class BufferedRunStore(RunStore):
+    """
+    Write-behind base for the persistent stores.
+
+    save() only records the latest state of a run in memory; a background task writes pending
+    runs in bulk every flush_interval seconds, or as soon as batch_size runs are waiting.
+    Successive status changes of one run between flushes collapse into a single write.
+    Reads see pending runs immediately, and history queries flush first.
+
+    With retention_days set, another task prunes finished runs older than that every
+    prune_interval seconds (None keeps the history forever).
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 0.5,
+        batch_size: int = 500,
+        retention_days: float | None = None,
+        prune_interval: float = 3600.0,
+    ) -> None:
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.retention_days = retention_days
+        self.prune_interval = prune_interval
+        self._pending: Dict[str, RunStatus] = {}
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flusher: asyncio.Task | None = None
+        self._pruner: asyncio.Task | None = None
+
+    async def _setup(self) -> None:
+        ...
+
+    async def _teardown(self) -> None:
+        ...
+
+    async def _write_batch(self, runs: List[RunStatus]) -> None:
+        raise NotImplementedError
+
+    async def _fetch(self, run_id: str) -> RunStatus | None:
+        raise NotImplementedError
+
+    async def start(self) -> None:
+        await self._setup()
+        self._flusher = asyncio.create_task(self._flush_loop())
+        if self.retention_days is not None:
+            self._pruner = asyncio.create_task(self._prune_loop())
+
+    async def close(self) -> None:
+        for task in (self._flusher, self._pruner):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._flusher = self._pruner = None
+        await self.flush()
+        await self._teardown()
+
+    async def save(self, run: RunStatus) -> None:
+        self._pending[run.run_id] = run
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+    async def get(self, run_id: str) -> RunStatus | None:
+        pending = self._pending.get(run_id)
+        if pending is not None:
+            return pending
+        return await self._fetch(run_id)
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            try:
+                await self._write_batch(list(batch.values()))
+            except BaseException:
+                # Put the batch back without overwriting anything saved since
+                self._pending = {**batch, **self._pending}
+                raise
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Run store flush failed; %d runs kept for retry", len(self._pending))
+
+    async def _prune_loop(self) -> None:
+        while True:
+            try:
+                before = datetime.now(timezone.utc) - timedelta(days=self.retention_days)
+                deleted = await self.prune(before)
+                if deleted:
+                    logger.info("Pruned %d runs created before %s", deleted, before.isoformat())
+            except Exception:
+                logger.exception("Run store pruning failed")
+            await asyncio.sleep(self.prune_interval)
+
+
+def build_run_store(settings: Settings) -> RunStore:
+    if settings.RUN_STORE_BACKEND == "sqlite":
+        from .sqlite_store import SQLiteRunStore
+
+        return SQLiteRunStore(
+            settings.RUN_STORE_PATH,
+            flush_interval=settings.RUN_STORE_FLUSH_INTERVAL_SECONDS,
+            batch_size=settings.RUN_STORE_BATCH_SIZE,
+            retention_days=settings.RUN_HISTORY_RETENTION_DAYS,
+            prune_interval=settings.RUN_STORE_PRUNE_INTERVAL_SECONDS,
+        )
+    if settings.RUN_STORE_BACKEND == "mongo":
+        from .mongo import MongoRunStore
+
+        return MongoRunStore(
+            settings.MONGO_URI,
+            settings.MONGO_DB_NAME,
+            flush_interval=settings.RUN_STORE_FLUSH_INTERVAL_SECONDS,
+            batch_size=settings.RUN_STORE_BATCH_SIZE,
+            retention_days=settings.RUN_HISTORY_RETENTION_DAYS,
+            prune_interval=settings.RUN_STORE_PRUNE_INTERVAL_SECONDS,
+        )
+    return InMemoryRunStore(retention_seconds=settings.RUN_RETENTION_SECONDS)
@@ -0,0 +1,292 @@
+# backend/app/db/sqlite_store.py
+import asyncio
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+from .run_store import TREND_BUCKETS, BufferedRunStore, run_row
+from ..agents.base import normalize_key_part
+from ..core.serialization import json_dumps
+from ..schemas.agent_data import payload_of, raw_dict
+from ..schemas.analysis import MoleculeScore, RunStatus, ScoreTrendPoint
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    molecule_key TEXT NOT NULL,
+    molecule_name TEXT,
+    indication_key TEXT NOT NULL,
+    target_indication TEXT,
+    overall_score REAL,
+    market_demand REAL,
+    production_feasibility REAL,
+    demographics REAL,
+    patents_and_trials REAL,
+    competition REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_molecule_time ON runs (molecule_key, indication_key, created_at);
+CREATE INDEX IF NOT EXISTS runs_indication_time ON runs (indication_key, created_at);
+-- Covers the "top N by score in a time window" query without touching the table
+CREATE INDEX IF NOT EXISTS runs_status_time_score
+    ON runs (status, created_at, molecule_key, overall_score, molecule_name);
+CREATE INDEX IF NOT EXISTS runs_score ON runs (overall_score DESC);
+
+CREATE TABLE IF NOT EXISTS agent_results (
+    run_id TEXT NOT NULL,
+    agent_name TEXT NOT NULL,
+    molecule_key TEXT NOT NULL,
+    input_fingerprint TEXT,
+    generated_at REAL,
+    summary TEXT NOT NULL,
+    raw_data TEXT NOT NULL,
+    PRIMARY KEY (run_id, agent_name)
+);
+CREATE INDEX IF NOT EXISTS agent_results_agent_molecule ON agent_results (agent_name, molecule_key);
+"""
+
+_GRADE_FIELDS = ("market_demand", "production_feasibility", "demographics", "patents_and_trials", "competition")
+
+# strftime patterns matching run_store.period_of
+_PERIOD_SQL = {
+    "day": "strftime('%Y-%m-%d', created_at, 'unixepoch')",
+    # ISO week: the year and day-of-year of that week's Thursday
+    "week": "strftime('%Y', created_at, 'unixepoch', '-3 days', 'weekday 4') || '-W' || "
+    "printf('%02d', (strftime('%j', created_at, 'unixepoch', '-3 days', 'weekday 4') - 1) / 7 + 1)",
+    "month": "strftime('%Y-%m', created_at, 'unixepoch')",
+}
+
+
+def _epoch(moment: datetime | None) -> float | None:
+    return moment.timestamp() if moment is not None else None
+
+
+class SQLiteRunStore(BufferedRunStore):
+    """
+    Embedded run store: a single SQLite file in WAL mode.
+
+    Stand-in for the Mongo store in development and tests; same indexes and queries.
+    Every statement runs on a worker thread so the event loop never waits on disk.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        flush_interval: float = 0.5,
+        batch_size: int = 500,
+        retention_days: float | None = None,
+        prune_interval: float = 3600.0,
+    ) -> None:
+        super().__init__(flush_interval, batch_size, retention_days, prune_interval)
+        self.path = str(path)
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> None:
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        self._conn = conn
+
+    def _run(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    async def _query(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        return await asyncio.to_thread(self._run, sql, params)
+
+    async def _setup(self) -> None:
+        await asyncio.to_thread(self._connect)
+
+    async def _teardown(self) -> None:
+        if self._conn is not None:
+            await asyncio.to_thread(self._conn.close)
+            self._conn = None
+
+    def _write_rows(self, runs: List[RunStatus]) -> None:
+        run_rows, result_rows = [], []
+        for run in runs:
+            row = run_row(run)
+            grading = run.response.grading if run.response is not None else None
+            run_rows.append(
+                (
+                    row["run_id"], row["status"], row["molecule_key"], row["molecule_name"],
+                    row["indication_key"], row["target_indication"], row["overall_score"],
+                    *(getattr(grading, f) if grading is not None else None for f in _GRADE_FIELDS),
+                    _epoch(row["created_at"]), _epoch(row["updated_at"]), run.model_dump_json(),
+                )
+            )
+            if run.response is not None:
+                for r in run.response.results:
+                    result_rows.append(
+                        (
+                            run.run_id, r.agent_name, row["molecule_key"], r.input_fingerprint,
+                            _epoch(r.generated_at), r.summary, json_dumps(raw_dict(r.raw_data)).decode(),
+                        )
+                    )
+
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO runs VALUES ({', '.join('?' * 15)})", run_rows
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO agent_results VALUES (?, ?, ?, ?, ?, ?, ?)", result_rows
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    async def _write_batch(self, runs: List[RunStatus]) -> None:
+        await asyncio.to_thread(self._write_rows, runs)
+
+    async def _fetch(self, run_id: str) -> RunStatus | None:
+        rows = await self._query("SELECT payload FROM runs WHERE run_id = ?", (run_id,))
+        return RunStatus.model_validate_json(rows[0][0]) if rows else None
+
+    def _delete_before(self, before: float) -> int:
+        finished = f"status IN ({', '.join('?' * len(self.TERMINAL_STATUSES))}) AND created_at < ?"
+        params = (*self.TERMINAL_STATUSES, before)
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN")
+            try:
+                conn.execute(
+                    f"DELETE FROM agent_results WHERE run_id IN (SELECT run_id FROM runs WHERE {finished})", params
+                )
+                deleted = conn.execute(f"DELETE FROM runs WHERE {finished}", params).rowcount
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return deleted
+
+    async def prune(self, before: datetime) -> int:
+        return await asyncio.to_thread(self._delete_before, before.timestamp())
+
+    async def top_molecules(
+        self, days: int = 30, limit: int = 10, indication: str | None = None
+    ) -> List[MoleculeScore]:
+        await self.flush()
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).timestamp()
+        conditions = ["created_at >= ?", "status = 'COMPLETED'", "overall_score IS NOT NULL"]
+        params: List[Any] = [since]
+        if indication is not None:
+            conditions.append("indication_key = ?")
+            params.append(normalize_key_part(indication))
+        # Aggregate over the covering index first; only the top `limit` rows look up their latest run,
+        # under the same filters so an excluded run created at the same instant cannot stand in for it
+        rows = await self._query(
+            f"""
+            SELECT g.molecule_key, r.molecule_name, r.overall_score, g.last, g.best, g.runs
+            FROM (
+                SELECT molecule_key, MAX(overall_score) AS best, COUNT(*) AS runs, MAX(created_at) AS last
+                FROM runs WHERE {" AND ".join(conditions)}
+                GROUP BY molecule_key
+                ORDER BY best DESC
+                LIMIT ?
+            ) AS g
+            JOIN runs AS r ON r.molecule_key = g.molecule_key AND r.created_at = g.last
+                AND {" AND ".join(f"r.{condition}" for condition in conditions)}
+            GROUP BY g.molecule_key
+            ORDER BY g.best DESC
+            """,
+            (*params, limit, *params),
+        )
+        return [
+            MoleculeScore(
+                molecule_name=name or key,
+                best_score=best,
+                latest_score=latest,
+                runs=runs,
+                last_run_at=datetime.fromtimestamp(created, timezone.utc),
+            )
+            for key, name, latest, created, best, runs in rows
+        ]
+
+    async def score_trend(
+        self, molecule: str, indication: str | None = None, days: int | None = None, bucket: str = "day"
+    ) -> List[ScoreTrendPoint]:
+        if bucket not in TREND_BUCKETS:
+            raise ValueError(f"Unknown trend bucket '{bucket}'")
+        await self.flush()
+        where = "molecule_key = ? AND status = 'COMPLETED' AND overall_score IS NOT NULL"
+        params: List[Any] = [normalize_key_part(molecule)]
+        if indication is not None:
+            where += " AND indication_key = ?"
+            params.append(normalize_key_part(indication))
+        if days is not None:
+            where += " AND created_at >= ?"
+            params.append((datetime.now(timezone.utc) - timedelta(days=days)).timestamp())
+        rows = await self._query(
+            f"""
+            SELECT {_PERIOD_SQL[bucket]} AS period, COUNT(*), AVG(overall_score),
+                   MIN(overall_score), MAX(overall_score)
+            FROM runs WHERE {where}
+            GROUP BY period ORDER BY MIN(created_at)
+            """,
+            params,
+        )
+        return [
+            ScoreTrendPoint(period=period, runs=n, avg_score=avg, min_score=lo, max_score=hi)
+            for period, n, avg, lo, hi in rows
+        ]
+
+    def _latest_graded_rows(self, limit: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            runs = self._conn.execute(
+                f"""
+                SELECT r.run_id, r.molecule_name, r.target_indication, r.created_at,
+                       {", ".join(f"r.{f}" for f in _GRADE_FIELDS)}, r.overall_score
+                FROM (
+                    SELECT molecule_key, indication_key, MAX(created_at) AS last
+                    FROM runs WHERE status = 'COMPLETED' AND overall_score IS NOT NULL
+                    GROUP BY molecule_key, indication_key
+                    ORDER BY last DESC
+                    LIMIT ?
+                ) AS g
+                JOIN runs AS r ON r.molecule_key = g.molecule_key
+                    AND r.indication_key = g.indication_key AND r.created_at = g.last
+                GROUP BY g.molecule_key, g.indication_key
+                ORDER BY g.last DESC
+                """,
+                (limit,),
+            ).fetchall()
+            results: Dict[str, Dict[str, Any]] = {run[0]: {} for run in runs}
+            run_ids = list(results)
+            # Within SQLite's bound-parameter limit
+            for start in range(0, len(run_ids), 500):
+                chunk = run_ids[start: start + 500]
+                for run_id, agent_name, raw_data in self._conn.execute(
+                    "SELECT run_id, agent_name, raw_data FROM agent_results "
+                    f"WHERE run_id IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                ):
+                    raw_data = json.loads(raw_data)
+                    results[run_id][agent_name] = payload_of(agent_name, raw_data) or raw_data
+        return [
+            {
+                "run_id": run_id,
+                "molecule_name": name,
+                "target_indication": indication,
+                "created_at": datetime.fromtimestamp(created, timezone.utc),
+                "grading": dict(zip((*_GRADE_FIELDS, "overall_score"), grades)),
+                "results": results[run_id],
+            }
+            for run_id, name, indication, created, *grades in runs
+        ]
+
+    async def latest_graded(self, limit: int = 50_000) -> List[Dict[str, Any]]:
+        await self.flush()
+        return await asyncio.to_thread(self._latest_graded_rows, limit)
@@ -1,7 +1,7 @@
-# backend/app/agents/demographics/demographic.py
-from typing import Any, Dict
-from ..base import BaseAgent
-from ...schemas.analysis import AnalysisRequest
+# backend/app/demographics/demographics.py
+from ..agents.base import BaseAgent
+from ..schemas.agent_data import DemographicData
+from ..schemas.analysis import AnalysisRequest
 
 
 class DemographicAgent(BaseAgent):
@@ -10,12 +10,12 @@ class DemographicAgent(BaseAgent):
     """
 
     async def run(self, request: AnalysisRequest):
-        data: Dict[str, Any] = {
-            "disease_burden_score": 0.85,
-            "age_distribution_fit_score": 0.8,
-            "access_affordability_score": 0.75,
-            "demographic_overall_score": 0.8,
-        }
+        data = DemographicData(
+            disease_burden_score=0.85,
+            age_distribution_fit_score=0.8,
+            access_affordability_score=0.75,
+            demographic_overall_score=0.8,
+        )
 
         summary = (
             "Demographic analysis indicates a high disease burden with good alignment to target age groups "
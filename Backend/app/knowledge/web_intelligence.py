@@ -1,23 +1,100 @@
-# backend/app/agents/knowledge/web_intelligence.py
-from typing import Any, Dict
-from ..base import BaseAgent
-from ...schemas.analysis import AnalysisRequest
+# backend/app/knowledge/web_intelligence.py
+import asyncio
+import logging
+from collections import Counter
+from typing import Any
+from ..agents.base import BaseAgent
+from ..core.config import get_settings
+from ..schemas.agent_data import WebIntelligenceData
+from ..schemas.analysis import AnalysisRequest
+from ..services.http import UPSTREAM_ERRORS
+from ..services.vector_index import VectorIndex, weighted_mean
+
+logger = logging.getLogger(__name__)
 
 
 class WebIntelligenceAgent(BaseAgent):
     """
-    Placeholder agent for general web / literature intelligence.
+    General web / literature intelligence.
+    Retrieves from the local cached-literature index when Settings.WEB_INTELLIGENCE_INDEX_PATH
+    is set, else lists matching PubMed articles when live data is on; placeholder values otherwise.
     """
 
+    def __init__(self, name: str | None = None) -> None:
+        super().__init__(name)
+        self.settings = get_settings()
+        self.index: VectorIndex | None = None
+
+    async def startup(self) -> None:
+        if self.settings.WEB_INTELLIGENCE_INDEX_PATH:
+            self.index = await asyncio.to_thread(VectorIndex, self.settings.WEB_INTELLIGENCE_INDEX_PATH)
+
+    async def shutdown(self) -> None:
+        if self.index is not None:
+            await asyncio.to_thread(self.index.close)
+            self.index = None
+
     async def run(self, request: AnalysisRequest):
-        data: Dict[str, Any] = {
-            "sentiment_score": 0.74,
-            "key_themes": [
+        if self.index is None:
+            client = self.upstream("pubmed")
+            if client is not None and request.molecule_name:
+                try:
+                    return await self._pubmed(client, request)
+                except UPSTREAM_ERRORS as exc:
+                    logger.warning("PubMed search failed for %s: %r", request.molecule_name, exc)
+            return self._placeholder()
+
+        query = " ".join(
+            part for part in (request.molecule_name, request.target_indication, request.query) if part
+        )
+        hits = await self.offload(
+            self.index.search, query, self.settings.KNOWLEDGE_TOP_K, self.settings.KNOWLEDGE_NPROBE
+        )
+        themes = Counter(theme for h in hits for theme in h.metadata.get("themes", []))
+        sentiment = weighted_mean(hits, "sentiment")
+
+        data = WebIntelligenceData(
+            sentiment_score=sentiment if sentiment is not None else 0.5,
+            key_themes=[theme for theme, _ in themes.most_common(5)],
+            sources=[
+                {"id": h.id, "similarity": round(h.score, 4), "source": h.metadata.get("source")}
+                for h in hits
+            ],
+        )
+
+        summary = (
+            f"Literature retrieval matched {len(hits)} cached sources with sentiment "
+            f"{data.sentiment_score:.2f}"
+            + (f"; recurring themes: {', '.join(data.key_themes)}." if data.key_themes else ".")
+        )
+
+        return self._result(summary=summary, raw_data=data)
+
+    async def _pubmed(self, client: Any, request: AnalysisRequest):
+        term = " AND ".join(part for part in (request.molecule_name, request.target_indication) if part)
+        pmids = [pmid async for pmid in client.search_ids(term, page_size=20, max_results=20)]
+        summaries = await client.summaries(pmids) if pmids else {}
+        # PubMed metadata carries no sentiment or themes: neutral score, sources only
+        data = WebIntelligenceData(
+            sentiment_score=0.5,
+            key_themes=[],
+            sources=[
+                {"id": pmid, "source": "pubmed", "title": summaries.get(pmid, {}).get("title")}
+                for pmid in pmids
+            ],
+        )
+        summary = f"PubMed lists {len(pmids)} article(s) matching {term}; no sentiment signal is derived."
+        return self._result(summary=summary, raw_data=data)
+
+    def _placeholder(self):
+        data = WebIntelligenceData(
+            sentiment_score=0.74,
+            key_themes=[
                 "cost pressure",
                 "supply chain resilience",
                 "regulatory scrutiny"
             ],
-        }
+        )
 
         summary = (
             "Web and literature signals highlight positive sentiment around generic entry, "
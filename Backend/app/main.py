@@ -1,13 +1,172 @@
 # backend/app/main.py
+# Installed before anything else is imported so the startup report sees the whole import graph
+from .core.startup import IMPORT_PROFILER, STARTUP
+
+IMPORT_PROFILER.install()
+
+import asyncio
+import logging
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from .core.config import get_settings
-from .api.v1.router import api_router
+from .core.logging import configure_logging
+from .core.metrics import REGISTRY
+from .agents.cache import AgentResultCache
+from .agents.master import MasterAgent
+from .agents.report_generator import ReportGeneratorAgent
+from .agents.registry import AgentRegistry, build_default_registry
+from .db.run_store import build_run_store
+from .services.admission import AdmissionController
+from .services.compute import ComputePools, monitor_event_loop_lag
+from .services.coordination import Coordinator
+from .services.idempotency import RequestDeduplicator
+from .services.jobs import JobRunner
+from .services.clinicaltrials_client import ClinicalTrialsClient
+from .services.iqvia_client import IQVIAClient
+from .services.pubmed_client import PubMedClient
+from .services.report_rendering import ReportFileCache, ReportRenderer
+from .services.uspto_client import USPTOClient
+from .api.V1.router import api_router
 
 settings = get_settings()
+configure_logging(settings.LOG_LEVEL)
+STARTUP.checkpoint("import")
+logger = logging.getLogger(__name__)
+
+
+async def _prewarm_agents(registry: AgentRegistry) -> None:
+    try:
+        await registry.ensure_started()
+    except Exception:
+        # The first pipeline request retries, and fails there if the agents still cannot start
+        logger.exception("Background agent prewarm failed")
+
+
+async def _warm_portfolio_index(index, run_store) -> None:
+    try:
+        await index.warm(run_store, settings.PORTFOLIO_INDEX_WARM_RUNS)
+    except Exception:
+        # Pre-screens only see runs made from now on
+        logger.exception("Portfolio index warm-up failed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pooled upstream clients, shared by everything that talks to the data sources
+    upstream_clients = {
+        "pubmed": PubMedClient.from_settings(settings),
+        "clinicaltrials": ClinicalTrialsClient.from_settings(settings),
+        "uspto": USPTOClient.from_settings(settings),
+    }
+    if settings.IQVIA_BASE_URL:
+        upstream_clients["iqvia"] = IQVIAClient.from_settings(settings)
+    app.state.upstream_clients = upstream_clients
+
+    # CPU-bound agent work runs here instead of on the event loop
+    compute_pools = ComputePools.from_settings(settings)
+    app.state.compute_pools = compute_pools
+    loop_monitor = asyncio.create_task(monitor_event_loop_lag())
+
+    # Agents (and the clients/caches they own) are created once per process. Building the
+    # registry imports no agent module; Settings.AGENT_PREWARM decides when they load.
+    registry = build_default_registry(settings, compute_pools, upstream_clients)
+    prewarm = None
+    if settings.AGENT_PREWARM == "blocking":
+        with STARTUP.phase("agents"):
+            await registry.ensure_started()
+    elif settings.AGENT_PREWARM == "background":
+        # Serve right away; agent modules are imported off the event loop meanwhile
+        prewarm = asyncio.create_task(_prewarm_agents(registry))
+    # Locks, job queues and the shared cache tier for multi-worker deployments
+    coordinator = None
+    if settings.COORDINATION_BACKEND != "off":
+        coordinator = Coordinator.from_settings(settings)
+        await coordinator.start()
+    app.state.coordinator = coordinator
+    cache = None
+    if settings.AGENT_CACHE_ENABLED:
+        cache = AgentResultCache(
+            max_entries=settings.AGENT_CACHE_MAX_ENTRIES,
+            default_ttl=settings.AGENT_CACHE_TTL_SECONDS,
+            redis_url=settings.REDIS_URL if settings.AGENT_CACHE_USE_REDIS else None,
+            redis_client=coordinator.client if coordinator is not None else None,
+        )
+    app.state.agent_registry = registry
+    app.state.agent_cache = cache
+    # One renderer so JSON reports and downloads share the rendered-section cache
+    report_renderer = ReportRenderer(max_cached_sections=settings.REPORT_SECTION_CACHE_ENTRIES)
+    app.state.report_renderer = report_renderer
+    app.state.report_cache = ReportFileCache(
+        settings.REPORT_CACHE_DIR or Path(tempfile.gettempdir()) / "ey-report-cache",
+        max_bytes=settings.REPORT_CACHE_MAX_BYTES,
+    )
+    portfolio_index = None
+    if settings.PORTFOLIO_INDEX_ENABLED:
+        # Local import: NumPy stays off the cold-start import path
+        from .services.portfolio_index import PortfolioIndex
+
+        portfolio_index = PortfolioIndex()
+    app.state.portfolio_index = portfolio_index
+    app.state.master_agent = MasterAgent(
+        registry=registry,
+        cache=cache,
+        report_generator=ReportGeneratorAgent(report_renderer),
+        portfolio_index=portfolio_index,
+        coordinator=coordinator,
+    )
+    app.state.request_deduplicator = RequestDeduplicator(
+        replay_seconds=settings.ANALYZE_REPLAY_SECONDS,
+        key_ttl_seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS,
+        max_entries=settings.IDEMPOTENCY_MAX_ENTRIES,
+    )
+    app.state.admission = AdmissionController.from_settings(settings) if settings.ADMISSION_ENABLED else None
+    run_store = build_run_store(settings)
+    await run_store.start()
+    app.state.run_store = run_store
+    index_warmup = None
+    if portfolio_index is not None:
+        index_warmup = asyncio.create_task(_warm_portfolio_index(portfolio_index, run_store))
+    app.state.job_runner = JobRunner(
+        master_agent=app.state.master_agent,
+        store=app.state.run_store,
+        workers=settings.JOB_WORKERS,
+        report_workers=settings.REPORT_WORKERS,
+        max_queue_size=settings.JOB_QUEUE_MAX_SIZE,
+        max_report_queue_size=settings.REPORT_QUEUE_MAX_SIZE,
+        report_queue_name=settings.REPORT_QUEUE_NAME,
+        coordinator=coordinator,
+    )
+    await app.state.job_runner.start()
+    STARTUP.mark_ready()
+    try:
+        yield
+    finally:
+        if prewarm is not None:
+            prewarm.cancel()
+            await asyncio.gather(prewarm, return_exceptions=True)
+        if index_warmup is not None:
+            index_warmup.cancel()
+            await asyncio.gather(index_warmup, return_exceptions=True)
+        await app.state.job_runner.stop()
+        await run_store.close()
+        if cache is not None:
+            await cache.close()
+        if coordinator is not None:
+            await coordinator.close()
+        await registry.shutdown()
+        for client in upstream_clients.values():
+            await client.aclose()
+        loop_monitor.cancel()
+        compute_pools.shutdown()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -15,4 +174,45 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.get("/health", tags=["health"])
 async def health_check():
-    return {"status": "ok"}
+    """Liveness plus saturation: "saturated" while /analyze requests are queueing for a slot."""
+    admission = getattr(app.state, "admission", None)
+    compute_pools = getattr(app.state, "compute_pools", None)
+    health = {"status": "ok"}
+    if admission is not None:
+        stats = admission.stats()
+        health["admission"] = stats
+        if stats["queued"] or stats["saturation"] >= 1.0:
+            health["status"] = "saturated"
+    if compute_pools is not None:
+        health["compute_pools"] = compute_pools.stats()
+    registry = getattr(app.state, "agent_registry", None)
+    if registry is not None:
+        health["agents_loaded"] = registry.started
+    coordinator = getattr(app.state, "coordinator", None)
+    if coordinator is not None:
+        try:
+            health["coordination"] = await coordinator.stats()
+        except Exception as exc:
+            health["coordination"] = {"worker_id": coordinator.worker_id, "error": repr(exc)}
+            health["status"] = "degraded"
+    return health
+
+
+@app.get("/health/startup", tags=["health"])
+async def startup_report():
+    """Cold-start breakdown: phase timings, agent loading and the slowest module imports."""
+    report = STARTUP.as_dict(IMPORT_PROFILER, top_imports=settings.STARTUP_REPORT_TOP_IMPORTS)
+    registry = getattr(app.state, "agent_registry", None)
+    if registry is not None:
+        report["agents"] = {
+            "prewarm": settings.AGENT_PREWARM,
+            "loaded": registry.started,
+            "startup_ms": round(registry.startup_seconds * 1000, 3) if registry.startup_seconds else None,
+        }
+    return report
+
+
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+async def metrics() -> str:
+    """Prometheus text exposition of pipeline latency histograms and counters."""
+    return REGISTRY.render()
@@ -0,0 +1,231 @@
+# backend/app/schemas/agent_data.py
+from dataclasses import dataclass, fields
+from typing import Annotated, Any, Dict, Iterator, List, Literal, Tuple, Type, TypeVar, Union
+from pydantic import Discriminator, Tag
+
+P = TypeVar("P", bound="AgentPayload")
+
+
+class AgentPayload:
+    """
+    Typed raw_data of one agent.
+
+    Payloads are frozen, slotted dataclasses tagged by a `kind` literal. Agents build them
+    without validation and AgentResult.raw_data carries them as they are (see AgentData);
+    pydantic-core serializes them directly. as_raw() / from_raw() convert to and from the
+    plain-dict form for stores that need one.
+    """
+
+    __slots__ = ()
+
+    def as_raw(self) -> Dict[str, Any]:
+        """Shallow dict of the fields; optional fields left at None are omitted."""
+        raw: Dict[str, Any] = {}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if value is None and f.default is None:
+                continue
+            raw[f.name] = value
+        return raw
+
+    @classmethod
+    def from_raw(cls: Type[P], raw: Dict[str, Any]) -> P:
+        """Typed view of a raw_data dict; unknown keys are ignored, missing required keys raise."""
+        return cls(**{f.name: raw[f.name] for f in fields(cls) if f.name in raw})
+
+
+@dataclass(frozen=True, slots=True)
+class IQVIAInsightsData(AgentPayload):
+    estimated_market_size_billion_usd: float
+    cagr: float
+    key_regions: List[str]
+    # 0–1, demand strength
+    market_demand_score: float
+    data_year: int | None = None
+    kind: Literal["iqvia_insights"] = "iqvia_insights"
+
+
+@dataclass(frozen=True, slots=True)
+class EXIMTrendData(AgentPayload):
+    # lower is better (less dependency)
+    import_dependency_score: float
+    export_opportunity_score: float
+    overall_market_demand_score: float
+    data_year: int | None = None
+    kind: Literal["exim_trend"] = "exim_trend"
+
+
+@dataclass(frozen=True, slots=True)
+class ProcessDesignData(AgentPayload):
+    # 0–1, higher = more complex
+    process_complexity_score: float
+    # 0–1, higher = easier to scale
+    scalability_score: float
+    continuous_manufacturing_fit: float
+    production_feasibility_score: float
+    kind: Literal["process_design"] = "process_design"
+
+
+@dataclass(frozen=True, slots=True)
+class TechnoEconomicData(AgentPayload):
+    capex_million_usd: float
+    opex_million_usd_per_year: float
+    payback_period_years: float
+    internal_rate_of_return: float
+    production_feasibility_score: float
+    # Monte Carlo statistics (see agents/production/techno_economic_engine.py)
+    scenarios: int | None = None
+    npv_mean_musd: float | None = None
+    npv_p5_musd: float | None = None
+    npv_p50_musd: float | None = None
+    npv_p95_musd: float | None = None
+    npv_expected_shortfall_musd: float | None = None
+    probability_npv_positive: float | None = None
+    irr_p5: float | None = None
+    irr_p50: float | None = None
+    irr_p95: float | None = None
+    payback_p50_years: float | None = None
+    payback_p90_years: float | None = None
+    kind: Literal["techno_economic"] = "techno_economic"
+
+
+@dataclass(frozen=True, slots=True)
+class PatentLandscapeData(AgentPayload):
+    primary_patents_expired: bool
+    # 0–1, higher = more risk
+    secondary_patent_risk_score: float
+    litigation_risk_score: float
+    # higher = safer
+    patent_overall_score: float
+    blocking_patents: List[str] | None = None
+    open_litigation_cases: List[str] | None = None
+    clear_from: str | None = None
+    kind: Literal["patent_landscape"] = "patent_landscape"
+
+
+@dataclass(frozen=True, slots=True)
+class ClinicalTrialData(AgentPayload):
+    ongoing_trials_count: int
+    indication_expansion_potential_score: float
+    safety_signal_risk_score: float
+    patents_and_trials_score: float
+    kind: Literal["clinical_trial"] = "clinical_trial"
+
+
+@dataclass(frozen=True, slots=True)
+class DemographicData(AgentPayload):
+    disease_burden_score: float
+    age_distribution_fit_score: float
+    access_affordability_score: float
+    demographic_overall_score: float
+    kind: Literal["demographic"] = "demographic"
+
+
+@dataclass(frozen=True, slots=True)
+class CompetitionData(AgentPayload):
+    number_of_generic_players: int
+    # higher = more price pressure
+    price_erosion_score: float
+    differentiation_potential_score: float
+    # higher = more favourable competition
+    competition_overall_score: float
+    expected_generic_entry: str | None = None
+    kind: Literal["competition"] = "competition"
+
+
+@dataclass(frozen=True, slots=True)
+class WebIntelligenceData(AgentPayload):
+    sentiment_score: float
+    key_themes: List[str]
+    sources: List[Dict[str, Any]] | None = None
+    kind: Literal["web_intelligence"] = "web_intelligence"
+
+
+@dataclass(frozen=True, slots=True)
+class InternalKnowledgeData(AgentPayload):
+    manufacturing_capability_fit_score: float
+    portfolio_synergy_score: float
+    historical_success_in_therapy_area: bool
+    supporting_documents: List[Dict[str, Any]] | None = None
+    kind: Literal["internal_knowledge"] = "internal_knowledge"
+
+
+# agent_name -> payload type of its raw_data
+PAYLOAD_TYPES: Dict[str, Type[AgentPayload]] = {
+    "IQVIAInsightsAgent": IQVIAInsightsData,
+    "EXIMTrendAgent": EXIMTrendData,
+    "ProcessDesignAgent": ProcessDesignData,
+    "TechnoEconomicAgent": TechnoEconomicData,
+    "PatentLandscapeAgent": PatentLandscapeData,
+    "ClinicalTrialAgent": ClinicalTrialData,
+    "DemographicAgent": DemographicData,
+    "CompetitionAgent": CompetitionData,
+    "WebIntelligenceAgent": WebIntelligenceData,
+    "InternalKnowledgeAgent": InternalKnowledgeData,
+}
+
+
+# kind tag -> payload type
+PAYLOAD_KINDS: Dict[str, Type[AgentPayload]] = {
+    payload_type.__dataclass_fields__["kind"].default: payload_type for payload_type in PAYLOAD_TYPES.values()
+}
+
+
+def _payload_kind(value: Any) -> str:
+    kind = value.get("kind") if isinstance(value, dict) else getattr(value, "kind", None)
+    return kind if kind in PAYLOAD_KINDS else "raw"
+
+
+# Type of AgentResult.raw_data: a built-in agent's payload, discriminated by its kind tag, or a
+# plain dict (plugin agents, and payloads that do not fit their type)
+AgentData = Annotated[
+    Union[
+        Annotated[IQVIAInsightsData, Tag("iqvia_insights")],
+        Annotated[EXIMTrendData, Tag("exim_trend")],
+        Annotated[ProcessDesignData, Tag("process_design")],
+        Annotated[TechnoEconomicData, Tag("techno_economic")],
+        Annotated[PatentLandscapeData, Tag("patent_landscape")],
+        Annotated[ClinicalTrialData, Tag("clinical_trial")],
+        Annotated[DemographicData, Tag("demographic")],
+        Annotated[CompetitionData, Tag("competition")],
+        Annotated[WebIntelligenceData, Tag("web_intelligence")],
+        Annotated[InternalKnowledgeData, Tag("internal_knowledge")],
+        Annotated[Dict[str, Any], Tag("raw")],
+    ],
+    Discriminator(_payload_kind),
+]
+
+
+def payload_of(agent_name: str, raw_data: "AgentPayload | Dict[str, Any]") -> AgentPayload | None:
+    """Typed payload of an agent's raw_data, or None for unknown agents / dicts that do not fit."""
+    payload_type = PAYLOAD_TYPES.get(agent_name)
+    if payload_type is None:
+        return None
+    if isinstance(raw_data, payload_type):
+        return raw_data
+    if not isinstance(raw_data, dict):
+        return None
+    try:
+        return payload_type.from_raw(raw_data)
+    except TypeError:
+        return None
+
+
+def payload_field(raw_data: "AgentPayload | Dict[str, Any] | None", name: str) -> Any:
+    """One field of a payload; plain dicts (plugin agents) are read by key. None when absent."""
+    if raw_data is None:
+        return None
+    if isinstance(raw_data, dict):
+        return raw_data.get(name)
+    return getattr(raw_data, name, None)
+
+
+def payload_items(raw_data: "AgentPayload | Dict[str, Any]") -> Iterator[Tuple[str, Any]]:
+    """(field, value) pairs of a payload without its kind tag and unset optional fields."""
+    raw = raw_data.as_raw() if isinstance(raw_data, AgentPayload) else raw_data
+    return ((key, value) for key, value in raw.items() if key != "kind")
+
+
+def raw_dict(raw_data: "AgentPayload | Dict[str, Any]") -> Dict[str, Any]:
+    """Plain-dict form of raw_data, for stores that cannot take dataclasses."""
+    return raw_data.as_raw() if isinstance(raw_data, AgentPayload) else raw_data
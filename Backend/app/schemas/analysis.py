@@ -1,6 +1,8 @@
 # backend/app/schemas/analysis.py
-from pydantic import BaseModel, Field
-from typing import Dict, Any, Optional, List
+from datetime import datetime, timezone
+from pydantic import BaseModel, Field, SerializeAsAny, model_validator
+from typing import Dict, Any, Literal, Optional, List
+from .agent_data import AgentData, payload_of
 
 
 class AnalysisRequest(BaseModel):
@@ -14,7 +16,25 @@ class AgentResult(BaseModel):
     """Standard output for every worker agent."""
     agent_name: str
     summary: str
-    raw_data: Dict[str, Any] = Field(default_factory=dict)
+    # Typed payload of a built-in agent (schemas/agent_data.py); a plain dict for plugin agents.
+    # Serialized by runtime type: pydantic-core writes the dataclass or dict as it is, which is
+    # several times cheaper than going through the tagged-union serializer
+    raw_data: SerializeAsAny[AgentData] = Field(default_factory=dict)
+    generated_at: Optional[datetime] = None
+    # Hash of the inputs the result was computed from (see BaseAgent.fingerprint)
+    input_fingerprint: Optional[str] = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def _type_untagged_payload(cls, data: Any) -> Any:
+        # Results stored before payloads carried their kind tag are typed by agent name
+        if isinstance(data, dict):
+            raw_data = data.get("raw_data")
+            if isinstance(raw_data, dict) and "kind" not in raw_data:
+                payload = payload_of(data.get("agent_name", ""), raw_data)
+                if payload is not None:
+                    return {**data, "raw_data": payload}
+        return data
 
 
 class GradingBreakdown(BaseModel):
@@ -33,4 +53,147 @@ class AnalysisResponse(BaseModel):
     grading: GradingBreakdown
     results: List[AgentResult]
     report_content: Optional[str] = None
-    status: str = "COMPLETED"
+    status: str = "COMPLETED"  # COMPLETED | PARTIAL
+    # agent_name -> COMPLETED | TIMED_OUT | FAILED | SKIPPED (ruled out by an upstream gate)
+    agent_statuses: Dict[str, str] = Field(default_factory=dict)
+    # grading dimension -> TIMED_OUT | FAILED | SKIPPED, for dimensions with no completed agent
+    missing_dimensions: Dict[str, str] = Field(default_factory=dict)
+    # Incremental re-analysis: the run this one refreshed, and agents whose results were reused
+    parent_run_id: Optional[str] = None
+    reused_agents: List[str] = Field(default_factory=list)
+    # Per-stage wall time in milliseconds: agent.<name>, agents, grading, report, total
+    timings: Optional[Dict[str, float]] = None
+
+
+class BatchAnalysisRequest(BaseModel):
+    """Many molecules screened in one call."""
+    items: List[AnalysisRequest]
+    include_reports: bool = False
+
+
+class BatchAnalysisItem(BaseModel):
+    """Outcome for one entry of a batch; exactly one of response / error is set."""
+    index: int
+    request: AnalysisRequest
+    response: Optional[AnalysisResponse] = None
+    error: Optional[str] = None
+
+
+class BatchAnalysisResponse(BaseModel):
+    """Batch results ranked by overall_score (failed items last)."""
+    batch_id: str
+    items: List[BatchAnalysisItem]
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class RefreshRequest(BaseModel):
+    """Options for incremental re-analysis of a stored run."""
+    # Agents to rerun even if their stored results are still fresh
+    force_agents: List[str] = Field(default_factory=list)
+
+
+class RunStatus(BaseModel):
+    """
+    A pipeline run submitted in job mode.
+    Lifecycle: QUEUED -> RUNNING -> REPORT_PENDING -> COMPLETED, or FAILED from any step.
+    """
+    run_id: str
+    status: str = "QUEUED"
+    request: AnalysisRequest
+    created_at: datetime = Field(default_factory=_utcnow)
+    updated_at: datetime = Field(default_factory=_utcnow)
+    response: Optional[AnalysisResponse] = None
+    error: Optional[str] = None
+
+
+class PortfolioReportRequest(BaseModel):
+    """One combined report over several stored runs, in run_ids order."""
+    run_ids: List[str]
+    format: Literal["text", "md", "html", "pdf"] = "pdf"
+    title: str = "Generic Opportunity Portfolio Report"
+
+
+class WeightSweepRequest(BaseModel):
+    """Weight-sensitivity analysis: stored runs re-ranked under many grading weightings at once."""
+    run_ids: List[str]
+    # Explicit weightings (grading dimension -> weight); when empty, `scenarios` random
+    # weightings summing to 1 are drawn (reproducibly with `seed`)
+    weights: List[Dict[str, float]] = Field(default_factory=list)
+    scenarios: int = Field(1000, ge=1, le=10_000)
+    seed: Optional[int] = None
+
+
+class WeightSweepItem(BaseModel):
+    """One run's score under the current weights and the spread of its rank across scenarios."""
+    run_id: str
+    molecule_name: Optional[str] = None
+    target_indication: Optional[str] = None
+    overall_score: float
+    # 0-based ranks, 0 = best
+    rank: int
+    best_rank: int
+    median_rank: float
+    worst_rank: int
+
+
+class WeightSweepResponse(BaseModel):
+    """Runs ranked by overall_score under the current weights."""
+    scenarios: int
+    items: List[WeightSweepItem]
+
+
+class MoleculeScore(BaseModel):
+    """One row of the "top molecules" history view."""
+    molecule_name: str
+    best_score: float
+    latest_score: float
+    runs: int
+    last_run_at: datetime
+
+
+class ScoreTrendPoint(BaseModel):
+    """Scores of one molecule aggregated over a time bucket (day / week / month)."""
+    period: str
+    runs: int
+    avg_score: float
+    min_score: float
+    max_score: float
+
+
+class SimilarMolecule(BaseModel):
+    """An analysed molecule close to the one searched for (latest graded run of the pair)."""
+    molecule_name: str
+    target_indication: Optional[str] = None
+    run_id: str
+    # Cosine similarity, higher = closer
+    similarity: float
+    grading: GradingBreakdown
+
+
+class PrescreenRequest(BaseModel):
+    """Candidates to triage against the analysed portfolio before any full pipeline run."""
+    items: List[AnalysisRequest]
+    # Nearest analysed molecules averaged into each estimate; None uses PRESCREEN_NEIGHBOURS
+    neighbours: Optional[int] = Field(None, ge=1, le=100)
+    include_neighbours: bool = False
+
+
+class PrescreenItem(BaseModel):
+    """Estimated grade of one candidate; None when nothing similar has been analysed."""
+    index: int
+    request: AnalysisRequest
+    estimated_grading: Optional[GradingBreakdown] = None
+    # 0–1, mean similarity of the neighbours the estimate is drawn from
+    confidence: float = 0.0
+    # The molecule/indication pair was already analysed; the estimate is its stored grading
+    analysed: bool = False
+    neighbours: List[SimilarMolecule] = Field(default_factory=list)
+
+
+class PrescreenResponse(BaseModel):
+    """Candidates ranked by estimated overall_score (no estimate last)."""
+    indexed_molecules: int
+    items: List[PrescreenItem]
@@ -0,0 +1,174 @@
+# backend/app/services/admission.py
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict
+from ..core.config import Settings
+from ..core.metrics import ADMISSION_IN_FLIGHT, ADMISSION_LIMIT, ADMISSION_QUEUED, ADMISSION_REJECTED
+
+
+class OverloadedError(RuntimeError):
+    """Raised instead of queueing a pipeline the server cannot take on right now."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Admission control for pipeline executions.
+
+    Concurrency limit: adapts to observed latency (gradient method). A fast-moving average of
+    pipeline latency is compared with a slow-moving baseline; while they agree the limit grows
+    by about sqrt(limit), and as latency inflates the limit shrinks proportionally.
+
+    Queueing: requests over the limit wait in per-tenant FIFO queues, and freed slots go to
+    tenants round-robin, so one tenant's burst cannot starve the others. A full tenant queue
+    is answered with 429, a full global queue or a queue wait past queue_timeout with 503,
+    both with a Retry-After estimate.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 16,
+        min_limit: int = 4,
+        max_limit: int = 256,
+        max_queue: int = 128,
+        max_queue_per_tenant: int = 16,
+        queue_timeout: float = 5.0,
+        tolerance: float = 1.5,
+        smoothing: float = 0.2,
+    ) -> None:
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.max_queue_per_tenant = max_queue_per_tenant
+        self.queue_timeout = queue_timeout
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.queued = 0
+        self._queues: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self._short_rtt: float | None = None
+        self._long_rtt: float | None = None
+        ADMISSION_LIMIT.set(self.limit)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "AdmissionController":
+        return cls(
+            initial_limit=settings.ADMISSION_INITIAL_LIMIT,
+            min_limit=settings.ADMISSION_MIN_LIMIT,
+            max_limit=settings.ADMISSION_MAX_LIMIT,
+            max_queue=settings.ADMISSION_MAX_QUEUE,
+            max_queue_per_tenant=settings.ADMISSION_MAX_QUEUE_PER_TENANT,
+            queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+        )
+
+    def _retry_after(self) -> int:
+        # Time for the queue ahead to drain at the current limit and latency
+        rtt = self._short_rtt or 1.0
+        return max(1, math.ceil(rtt * (self.queued + 1) / max(1.0, self.limit)))
+
+    def _reject(self, status_code: int, reason: str, detail: str) -> OverloadedError:
+        ADMISSION_REJECTED.inc(reason=reason)
+        return OverloadedError(status_code, detail, self._retry_after())
+
+    def _update_gauges(self) -> None:
+        ADMISSION_IN_FLIGHT.set(self.in_flight)
+        ADMISSION_QUEUED.set(self.queued)
+
+    async def acquire(self, tenant: str) -> float:
+        """Waits for a slot; returns the start time to pass to release()."""
+        if self.in_flight < int(self.limit) and not self._queues:
+            self.in_flight += 1
+            self._update_gauges()
+            return time.monotonic()
+
+        if self.queued >= self.max_queue:
+            raise self._reject(503, "queue_full", "Server is at capacity; try again shortly")
+        queue = self._queues.get(tenant)
+        if queue is not None and len(queue) >= self.max_queue_per_tenant:
+            raise self._reject(429, "tenant_queue_full", "Too many concurrent analyses for this tenant")
+
+        if queue is None:
+            queue = self._queues[tenant] = deque()
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        self.queued += 1
+        self._update_gauges()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            # A slot granted in the same tick as the timeout is still ours
+            if not waiter.done() or waiter.cancelled():
+                raise self._reject(503, "queue_timeout", "Timed out waiting for capacity") from None
+        except BaseException:
+            # Granted just as we were cancelled: hand the slot back
+            if waiter.done() and not waiter.cancelled():
+                self.release(None)
+            raise
+        finally:
+            self.queued -= 1
+            if not waiter.done():
+                waiter.cancel()
+                queue.remove(waiter)
+                if not queue and self._queues.get(tenant) is queue:
+                    del self._queues[tenant]
+            self._update_gauges()
+        return time.monotonic()
+
+    @asynccontextmanager
+    async def slot(self, tenant: str) -> AsyncIterator[None]:
+        started = await self.acquire(tenant)
+        try:
+            yield
+        finally:
+            self.release(started)
+
+    def release(self, started: float | None) -> None:
+        self.in_flight -= 1
+        if started is not None:
+            self._observe(time.monotonic() - started)
+        self._grant()
+        self._update_gauges()
+
+    def _grant(self) -> None:
+        while self._queues and self.in_flight < int(self.limit):
+            tenant, queue = next(iter(self._queues.items()))
+            waiter = queue.popleft()
+            if queue:
+                self._queues.move_to_end(tenant)  # round-robin between tenants
+            else:
+                del self._queues[tenant]
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    def _observe(self, rtt: float) -> None:
+        if self._short_rtt is None:
+            self._short_rtt = self._long_rtt = rtt
+            return
+        self._short_rtt = 0.8 * self._short_rtt + 0.2 * rtt
+        self._long_rtt = 0.98 * self._long_rtt + 0.02 * rtt
+        gradient = max(0.5, min(1.0, self.tolerance * self._long_rtt / self._short_rtt))
+        target = self.limit * gradient + math.sqrt(self.limit)
+        self.limit = min(self.max_limit, max(self.min_limit, (1 - self.smoothing) * self.limit + self.smoothing * target))
+        ADMISSION_LIMIT.set(self.limit)
+
+    def stats(self) -> Dict[str, Any]:
+        limit = int(self.limit)
+        return {
+            "limit": limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "tenants_waiting": len(self._queues),
+            "saturation": round(min(1.0, self.in_flight / max(1, limit)), 3),
+            "latency_seconds": round(self._short_rtt, 4) if self._short_rtt is not None else None,
+        }
@@ -0,0 +1,43 @@
+# backend/app/services/clinicaltrials_client.py
+from typing import Any, AsyncIterator, Dict
+from .http import UpstreamClient
+from ..core.config import Settings
+
+
+class ClinicalTrialsClient(UpstreamClient):
+    """
+    ClinicalTrials.gov API v2. Results are paged with nextPageToken.
+    """
+
+    @classmethod
+    def from_settings(cls, settings: Settings, **overrides: Any) -> "ClinicalTrialsClient":
+        options: Dict[str, Any] = dict(
+            rate_per_second=settings.CLINICALTRIALS_RATE_PER_SECOND,
+            **settings.http_client_options(),
+        )
+        options.update(overrides)
+        return cls(settings.CLINICALTRIALS_BASE_URL, **options)
+
+    async def studies(
+        self,
+        intervention: str,
+        condition: str | None = None,
+        page_size: int = 100,
+        max_pages: int | None = 10,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        params: Dict[str, Any] = {"query.intr": intervention, "pageSize": page_size}
+        if condition:
+            params["query.cond"] = condition
+
+        def next_params(payload: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any] | None:
+            token = payload.get("nextPageToken")
+            return {**current, "pageToken": token} if token else None
+
+        async for study in self.paginate(
+            "/studies",
+            params,
+            items=lambda payload: payload.get("studies", []),
+            next_params=next_params,
+            max_pages=max_pages,
+        ):
+            yield study
@@ -0,0 +1,136 @@
+# backend/app/services/compute.py
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+from ..core.config import Settings
+from ..core.metrics import COMPUTE_ACTIVE, COMPUTE_QUEUED, COMPUTE_REJECTED, COMPUTE_WAIT, EVENT_LOOP_LAG
+
+logger = logging.getLogger(__name__)
+
+
+class PoolSaturatedError(RuntimeError):
+    """Raised when a compute pool's wait queue is full."""
+
+
+class ComputePool:
+    """
+    Executor with a bounded admission queue.
+
+    At most `workers` jobs are handed to the executor at a time, so its internal queue never
+    grows; up to `max_queue` more wait on the event loop, and anything beyond that is rejected
+    straight away (PoolSaturatedError) rather than piling up behind slow work.
+    """
+
+    def __init__(self, name: str, executor: Executor, workers: int, max_queue: int) -> None:
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = executor
+        self._slots: asyncio.Semaphore | None = None
+        self.queued = 0
+        self.active = 0
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        return self._slots
+
+    def _release(self) -> None:
+        self.active -= 1
+        COMPUTE_ACTIVE.set(self.active, pool=self.name)
+        self._semaphore().release()
+
+    async def submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.queued >= self.max_queue:
+            COMPUTE_REJECTED.inc(pool=self.name)
+            raise PoolSaturatedError(f"{self.name} pool is saturated ({self.queued} queued)")
+
+        slots = self._semaphore()
+        self.queued += 1
+        COMPUTE_QUEUED.set(self.queued, pool=self.name)
+        enqueued_at = time.perf_counter()
+        try:
+            await slots.acquire()
+        finally:
+            self.queued -= 1
+            COMPUTE_QUEUED.set(self.queued, pool=self.name)
+        COMPUTE_WAIT.observe(time.perf_counter() - enqueued_at, pool=self.name)
+
+        self.active += 1
+        COMPUTE_ACTIVE.set(self.active, pool=self.name)
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+
+        def on_done(_) -> None:
+            # The slot is freed when the work really finishes, not when the caller stops waiting
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._release)
+
+        future.add_done_callback(on_done)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    def stats(self) -> Dict[str, int]:
+        return {"workers": self.workers, "active": self.active, "queued": self.queued, "max_queue": self.max_queue}
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ComputePools:
+    """The thread and process pools CPU-bound agents run on (see BaseAgent.cpu_bound)."""
+
+    def __init__(self, thread_workers: int = 4, process_workers: int = 2, max_queue: int = 64) -> None:
+        self.thread = ComputePool(
+            "thread",
+            ThreadPoolExecutor(max_workers=thread_workers, thread_name_prefix="agent-compute"),
+            thread_workers,
+            max_queue,
+        )
+        # Worker processes are only spawned on first use
+        self.process = ComputePool(
+            "process", ProcessPoolExecutor(max_workers=process_workers), process_workers, max_queue
+        )
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ComputePools":
+        return cls(
+            thread_workers=settings.COMPUTE_THREAD_WORKERS,
+            process_workers=settings.COMPUTE_PROCESS_WORKERS,
+            max_queue=settings.COMPUTE_QUEUE_MAX_SIZE,
+        )
+
+    def get(self, kind: str) -> ComputePool:
+        if kind == "thread":
+            return self.thread
+        if kind == "process":
+            return self.process
+        raise ValueError(f"Unknown compute pool '{kind}'")
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {"thread": self.thread.stats(), "process": self.process.stats()}
+
+    def shutdown(self) -> None:
+        self.thread.shutdown()
+        self.process.shutdown()
+
+
+async def monitor_event_loop_lag(interval: float = 0.25) -> None:
+    """Samples how late the loop wakes up; run as a background task for the app's lifetime."""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - expected)
+        EVENT_LOOP_LAG.observe(lag)
+        if lag > 0.1:
+            logger.warning("Event loop blocked for %.0f ms", lag * 1000)
@@ -0,0 +1,302 @@
+# backend/app/services/coordination.py
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from typing import Any, Dict, List
+from ..agents.base import normalize_key_part
+from ..core.config import Settings
+from ..core.metrics import COORDINATION_LOCK_WAIT, JOBS_CLAIMED
+from ..schemas.analysis import AnalysisRequest
+
+logger = logging.getLogger(__name__)
+
+# Owner-checked release / renewal of a lock lease (ARGV[1] is the holder's token)
+RELEASE_IF_OWNER = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+EXTEND_IF_OWNER = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class DistributedLock:
+    """
+    Lease on one Redis key: SET NX PX to take it, owner-checked scripts to renew and release.
+
+    The lease is renewed every ttl/3 while held, so a long pipeline keeps it and a crashed
+    holder's lease simply runs out. Used with `async with`: a worker that cannot take it within
+    `wait` seconds carries on without it (acquired stays False). The lock only saves duplicate
+    work; nothing depends on it for correctness.
+    """
+
+    def __init__(self, client: Any, key: str, ttl: float = 30.0, wait: float = 60.0) -> None:
+        self.client = client
+        self.key = key
+        self.ttl = ttl
+        self.wait = wait
+        self.token = uuid.uuid4().hex
+        self.acquired = False
+        self._renewer: asyncio.Task | None = None
+
+    async def acquire(self) -> bool:
+        deadline = time.monotonic() + self.wait
+        delay = 0.005
+        while True:
+            if await self.client.set(self.key, self.token, px=int(self.ttl * 1000), nx=True):
+                self.acquired = True
+                self._renewer = asyncio.create_task(self._renew())
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            # Jittered exponential backoff, so waiters do not poll Redis in lockstep
+            await asyncio.sleep(min(remaining, delay * (0.5 + random.random())))
+            delay = min(delay * 2, 0.25)
+
+    async def _renew(self) -> None:
+        while True:
+            await asyncio.sleep(self.ttl / 3)
+            try:
+                extended = await self.client.eval(EXTEND_IF_OWNER, 1, self.key, self.token, int(self.ttl * 1000))
+            except Exception as exc:
+                logger.warning("Renewing lock %s failed: %r", self.key, exc)
+                continue
+            if not extended:
+                logger.warning("Lock %s expired while held", self.key)
+                return
+
+    async def release(self) -> None:
+        if not self.acquired:
+            return
+        self.acquired = False
+        if self._renewer is not None:
+            self._renewer.cancel()
+            await asyncio.gather(self._renewer, return_exceptions=True)
+            self._renewer = None
+        try:
+            await self.client.eval(RELEASE_IF_OWNER, 1, self.key, self.token)
+        except Exception as exc:
+            # The lease still expires on its own
+            logger.warning("Releasing lock %s failed: %r", self.key, exc)
+
+    async def __aenter__(self) -> "DistributedLock":
+        started = time.monotonic()
+        acquired = await self.acquire()
+        COORDINATION_LOCK_WAIT.observe(time.monotonic() - started, outcome="acquired" if acquired else "timeout")
+        if not acquired:
+            logger.info("Lock %s still held after %.1fs; continuing without it", self.key, self.wait)
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.release()
+
+
+class Coordinator:
+    """
+    Coordination between the workers (processes or hosts) of one deployment, through Redis.
+
+    - run_lock(): lock per molecule / indication, so concurrent runs of one molecule on different
+      workers execute the agents once; the others wait, then read the shared agent cache.
+    - client: the Redis connection the AgentResultCache uses as its shared tier.
+    - enqueue() / claim() / ack(): job-mode queues with work stealing. Every worker owns a queue
+      and submissions go to the local one. An idle worker takes its own oldest job first,
+      otherwise steals the newest job of the longest queue. A claimed job stays in the worker's
+      processing list until acked; the queued and claimed jobs of a worker whose heartbeat
+      lapses are requeued by whichever worker notices first (at-least-once delivery).
+
+    COORDINATION_BACKEND=local runs all of this against an in-process stand-in (LocalRedis);
+    several Coordinators sharing one stand-in behave like workers sharing a server.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        namespace: str = "ey-agentic",
+        worker_id: str | None = None,
+        lock_ttl: float = 30.0,
+        lock_wait: float = 60.0,
+        heartbeat_interval: float = 5.0,
+        steal_interval: float = 0.2,
+    ) -> None:
+        self.client = client
+        self.namespace = namespace
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lock_ttl = lock_ttl
+        self.lock_wait = lock_wait
+        self.heartbeat_interval = heartbeat_interval
+        self.steal_interval = steal_interval
+        self._heartbeat: asyncio.Task | None = None
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "Coordinator":
+        if settings.COORDINATION_BACKEND == "redis":
+            try:
+                import redis.asyncio as redis_asyncio
+            except ImportError as exc:
+                raise RuntimeError("COORDINATION_BACKEND=redis requires the redis package") from exc
+            client = redis_asyncio.from_url(settings.REDIS_URL)
+        else:
+            from .local_redis import LocalRedis
+
+            client = LocalRedis()
+        return cls(
+            client,
+            namespace=settings.COORDINATION_NAMESPACE,
+            lock_ttl=settings.RUN_LOCK_TTL_SECONDS,
+            lock_wait=settings.RUN_LOCK_WAIT_SECONDS,
+            heartbeat_interval=settings.WORKER_HEARTBEAT_SECONDS,
+            steal_interval=settings.JOB_STEAL_INTERVAL_SECONDS,
+        )
+
+    # keys ------------------------------------------------------------------
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.namespace, *parts))
+
+    def _queue(self, worker_id: str) -> str:
+        return self._key("jobs", worker_id)
+
+    def _processing(self, worker_id: str) -> str:
+        return self._key("jobs", worker_id, "processing")
+
+    def _alive(self, worker_id: str) -> str:
+        return self._key("workers", worker_id, "alive")
+
+    # lifecycle -------------------------------------------------------------
+
+    async def start(self) -> None:
+        await self.client.sadd(self._key("workers"), self.worker_id)
+        await self._beat()
+        self._heartbeat = asyncio.create_task(self._heartbeat_loop())
+
+    async def close(self) -> None:
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            await asyncio.gather(self._heartbeat, return_exceptions=True)
+            self._heartbeat = None
+        try:
+            # Lets the other workers take over our jobs right away instead of after the lapse
+            await self.client.delete(self._alive(self.worker_id))
+        except Exception as exc:
+            logger.warning("Could not deregister worker %s: %r", self.worker_id, exc)
+        await self.client.aclose()
+
+    async def _beat(self) -> None:
+        # Three missed beats before other workers consider this one gone
+        await self.client.set(self._alive(self.worker_id), "1", px=int(self.heartbeat_interval * 3000))
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self._beat()
+            except Exception as exc:
+                logger.warning("Worker heartbeat failed: %r", exc)
+
+    # locks -----------------------------------------------------------------
+
+    def lock(self, name: str, ttl: float | None = None, wait: float | None = None) -> DistributedLock:
+        return DistributedLock(
+            self.client,
+            self._key("lock", name),
+            ttl=ttl if ttl is not None else self.lock_ttl,
+            wait=wait if wait is not None else self.lock_wait,
+        )
+
+    def run_lock(self, request: AnalysisRequest) -> DistributedLock:
+        """Lock shared by every run of the same molecule / indication pair."""
+        return self.lock(
+            f"run:{normalize_key_part(request.molecule_name)}:{normalize_key_part(request.target_indication)}"
+        )
+
+    # job queues ------------------------------------------------------------
+
+    async def queued(self) -> int:
+        """Jobs waiting in this worker's queue."""
+        return await self.client.llen(self._queue(self.worker_id))
+
+    async def enqueue(self, payload: str) -> int:
+        return await self.client.rpush(self._queue(self.worker_id), payload)
+
+    async def claim(self) -> str:
+        """Next job payload for this worker: its own oldest, else a stolen one. Waits for one."""
+        own, processing = self._queue(self.worker_id), self._processing(self.worker_id)
+        while True:
+            payload = await self.client.lmove(own, processing, "LEFT", "RIGHT")
+            if payload is None:
+                payload = await self._steal()
+                if payload is not None:
+                    JOBS_CLAIMED.inc(source="stolen")
+                    return _text(payload)
+                payload = await self.client.blmove(own, processing, self.steal_interval, "LEFT", "RIGHT")
+            if payload is not None:
+                JOBS_CLAIMED.inc(source="own")
+                return _text(payload)
+
+    async def ack(self, payload: str) -> None:
+        """Marks a claimed job as finished (it reached a terminal status)."""
+        await self.client.lrem(self._processing(self.worker_id), 1, payload)
+
+    async def _peers(self) -> List[str]:
+        """Live workers other than this one; requeues the jobs of those that have gone away."""
+        peers: List[str] = []
+        for member in await self.client.smembers(self._key("workers")):
+            worker_id = _text(member)
+            if worker_id == self.worker_id:
+                continue
+            if await self.client.exists(self._alive(worker_id)):
+                peers.append(worker_id)
+            else:
+                await self._recover(worker_id)
+        return peers
+
+    async def _steal(self) -> Any:
+        lengths: Dict[str, int] = {}
+        for worker_id in await self._peers():
+            lengths[worker_id] = await self.client.llen(self._queue(worker_id))
+        if not lengths:
+            return None
+        victim = max(lengths, key=lengths.get)
+        if lengths[victim] == 0:
+            return None
+        # The newest job, from the end the owner takes last
+        return await self.client.lmove(self._queue(victim), self._processing(self.worker_id), "RIGHT", "RIGHT")
+
+    async def _recover(self, worker_id: str) -> None:
+        """Moves a departed worker's claimed and queued jobs onto this worker's queue."""
+        own, moved = self._queue(self.worker_id), 0
+        for source in (self._processing(worker_id), self._queue(worker_id)):
+            while await self.client.lmove(source, own, "LEFT", "RIGHT") is not None:
+                moved += 1
+        await self.client.srem(self._key("workers"), worker_id)
+        if moved:
+            JOBS_CLAIMED.inc(moved, source="recovered")
+            logger.warning("Requeued %d jobs of departed worker %s", moved, worker_id)
+
+    async def stats(self) -> Dict[str, Any]:
+        workers = []
+        for member in sorted(await self.client.smembers(self._key("workers"))):
+            worker_id = _text(member)
+            workers.append(
+                {
+                    "worker_id": worker_id,
+                    "alive": bool(await self.client.exists(self._alive(worker_id))),
+                    "queued": await self.client.llen(self._queue(worker_id)),
+                    "claimed": await self.client.llen(self._processing(worker_id)),
+                }
+            )
+        return {"worker_id": self.worker_id, "workers": workers}
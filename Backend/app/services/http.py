@@ -0,0 +1,218 @@
+# backend/app/services/http.py
+import asyncio
+import json
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Mapping, Tuple
+import httpx
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+# Safe to send twice; other methods are only retried when the caller says so
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class UpstreamError(RuntimeError):
+    """An upstream data source kept failing after all retries."""
+
+
+# What a caller falling back to offline data should catch: retries exhausted, a non-retryable
+# HTTP error, or a payload that does not parse
+UPSTREAM_ERRORS = (UpstreamError, httpx.HTTPError, ValueError)
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, bursts of up to `capacity`.
+    acquire() waits (without holding any lock while sleeping) until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            await asyncio.sleep(wait)
+
+
+class UpstreamClient:
+    """
+    Shared async HTTP foundation for the upstream data sources.
+
+    - one pooled httpx.AsyncClient with keep-alive connections, reused for the app's lifetime
+    - per-host concurrency limit and token-bucket rate limiting
+    - retries on transport errors, 429 and 5xx with full-jitter exponential backoff
+      (Retry-After is honoured when the server sends it); idempotent methods only, unless the
+      caller passes retry=True
+    - identical concurrent GETs coalesced into one upstream call (get_json)
+    - page-by-page streaming of paginated endpoints (paginate)
+
+    Pass `transport` (e.g. httpx.MockTransport or httpx.ASGITransport) to run against a local
+    fake server in tests.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        default_params: Mapping[str, Any] | None = None,
+        timeout: float = 10.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        per_host_concurrency: int = 10,
+        rate_per_second: float | None = None,
+        burst: float | None = None,
+        max_retries: int = 3,
+        backoff_base: float = 0.25,
+        backoff_max: float = 8.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.default_params = dict(default_params or {})
+        self.per_host_concurrency = per_host_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._bucket = TokenBucket(rate_per_second, burst) if rate_per_second else None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[Tuple, asyncio.Task] = {}
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=dict(headers or {}),
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            transport=transport,
+        )
+
+    def _slot(self, url: httpx.URL) -> asyncio.Semaphore:
+        host = url.host or self._client.base_url.host
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return slot
+
+    def _backoff(self, attempt: int, response: httpx.Response | None) -> float:
+        if response is not None and "retry-after" in response.headers:
+            value = response.headers["retry-after"]
+            try:
+                return min(self.backoff_max, float(value))
+            except ValueError:
+                try:
+                    delay = parsedate_to_datetime(value).timestamp() - time.time()
+                    return min(self.backoff_max, max(0.0, delay))
+                except (TypeError, ValueError):
+                    pass
+        # Full jitter: uniform in [0, base * 2^attempt], capped
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Mapping[str, Any] | None = None,
+        json_body: Any = None,
+        retry: bool | None = None,
+    ) -> httpx.Response:
+        merged = {**self.default_params, **(params or {})}
+        url = self._client.build_request(method, path).url
+        slot = self._slot(url)
+        if retry is None:
+            retry = method.upper() in IDEMPOTENT_METHODS
+        max_retries = self.max_retries if retry else 0
+
+        for attempt in range(max_retries + 1):
+            response: httpx.Response | None = None
+            error: Exception | None = None
+
+            if self._bucket is not None:
+                await self._bucket.acquire()
+            async with slot:
+                try:
+                    response = await self._client.request(method, path, params=merged, json=json_body)
+                except httpx.TransportError as exc:
+                    error = exc
+
+            if response is not None and response.status_code not in RETRY_STATUS_CODES:
+                response.raise_for_status()
+                return response
+
+            if attempt == max_retries:
+                break
+            delay = self._backoff(attempt, response)
+            logger.info(
+                "Retrying %s %s in %.2fs (attempt %d, %s)",
+                method, url, delay, attempt + 1,
+                error or f"HTTP {response.status_code}",
+            )
+            await asyncio.sleep(delay)
+
+        reason = repr(error) if error else f"HTTP {response.status_code}"
+        raise UpstreamError(f"{method} {url} failed after {max_retries + 1} attempt(s): {reason}")
+
+    async def get_json(self, path: str, params: Mapping[str, Any] | None = None) -> Any:
+        """GET returning parsed JSON; identical concurrent calls share one upstream request."""
+        key = (path, json.dumps(params or {}, sort_keys=True, default=str))
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_json(path, params))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fetch_json(self, path: str, params: Mapping[str, Any] | None) -> Any:
+        response = await self.request("GET", path, params=params)
+        return response.json()
+
+    async def paginate(
+        self,
+        path: str,
+        params: Mapping[str, Any] | None,
+        *,
+        items: Callable[[Any], Iterable[Any]],
+        next_params: Callable[[Any, Dict[str, Any]], Dict[str, Any] | None],
+        max_pages: int | None = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Streams items page by page. `items` extracts the records from a page payload,
+        `next_params` returns the params for the following page, or None when done.
+        """
+        page_params: Dict[str, Any] | None = dict(params or {})
+        pages = 0
+        while page_params is not None:
+            payload = await self.get_json(path, page_params)
+            for item in items(payload):
+                yield item
+            pages += 1
+            if max_pages is not None and pages >= max_pages:
+                return
+            page_params = next_params(payload, page_params)
+
+    async def aclose(self) -> None:
+        for task in list(self._in_flight.values()):
+            task.cancel()
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "UpstreamClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
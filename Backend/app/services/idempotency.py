@@ -0,0 +1,119 @@
+# backend/app/services/idempotency.py
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Tuple
+from ..agents.base import normalize_key_part
+from ..core.metrics import ANALYZE_DEDUP
+from ..schemas.analysis import AnalysisRequest, AnalysisResponse
+
+
+class IdempotencyKeyReuseError(ValueError):
+    """The same Idempotency-Key was sent with a different request body."""
+
+
+def request_fingerprint(request: AnalysisRequest) -> str:
+    """Identity of a request after normalising case and whitespace."""
+    payload = "|".join(
+        normalize_key_part(value)
+        for value in (request.query, request.molecule_name, request.target_indication)
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task, fingerprint: str) -> None:
+        self.task = task
+        self.fingerprint = fingerprint
+        self.waiters = 0
+
+
+class RequestDeduplicator:
+    """
+    Shares pipeline executions between identical /analyze calls.
+
+    - Calls with the same key while one is running join it instead of starting their own.
+    - Completed responses are replayed for a while: replay_seconds for requests matched by
+      content, key_ttl_seconds for requests that sent an explicit Idempotency-Key.
+    Failures are never replayed, so a retry after an error runs again.
+    """
+
+    def __init__(self, replay_seconds: float = 10.0, key_ttl_seconds: float = 24 * 3600.0, max_entries: int = 10_000) -> None:
+        self.replay_seconds = replay_seconds
+        self.key_ttl_seconds = key_ttl_seconds
+        self.max_entries = max_entries
+        self._in_flight: Dict[str, _Flight] = {}
+        # key -> (expires_at, fingerprint, response)
+        self._completed: "OrderedDict[str, Tuple[float, str, AnalysisResponse]]" = OrderedDict()
+
+    def _lookup(self, key: str, fingerprint: str) -> AnalysisResponse | None:
+        entry = self._completed.get(key)
+        if entry is None:
+            return None
+        expires_at, stored_fingerprint, response = entry
+        if expires_at <= time.monotonic():
+            del self._completed[key]
+            return None
+        if stored_fingerprint != fingerprint:
+            raise IdempotencyKeyReuseError("Idempotency-Key was already used for a different request")
+        return response
+
+    def _remember(self, key: str, ttl: float, fingerprint: str, response: AnalysisResponse) -> None:
+        if ttl <= 0:
+            return
+        self._completed[key] = (time.monotonic() + ttl, fingerprint, response)
+        self._completed.move_to_end(key)
+        while len(self._completed) > self.max_entries:
+            self._completed.popitem(last=False)
+
+    async def run(
+        self,
+        request: AnalysisRequest,
+        compute: Callable[[], Awaitable[AnalysisResponse]],
+        idempotency_key: str | None = None,
+        replay: bool = True,
+    ) -> Tuple[AnalysisResponse, str]:
+        """
+        Returns (response, outcome) where outcome is "executed", "joined" or "replayed".
+        replay=False (client sent Cache-Control: no-cache) skips the replay window, but still
+        joins an identical execution that is already running.
+        """
+        fingerprint = request_fingerprint(request)
+        key = f"key:{idempotency_key}" if idempotency_key else f"request:{fingerprint}"
+        ttl = self.key_ttl_seconds if idempotency_key else self.replay_seconds
+
+        # Explicit keys are always honoured: replaying them is the point of sending one
+        if replay or idempotency_key:
+            cached = self._lookup(key, fingerprint)
+            if cached is not None:
+                ANALYZE_DEDUP.inc(outcome="replayed")
+                return cached, "replayed"
+
+        flight = self._in_flight.get(key)
+        if flight is not None and flight.fingerprint != fingerprint:
+            raise IdempotencyKeyReuseError("Idempotency-Key is in use by a different request")
+        outcome = "joined"
+        if flight is None:
+            outcome = "executed"
+
+            async def execute() -> AnalysisResponse:
+                response = await compute()
+                self._remember(key, ttl, fingerprint, response)
+                return response
+
+            flight = _Flight(asyncio.create_task(execute()), fingerprint)
+            self._in_flight[key] = flight
+            flight.task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        ANALYZE_DEDUP.inc(outcome=outcome)
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), outcome
+        except asyncio.CancelledError:
+            # Abandon the shared run only when every caller has gone
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
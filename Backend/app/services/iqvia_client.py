@@ -0,0 +1,63 @@
+# backend/app/services/iqvia_client.py
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict
+from .http import UpstreamClient
+from ..core.config import Settings
+
+
+class IQVIAClient(UpstreamClient):
+    """
+    Licensed IQVIA market-data API. Base URL and key come from Settings; offset pagination.
+    """
+
+    @classmethod
+    def from_settings(cls, settings: Settings, **overrides: Any) -> "IQVIAClient":
+        if not settings.IQVIA_BASE_URL:
+            raise ValueError("IQVIA_BASE_URL is not configured")
+        headers = {"Authorization": f"Bearer {settings.IQVIA_API_KEY}"} if settings.IQVIA_API_KEY else None
+        options: Dict[str, Any] = dict(
+            headers=headers,
+            rate_per_second=settings.IQVIA_RATE_PER_SECOND,
+            **settings.http_client_options(),
+        )
+        options.update(overrides)
+        return cls(settings.IQVIA_BASE_URL, **options)
+
+    async def sales(self, molecule: str, page_size: int = 500) -> AsyncIterator[Dict[str, Any]]:
+        """Streams sales rows (region, period, units, value_usd) for a molecule."""
+
+        def next_params(payload: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any] | None:
+            offset = current["offset"] + page_size
+            return {**current, "offset": offset} if offset < payload.get("total", 0) else None
+
+        async for row in self.paginate(
+            "/sales",
+            {"molecule": molecule, "offset": 0, "limit": page_size},
+            items=lambda payload: payload.get("rows", []),
+            next_params=next_params,
+        ):
+            yield row
+
+    async def sales_summary(self, molecule: str) -> Dict[str, Any] | None:
+        """Same shape as MarketStore.sales_summary, aggregated from the streamed sales rows."""
+        by_year: Dict[int, float] = defaultdict(float)
+        by_region: Dict[int, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        async for row in self.sales(molecule):
+            # period is a year ("2023") or a sub-period of one ("2023-Q4", "2023-11")
+            year = int(str(row["period"])[:4])
+            by_year[year] += float(row["value_usd"])
+            by_region[year][row["region"]] += float(row["value_usd"])
+        if not by_year:
+            return None
+
+        first, latest = min(by_year), max(by_year)
+        cagr = 0.0
+        if latest > first and by_year[first] > 0:
+            cagr = (by_year[latest] / by_year[first]) ** (1 / (latest - first)) - 1
+        regions = sorted(by_region[latest].items(), key=lambda item: item[1], reverse=True)
+        return {
+            "latest_year": latest,
+            "market_size_usd": by_year[latest],
+            "cagr": cagr,
+            "key_regions": [region for region, _ in regions[:3]],
+        }
@@ -0,0 +1,214 @@
+# backend/app/services/jobs.py
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Set, Tuple
+from ..agents.master import MasterAgent
+from ..db.run_store import RunStore
+from ..schemas.analysis import AnalysisRequest, RunStatus
+from .coordination import Coordinator
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(RuntimeError):
+    """Raised when job mode cannot accept more runs."""
+
+
+class JobRunner:
+    """
+    Runs analyses in the background (job mode).
+
+    submit() stores a QUEUED run and returns immediately. A pool of analysis workers runs the
+    agents and grading, then hands the run to the report queue (Settings.REPORT_QUEUE_NAME),
+    whose own workers render the report off the event loop. Every status change is saved to the
+    run store and published to subscribers.
+
+    The report queue is an in-process asyncio.Queue, never shared with other workers, and
+    bounded by max_report_queue_size: when reports fall behind, analysis workers wait for room
+    instead of piling graded runs up in memory. A coordinated run is acked only once its report
+    is done, so a run lost from the report queue (the process died) is delivered again.
+
+    With a Coordinator, queued runs go through its per-worker Redis queues instead of the local
+    one, so idle workers in other processes steal them, and runs of a worker that dies are
+    picked up again (at-least-once; a claimed run already finished in the store is skipped).
+    The run store must then be shared (sqlite file or mongo), and subscribers also poll it to
+    follow runs executing elsewhere.
+    """
+
+    # How often subscribe() re-reads the store when runs may execute in another process
+    SUBSCRIBE_POLL_SECONDS = 0.5
+
+    def __init__(
+        self,
+        master_agent: MasterAgent,
+        store: RunStore,
+        workers: int = 4,
+        report_workers: int = 2,
+        max_queue_size: int = 1000,
+        max_report_queue_size: int = 100,
+        report_queue_name: str = "report-generation",
+        coordinator: Coordinator | None = None,
+    ) -> None:
+        self.master_agent = master_agent
+        self.store = store
+        self.workers = workers
+        self.report_workers = report_workers
+        self.max_queue_size = max_queue_size
+        self.report_queue_name = report_queue_name
+        self.coordinator = coordinator
+        self._jobs: "asyncio.Queue[RunStatus]" = asyncio.Queue(maxsize=max_queue_size)
+        # Local to this process. (run, coordination ticket to ack once the run finishes, None
+        # when not coordinated)
+        self._reports: "asyncio.Queue[Tuple[RunStatus, str | None]]" = asyncio.Queue(
+            maxsize=max_report_queue_size
+        )
+        self._tasks: List[asyncio.Task] = []
+        self._subscribers: Dict[str, Set["asyncio.Queue[RunStatus]"]] = {}
+
+    async def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._analysis_worker(), name=f"analysis-worker-{i}")
+            for i in range(self.workers)
+        ] + [
+            asyncio.create_task(self._report_worker(), name=f"{self.report_queue_name}-{i}")
+            for i in range(self.report_workers)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, request: AnalysisRequest) -> RunStatus:
+        run = RunStatus(run_id=str(uuid.uuid4()), request=request)
+        if self.coordinator is not None:
+            if await self.coordinator.queued() >= self.max_queue_size:
+                raise QueueFullError("Analysis queue is full")
+            await self.store.save(run)
+            # Whichever worker claims the run may look it up before the next write-behind flush
+            await self.store.flush()
+            await self.coordinator.enqueue(run.model_dump_json())
+            return run
+        if self._jobs.full():
+            raise QueueFullError("Analysis queue is full")
+        # Saved before a worker can see it, so this QUEUED write never lands after RUNNING
+        await self.store.save(run)
+        try:
+            self._jobs.put_nowait(run)
+        except asyncio.QueueFull:
+            # Filled up by concurrent submits while saving
+            await self._transition(run, "FAILED", error="analysis queue is full")
+            raise QueueFullError("Analysis queue is full") from None
+        return run
+
+    async def get(self, run_id: str) -> RunStatus | None:
+        return await self.store.get(run_id)
+
+    async def subscribe(self, run_id: str) -> AsyncIterator[RunStatus]:
+        """Yields the current state of a run, then every change until it finishes."""
+        queue: "asyncio.Queue[RunStatus]" = asyncio.Queue()
+        self._subscribers.setdefault(run_id, set()).add(queue)
+        try:
+            run = await self.store.get(run_id)
+            if run is None:
+                return
+            while True:
+                yield run
+                if run.status in RunStore.TERMINAL_STATUSES:
+                    return
+                run = await self._next_update(run, queue)
+        finally:
+            subscribers = self._subscribers.get(run_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[run_id]
+
+    async def _next_update(self, run: RunStatus, queue: "asyncio.Queue[RunStatus]") -> RunStatus:
+        if self.coordinator is None:
+            return await queue.get()
+        while True:
+            try:
+                return await asyncio.wait_for(queue.get(), self.SUBSCRIBE_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                stored = await self.store.get(run.run_id)
+                if stored is not None and (stored.status, stored.updated_at) != (run.status, run.updated_at):
+                    return stored
+
+    async def _next_job(self) -> Tuple[RunStatus, str | None]:
+        if self.coordinator is None:
+            return await self._jobs.get(), None
+        while True:
+            ticket = await self.coordinator.claim()
+            run = RunStatus.model_validate_json(ticket)
+            stored = await self.store.get(run.run_id)
+            if stored is None or stored.status not in RunStore.TERMINAL_STATUSES:
+                return run, ticket
+            # Redelivered after its worker finished it but died before acking
+            await self.coordinator.ack(ticket)
+
+    async def _ack(self, ticket: str | None) -> None:
+        if ticket is None:
+            self._jobs.task_done()
+            return
+        try:
+            await self.coordinator.ack(ticket)
+        except Exception:
+            logger.exception("Could not ack a finished run; it may run again")
+
+    async def _transition(self, run: RunStatus, status: str, **changes) -> RunStatus:
+        run = run.model_copy(
+            update={"status": status, "updated_at": datetime.now(timezone.utc), **changes}
+        )
+        await self.store.save(run)
+        for queue in self._subscribers.get(run.run_id, ()):
+            queue.put_nowait(run)
+        return run
+
+    async def _analysis_worker(self) -> None:
+        while True:
+            run, ticket = await self._next_job()
+            try:
+                run = await self._transition(run, "RUNNING")
+                response = await self.master_agent.run_pipeline(
+                    run.request, include_report=False, run_id=run.run_id
+                )
+                run = await self._transition(run, "REPORT_PENDING", response=response)
+                # Waits while the report queue is full (backpressure on the analysis workers)
+                await self._reports.put((run, ticket))
+            except asyncio.CancelledError:
+                # Not acked: a coordinated run stays claimed and is requeued once this worker is gone
+                raise
+            except Exception as exc:
+                logger.exception("Run %s failed", run.run_id)
+                await self._transition(run, "FAILED", error=repr(exc))
+                await self._ack(ticket)
+
+    async def _report_worker(self) -> None:
+        generator = self.master_agent.report_generator
+        while True:
+            run, ticket = await self._reports.get()
+            try:
+                response = run.response
+                report_content = await asyncio.to_thread(
+                    generator.generate_report,
+                    request=run.request,
+                    grading=response.grading,
+                    results=response.results,
+                )
+                await self._transition(
+                    run,
+                    "COMPLETED",
+                    response=response.model_copy(update={"report_content": report_content}),
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.exception("Report for run %s failed", run.run_id)
+                await self._transition(run, "FAILED", error=repr(exc))
+            finally:
+                self._reports.task_done()
+            await self._ack(ticket)
@@ -0,0 +1,235 @@
+# backend/app/services/local_redis.py
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Set, Tuple
+from .coordination import EXTEND_IF_OWNER, RELEASE_IF_OWNER
+
+
+def _bytes(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return value.encode()
+    return str(value).encode()
+
+
+class LocalRedis:
+    """
+    In-process stand-in for redis.asyncio.Redis, limited to the commands the coordination layer
+    and the agent cache use (strings with expiry, lists, sets, and the lock scripts, which run
+    as their Python equivalent).
+
+    Values come back as bytes, like a client without decode_responses. Several Coordinators
+    sharing one LocalRedis behave like workers sharing a Redis server, which is how tests and
+    single-host dev runs exercise locking and work stealing without a server.
+    """
+
+    def __init__(self) -> None:
+        self._data: Dict[bytes, Any] = {}
+        self._expires: Dict[bytes, float] = {}
+        self._changed = asyncio.Condition()
+        self._scripts: Dict[str, Callable[[List[bytes], List[bytes]], int]] = {
+            RELEASE_IF_OWNER: self._release_if_owner,
+            EXTEND_IF_OWNER: self._extend_if_owner,
+        }
+
+    # keyspace --------------------------------------------------------------
+
+    def _live(self, key: Any) -> bytes | None:
+        """The key as bytes if it exists and has not expired."""
+        key = _bytes(key)
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            del self._expires[key]
+        return key if key in self._data else None
+
+    def _typed(self, key: Any, kind: type, create: bool = False) -> Any:
+        live = self._live(key)
+        if live is None:
+            if not create:
+                return None
+            self._data[_bytes(key)] = kind()
+            return self._data[_bytes(key)]
+        value = self._data[live]
+        if not isinstance(value, kind):
+            raise TypeError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    async def _notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    # strings ---------------------------------------------------------------
+
+    async def get(self, name: Any) -> bytes | None:
+        return self._typed(name, bytes)
+
+    async def set(
+        self, name: Any, value: Any, ex: float | None = None, px: int | None = None, nx: bool = False
+    ) -> bool | None:
+        key = _bytes(name)
+        if nx and self._live(key) is not None:
+            return None
+        self._data[key] = _bytes(value)
+        self._expires.pop(key, None)
+        ttl = ex if ex is not None else (px / 1000 if px is not None else None)
+        if ttl is not None:
+            self._expires[key] = time.monotonic() + ttl
+        return True
+
+    async def delete(self, *names: Any) -> int:
+        removed = 0
+        for name in names:
+            key = self._live(name)
+            if key is not None:
+                del self._data[key]
+                self._expires.pop(key, None)
+                removed += 1
+        return removed
+
+    async def exists(self, *names: Any) -> int:
+        return sum(self._live(name) is not None for name in names)
+
+    async def pexpire(self, name: Any, milliseconds: int) -> bool:
+        key = self._live(name)
+        if key is None:
+            return False
+        self._expires[key] = time.monotonic() + int(milliseconds) / 1000
+        return True
+
+    # lists -----------------------------------------------------------------
+
+    async def rpush(self, name: Any, *values: Any) -> int:
+        items: Deque[bytes] = self._typed(name, deque, create=True)
+        items.extend(_bytes(v) for v in values)
+        await self._notify()
+        return len(items)
+
+    async def lpush(self, name: Any, *values: Any) -> int:
+        items: Deque[bytes] = self._typed(name, deque, create=True)
+        items.extendleft(_bytes(v) for v in values)
+        await self._notify()
+        return len(items)
+
+    async def llen(self, name: Any) -> int:
+        items = self._typed(name, deque)
+        return len(items) if items is not None else 0
+
+    async def lrange(self, name: Any, start: int, end: int) -> List[bytes]:
+        items = self._typed(name, deque)
+        if items is None:
+            return []
+        values = list(items)
+        return values[start: (end + 1) or None]
+
+    async def lrem(self, name: Any, count: int, value: Any) -> int:
+        items: Deque[bytes] | None = self._typed(name, deque)
+        if items is None:
+            return 0
+        # count > 0 removes from the head, count < 0 from the tail, 0 removes every match
+        target, values = _bytes(value), list(items)
+        positions = range(len(values)) if count >= 0 else range(len(values) - 1, -1, -1)
+        dropped: Set[int] = set()
+        for i in positions:
+            if values[i] == target:
+                dropped.add(i)
+                if count and len(dropped) == abs(count):
+                    break
+        items.clear()
+        items.extend(v for i, v in enumerate(values) if i not in dropped)
+        if not items:
+            await self.delete(name)
+        return len(dropped)
+
+    async def lmove(self, first_list: Any, second_list: Any, src: str = "LEFT", dest: str = "RIGHT") -> bytes | None:
+        items: Deque[bytes] | None = self._typed(first_list, deque)
+        if not items:
+            return None
+        value = items.popleft() if src.upper() == "LEFT" else items.pop()
+        if not items:
+            await self.delete(first_list)
+        target: Deque[bytes] = self._typed(second_list, deque, create=True)
+        if dest.upper() == "LEFT":
+            target.appendleft(value)
+        else:
+            target.append(value)
+        await self._notify()
+        return value
+
+    async def blmove(
+        self, first_list: Any, second_list: Any, timeout: float, src: str = "LEFT", dest: str = "RIGHT"
+    ) -> bytes | None:
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            value = await self.lmove(first_list, second_list, src, dest)
+            if value is not None:
+                return value
+            remaining = deadline - time.monotonic() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                return None
+            async with self._changed:
+                try:
+                    await asyncio.wait_for(self._changed.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+    # sets ------------------------------------------------------------------
+
+    async def sadd(self, name: Any, *values: Any) -> int:
+        members: Set[bytes] = self._typed(name, set, create=True)
+        before = len(members)
+        members.update(_bytes(v) for v in values)
+        return len(members) - before
+
+    async def srem(self, name: Any, *values: Any) -> int:
+        members: Set[bytes] | None = self._typed(name, set)
+        if members is None:
+            return 0
+        before = len(members)
+        members.difference_update(_bytes(v) for v in values)
+        if not members:
+            await self.delete(name)
+        return before - len(members)
+
+    async def smembers(self, name: Any) -> Set[bytes]:
+        members = self._typed(name, set)
+        return set(members) if members is not None else set()
+
+    # scripting -------------------------------------------------------------
+
+    async def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> Any:
+        try:
+            handler = self._scripts[script]
+        except KeyError:
+            raise NotImplementedError("LocalRedis only runs the coordination layer's scripts") from None
+        keys = [_bytes(k) for k in keys_and_args[:numkeys]]
+        args = [_bytes(a) for a in keys_and_args[numkeys:]]
+        return handler(keys, args)
+
+    def _owner_matches(self, keys: List[bytes], args: List[bytes]) -> Tuple[bytes, bool]:
+        key = self._live(keys[0])
+        return keys[0], key is not None and self._data[key] == args[0]
+
+    def _release_if_owner(self, keys: List[bytes], args: List[bytes]) -> int:
+        key, owned = self._owner_matches(keys, args)
+        if not owned:
+            return 0
+        del self._data[key]
+        self._expires.pop(key, None)
+        return 1
+
+    def _extend_if_owner(self, keys: List[bytes], args: List[bytes]) -> int:
+        key, owned = self._owner_matches(keys, args)
+        if not owned:
+            return 0
+        self._expires[key] = time.monotonic() + int(args[1]) / 1000
+        return 1
+
+    async def ping(self) -> bool:
+        return True
+
+    async def aclose(self) -> None:
+        self._data.clear()
+        self._expires.clear()
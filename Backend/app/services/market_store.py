@@ -0,0 +1,207 @@
+# backend/app/services/market_store.py
+"""
+Columnar store for IQVIA sales and EXIM trade extracts.
+
+CSV dumps are converted once into hive-partitioned Parquet datasets:
+
+    <root>/sales/molecule_bucket=<n>/*.parquet   molecule, region, year, units, value_usd
+    <root>/trade/hs_chapter=<nn>/*.parquet       hs_code, reporter, partner, flow, year, value_usd
+    <root>/hs_codes.parquet                      molecule, hs_code
+
+Rows are sorted by key inside every file, so Parquet row-group statistics let a query for one
+molecule or HS code skip almost everything; the partition column prunes whole directories
+first. Files are read through memory-mapped I/O.
+"""
+import hashlib
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+
+SALES_BUCKETS = 64
+
+# Partition columns, declared on read too: inferred, hs_chapter "30" would come back as an int
+SALES_PARTITIONING = pa.schema([("molecule_bucket", pa.int16())])
+TRADE_PARTITIONING = pa.schema([("hs_chapter", pa.string())])
+
+SALES_SCHEMA = pa.schema(
+    [
+        ("molecule", pa.string()),
+        ("region", pa.string()),
+        ("year", pa.int16()),
+        ("units", pa.float64()),
+        ("value_usd", pa.float64()),
+    ]
+)
+TRADE_SCHEMA = pa.schema(
+    [
+        ("hs_code", pa.string()),
+        ("reporter", pa.string()),
+        ("partner", pa.string()),
+        ("flow", pa.string()),  # "import" | "export"
+        ("year", pa.int16()),
+        ("value_usd", pa.float64()),
+    ]
+)
+
+
+def normalize_molecule(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+def molecule_bucket(molecule: str) -> int:
+    # Stable across processes (unlike hash())
+    digest = hashlib.blake2b(normalize_molecule(molecule).encode(), digest_size=4).digest()
+    return int.from_bytes(digest, "little") % SALES_BUCKETS
+
+
+def _read_csv_batches(csv_path: Path, schema: pa.Schema, block_size: int) -> Iterator[pa.RecordBatch]:
+    reader = pacsv.open_csv(
+        csv_path,
+        read_options=pacsv.ReadOptions(block_size=block_size),
+        convert_options=pacsv.ConvertOptions(
+            column_types={f.name: f.type for f in schema}, include_columns=schema.names
+        ),
+    )
+    for batch in reader:
+        yield batch
+
+
+def _write(batches: Iterator[pa.RecordBatch], schema: pa.Schema, target: Path, partition: str, sort_key: str) -> None:
+    def sorted_batches() -> Iterator[pa.RecordBatch]:
+        for batch in batches:
+            table = pa.Table.from_batches([batch]).sort_by([(partition, "ascending"), (sort_key, "ascending")])
+            yield from table.to_batches()
+
+    ds.write_dataset(
+        sorted_batches(),
+        target,
+        schema=schema,
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([schema.field(partition)]), flavor="hive"),
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        max_rows_per_group=64 * 1024,
+    )
+
+
+def ingest_sales_csv(csv_path: str | Path, root: str | Path, block_size: int = 64 << 20) -> None:
+    """Streams a (multi-GB) sales CSV into <root>/sales without loading it whole."""
+    schema = SALES_SCHEMA.append(SALES_PARTITIONING.field(0))
+
+    def batches() -> Iterator[pa.RecordBatch]:
+        for batch in _read_csv_batches(Path(csv_path), SALES_SCHEMA, block_size):
+            molecules = pc.utf8_lower(pc.utf8_trim_whitespace(batch.column("molecule")))
+            buckets = pa.array([molecule_bucket(m) for m in molecules.to_pylist()], pa.int16())
+            columns = [molecules] + batch.columns[1:] + [buckets]
+            yield pa.RecordBatch.from_arrays(columns, schema=schema)
+
+    _write(batches(), schema, Path(root) / "sales", "molecule_bucket", "molecule")
+
+
+def ingest_trade_csv(csv_path: str | Path, root: str | Path, block_size: int = 64 << 20) -> None:
+    """Streams an EXIM trade CSV into <root>/trade, partitioned by HS chapter (first 2 digits)."""
+    schema = TRADE_SCHEMA.append(TRADE_PARTITIONING.field(0))
+
+    def batches() -> Iterator[pa.RecordBatch]:
+        for batch in _read_csv_batches(Path(csv_path), TRADE_SCHEMA, block_size):
+            hs_codes = pc.utf8_trim_whitespace(batch.column("hs_code"))
+            flows = pc.utf8_lower(batch.column("flow"))
+            columns = [hs_codes] + batch.columns[1:3] + [flows] + batch.columns[4:]
+            yield pa.RecordBatch.from_arrays(columns + [pc.utf8_slice_codeunits(hs_codes, 0, 2)], schema=schema)
+
+    _write(batches(), schema, Path(root) / "trade", "hs_chapter", "hs_code")
+
+
+def ingest_hs_codes_csv(csv_path: str | Path, root: str | Path) -> None:
+    """Small molecule -> HS code mapping used by the EXIM agent."""
+    table = pacsv.read_csv(
+        csv_path,
+        convert_options=pacsv.ConvertOptions(column_types={"molecule": pa.string(), "hs_code": pa.string()}),
+    ).select(["molecule", "hs_code"])
+    table = table.set_column(0, "molecule", pc.utf8_lower(pc.utf8_trim_whitespace(table.column("molecule"))))
+    pq.write_table(table, Path(root) / "hs_codes.parquet")
+
+
+class MarketStore:
+    """Read side: per-molecule / per-HS-code aggregates with partition and row-group pruning."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self._fs = pafs.LocalFileSystem(use_mmap=True)
+        self._sales = self._open("sales", SALES_PARTITIONING)
+        self._trade = self._open("trade", TRADE_PARTITIONING)
+        self._hs_codes: Dict[str, List[str]] = {}
+        hs_path = self.root / "hs_codes.parquet"
+        if hs_path.exists():
+            for row in pq.read_table(hs_path, memory_map=True).to_pylist():
+                self._hs_codes.setdefault(row["molecule"], []).append(row["hs_code"])
+
+    def _open(self, name: str, partitioning: pa.Schema) -> ds.Dataset | None:
+        path = self.root / name
+        if not path.exists():
+            return None
+        return ds.dataset(
+            str(path),
+            format="parquet",
+            partitioning=ds.partitioning(partitioning, flavor="hive"),
+            filesystem=self._fs,
+        )
+
+    def sales_summary(self, molecule: str) -> Dict[str, Any] | None:
+        """Latest-year market size, CAGR over the available years and top regions."""
+        if self._sales is None:
+            return None
+        name = normalize_molecule(molecule)
+        table = self._sales.to_table(
+            columns=["region", "year", "value_usd"],
+            filter=(ds.field("molecule_bucket") == molecule_bucket(name)) & (ds.field("molecule") == name),
+        )
+        if table.num_rows == 0:
+            return None
+
+        yearly = table.group_by("year").aggregate([("value_usd", "sum")]).sort_by("year")
+        years = yearly.column("year").to_pylist()
+        totals = yearly.column("value_usd_sum").to_pylist()
+        cagr = 0.0
+        if len(years) > 1 and totals[0] > 0:
+            cagr = (totals[-1] / totals[0]) ** (1 / (years[-1] - years[0])) - 1
+
+        latest = table.filter(pc.equal(table.column("year"), years[-1]))
+        regions = (
+            latest.group_by("region").aggregate([("value_usd", "sum")]).sort_by([("value_usd_sum", "descending")])
+        )
+        return {
+            "latest_year": years[-1],
+            "market_size_usd": totals[-1],
+            "cagr": cagr,
+            "key_regions": regions.column("region").to_pylist()[:3],
+        }
+
+    def hs_codes_for(self, molecule: str) -> List[str]:
+        return self._hs_codes.get(normalize_molecule(molecule), [])
+
+    def trade_summary(self, hs_codes: List[str], reporter: str) -> Dict[str, Any] | None:
+        """Import/export totals for `reporter` by year, for the given HS codes."""
+        if self._trade is None or not hs_codes:
+            return None
+        chapters = sorted({code[:2] for code in hs_codes})
+        table = self._trade.to_table(
+            columns=["flow", "year", "value_usd"],
+            filter=ds.field("hs_chapter").isin(chapters)
+            & ds.field("hs_code").isin(hs_codes)
+            & (ds.field("reporter") == reporter),
+        )
+        if table.num_rows == 0:
+            return None
+
+        by_flow_year = table.group_by(["flow", "year"]).aggregate([("value_usd", "sum")])
+        series: Dict[str, Dict[int, float]] = {"import": {}, "export": {}}
+        for row in by_flow_year.to_pylist():
+            series.setdefault(row["flow"], {})[row["year"]] = row["value_usd_sum"]
+        return {"imports_by_year": series["import"], "exports_by_year": series["export"]}
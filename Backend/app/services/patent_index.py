@@ -0,0 +1,226 @@
+# backend/app/services/patent_index.py
+"""
+Precomputed patent-family index for freedom-to-operate (FTO) checks.
+
+Built from bulk USPTO-derived CSV files and kept current with weekly delta files:
+
+    patents.csv     patent_id,family_id,molecule,active_ingredient,kind,jurisdiction,
+                    filing_date,expiry_date,extension_days
+    litigation.csv  case_id,patent_id,status,filed_date
+    delta.csv       op,<patents.csv columns>          (op = upsert | delete)
+
+kind is "primary" (compound / composition) or "secondary" (formulation, process, use...).
+Dates are ISO (YYYY-MM-DD). The whole index lives in memory; save()/load() snapshot it.
+"""
+import bisect
+import csv
+import pickle
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Set
+
+
+def _key(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+@dataclass(frozen=True)
+class PatentRecord:
+    patent_id: str
+    family_id: str
+    molecule: str
+    active_ingredient: str
+    kind: str
+    jurisdiction: str
+    filing_date: date
+    expiry_date: date
+    # Term extensions (PTE / SPC / paediatric) in days
+    extension_days: int = 0
+
+    @property
+    def effective_expiry(self) -> date:
+        return self.expiry_date + timedelta(days=self.extension_days)
+
+    def in_force(self, on: date) -> bool:
+        return self.filing_date <= on < self.effective_expiry
+
+
+@dataclass(frozen=True)
+class LitigationRecord:
+    case_id: str
+    patent_id: str
+    status: str
+    filed_date: date
+
+
+@dataclass
+class FTOAssessment:
+    molecule: str
+    on: date
+    primary_patents_expired: bool
+    blocking_patents: List[PatentRecord] = field(default_factory=list)
+    open_litigation: List[LitigationRecord] = field(default_factory=list)
+    # Date from which nothing in the index blocks the molecule any more
+    clear_from: date | None = None
+
+
+class PatentIndex:
+    """
+    In-memory patent index keyed by molecule and active ingredient.
+
+    Patents are also kept sorted by effective expiry, so "what is in force on date X" is a
+    bisect plus a scan of the still-unexpired tail instead of a pass over every record.
+    """
+
+    def __init__(self) -> None:
+        self._patents: Dict[str, PatentRecord] = {}
+        self._by_name: Dict[str, Set[str]] = {}
+        self._litigation: Dict[str, List[LitigationRecord]] = {}
+        self._by_expiry: List[tuple] = []  # (effective_expiry, patent_id), sorted
+        # Identifies the data the index was built from; bumped on every delta (see BaseAgent.data_version)
+        self.version = ""
+
+    # building --------------------------------------------------------------
+
+    @staticmethod
+    def _parse_patent(row: Dict[str, str]) -> PatentRecord:
+        return PatentRecord(
+            patent_id=row["patent_id"].strip(),
+            family_id=row.get("family_id", "").strip() or row["patent_id"].strip(),
+            molecule=row["molecule"].strip(),
+            active_ingredient=(row.get("active_ingredient") or row["molecule"]).strip(),
+            kind=(row.get("kind") or "secondary").strip().lower(),
+            jurisdiction=(row.get("jurisdiction") or "US").strip(),
+            filing_date=date.fromisoformat(row["filing_date"].strip()),
+            expiry_date=date.fromisoformat(row["expiry_date"].strip()),
+            extension_days=int(row.get("extension_days") or 0),
+        )
+
+    def _add(self, record: PatentRecord) -> None:
+        if record.patent_id in self._patents:
+            self._remove(record.patent_id)
+        self._patents[record.patent_id] = record
+        for name in {_key(record.molecule), _key(record.active_ingredient)}:
+            self._by_name.setdefault(name, set()).add(record.patent_id)
+        bisect.insort(self._by_expiry, (record.effective_expiry, record.patent_id))
+
+    def _remove(self, patent_id: str) -> None:
+        record = self._patents.pop(patent_id, None)
+        if record is None:
+            return
+        for name in {_key(record.molecule), _key(record.active_ingredient)}:
+            ids = self._by_name.get(name)
+            if ids is not None:
+                ids.discard(patent_id)
+                if not ids:
+                    del self._by_name[name]
+        entry = (record.effective_expiry, patent_id)
+        i = bisect.bisect_left(self._by_expiry, entry)
+        if i < len(self._by_expiry) and self._by_expiry[i] == entry:
+            del self._by_expiry[i]
+
+    @classmethod
+    def from_bulk(cls, patents_csv: str | Path, litigation_csv: str | Path | None = None) -> "PatentIndex":
+        index = cls()
+        with open(patents_csv, newline="") as fh:
+            records = [cls._parse_patent(row) for row in csv.DictReader(fh)]
+        # Bulk build: one sort instead of N insorts
+        for record in records:
+            index._patents[record.patent_id] = record
+            for name in {_key(record.molecule), _key(record.active_ingredient)}:
+                index._by_name.setdefault(name, set()).add(record.patent_id)
+        index._by_expiry = sorted((r.effective_expiry, r.patent_id) for r in index._patents.values())
+        if litigation_csv is not None:
+            index.load_litigation(litigation_csv)
+        index.version = f"bulk:{Path(patents_csv).name}"
+        return index
+
+    def load_litigation(self, litigation_csv: str | Path) -> None:
+        with open(litigation_csv, newline="") as fh:
+            for row in csv.DictReader(fh):
+                record = LitigationRecord(
+                    case_id=row["case_id"].strip(),
+                    patent_id=row["patent_id"].strip(),
+                    status=row["status"].strip().lower(),
+                    filed_date=date.fromisoformat(row["filed_date"].strip()),
+                )
+                cases = [c for c in self._litigation.get(record.patent_id, []) if c.case_id != record.case_id]
+                self._litigation[record.patent_id] = cases + [record]
+
+    def apply_delta(self, delta_csv: str | Path, litigation_csv: str | Path | None = None) -> int:
+        """Applies a weekly delta (upserts and deletes). Returns the number of rows applied."""
+        applied = 0
+        with open(delta_csv, newline="") as fh:
+            for row in csv.DictReader(fh):
+                if row.get("op", "upsert").strip().lower() == "delete":
+                    self._remove(row["patent_id"].strip())
+                else:
+                    self._add(self._parse_patent(row))
+                applied += 1
+        if litigation_csv is not None:
+            self.load_litigation(litigation_csv)
+        self.version = f"{self.version}+{Path(delta_csv).name}"
+        return applied
+
+    def save(self, path: str | Path) -> None:
+        with open(path, "wb") as fh:
+            pickle.dump(self, fh, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "PatentIndex":
+        with open(path, "rb") as fh:
+            index = pickle.load(fh)
+        if not isinstance(index, cls):
+            raise TypeError(f"{path} does not contain a PatentIndex")
+        return index
+
+    # queries ---------------------------------------------------------------
+
+    def patents_for(self, molecule: str) -> List[PatentRecord]:
+        return [self._patents[pid] for pid in sorted(self._by_name.get(_key(molecule), ()))]
+
+    def in_force(self, on: date) -> Iterable[PatentRecord]:
+        """Every patent in force on `on`, across all molecules."""
+        # First patent whose effective expiry is after `on`
+        start = bisect.bisect_left(self._by_expiry, (on + timedelta(days=1),))
+        for _, patent_id in self._by_expiry[start:]:
+            record = self._patents[patent_id]
+            if record.filing_date <= on:
+                yield record
+
+    def blocked_in_year(self, year: int) -> Dict[str, List[PatentRecord]]:
+        """Molecules with at least one patent in force at any point of `year`."""
+        first, last = date(year, 1, 1), date(year, 12, 31)
+        start = bisect.bisect_left(self._by_expiry, (first + timedelta(days=1),))
+        blocked: Dict[str, List[PatentRecord]] = {}
+        for _, patent_id in self._by_expiry[start:]:
+            record = self._patents[patent_id]
+            if record.filing_date <= last:
+                blocked.setdefault(_key(record.molecule), []).append(record)
+        return blocked
+
+    def fto(self, molecule: str, on: date | None = None) -> FTOAssessment:
+        on = on or date.today()
+        patents = self.patents_for(molecule)
+        blocking = [p for p in patents if p.in_force(on)]
+        open_cases = [
+            case
+            for p in patents
+            for case in self._litigation.get(p.patent_id, ())
+            if case.status == "open"
+        ]
+        return FTOAssessment(
+            molecule=molecule,
+            on=on,
+            primary_patents_expired=not any(p.kind == "primary" for p in blocking),
+            blocking_patents=blocking,
+            open_litigation=open_cases,
+            clear_from=max((p.effective_expiry for p in blocking), default=None),
+        )
+
+    def fto_portfolio(self, molecules: Iterable[str], on: date | None = None) -> Dict[str, FTOAssessment]:
+        return {molecule: self.fto(molecule, on) for molecule in molecules}
+
+    def __len__(self) -> int:
+        return len(self._patents)
@@ -0,0 +1,314 @@
+# backend/app/services/portfolio_index.py
+import asyncio
+import logging
+import re
+import threading
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Iterable, List, Literal, Sequence, Tuple, get_args
+import numpy as np
+from .vector_index import HashingEmbedder
+from ..agents.base import normalize_key_part
+from ..agents.grading import DIMENSIONS
+from ..db.run_store import RunStore
+from ..schemas.agent_data import PAYLOAD_TYPES, AgentPayload, payload_field
+from ..schemas.analysis import AnalysisRequest, AnalysisResponse, GradingBreakdown, SimilarMolecule
+
+logger = logging.getLogger(__name__)
+
+_LETTERS = re.compile(r"[a-z0-9]+")
+
+# Grading vector layout: the dimensions, then overall_score
+GRADE_FIELDS: Tuple[str, ...] = (*DIMENSIONS, "overall_score")
+
+
+def _numeric_fields() -> List[Tuple[str, str]]:
+    """(agent_name, field) of every int / float / bool payload field."""
+    columns: List[Tuple[str, str]] = []
+    for agent_name, payload_type in PAYLOAD_TYPES.items():
+        for f in fields(payload_type):
+            kinds = set(get_args(f.type)) - {type(None)} or {f.type}
+            if kinds <= {int, float, bool}:
+                columns.append((agent_name, f.name))
+    return columns
+
+
+# Profile vector layout: grading dimensions, then the numeric payload fields of every agent
+PROFILE_COLUMNS: List[Tuple[str, str]] = [("grading", d) for d in DIMENSIONS] + _numeric_fields()
+
+
+class MoleculeEmbedder(HashingEmbedder):
+    """
+    Descriptor of a molecule / indication pair that is known before any agent runs:
+    character trigrams of the molecule name (shared stems such as -statin, -gliptin, -mab)
+    and the words of the indication. Texts are "molecule\\tindication".
+    """
+
+    def _features(self, text: str) -> Iterable[str]:
+        molecule, _, indication = text.partition("\t")
+        for word in _LETTERS.findall(molecule.lower()):
+            padded = f"^{word}$"
+            for i in range(len(padded) - 2):
+                yield f"m:{padded[i:i + 3]}"
+        for feature in super()._features(indication):
+            yield f"i:{feature}"
+
+
+@dataclass
+class PrescreenEstimate:
+    """Grade estimated for one candidate from its nearest analysed molecules."""
+    grading: GradingBreakdown | None
+    # 0–1, mean similarity of the neighbours the estimate is drawn from
+    confidence: float
+    # The pair itself was analysed; grading is its stored one
+    analysed: bool = False
+    neighbours: List[SimilarMolecule] = field(default_factory=list)
+
+
+class PortfolioIndex:
+    """
+    In-memory similarity index over the analysed portfolio: the latest graded run of each
+    molecule / indication pair, fed by every pipeline run and warmed from the run store.
+
+    Each entry keeps three vectors in row-aligned NumPy arrays:
+    - descriptor: MoleculeEmbedder vector, used to pre-screen molecules that were never analysed
+    - profile: grading dimensions plus the agents' numeric payload fields (NaN where absent),
+      standardised per column at query time; used to find analysed molecules that behave alike
+    - grades: the GradingBreakdown, which neighbours average into a pre-screen estimate
+
+    Queries are brute-force matrix products, chunked so a pre-screen of thousands of
+    candidates against tens of thousands of molecules stays within a few hundred MB.
+    """
+
+    GROWTH = 2.0
+    # Upper bound on candidate x molecule similarity cells computed at once
+    CHUNK_CELLS = 4_000_000
+
+    def __init__(self, dim: int = 256, initial_capacity: int = 1024) -> None:
+        self.embedder = MoleculeEmbedder(dim)
+        self.capacity = initial_capacity
+        self.count = 0
+        self._descriptors = np.zeros((initial_capacity, dim), dtype=np.float32)
+        self._profiles = np.full((initial_capacity, len(PROFILE_COLUMNS)), np.nan)
+        self._grades = np.zeros((initial_capacity, len(GRADE_FIELDS)))
+        # row -> (run_id, molecule_name, target_indication)
+        self._entries: List[Tuple[str, str, str | None]] = []
+        self._rows: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.RLock()
+        self._standardised: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    @staticmethod
+    def _key(molecule: str, indication: str | None) -> Tuple[str, str]:
+        return normalize_key_part(molecule), normalize_key_part(indication)
+
+    @staticmethod
+    def _text(molecule: str, indication: str | None) -> str:
+        return f"{molecule}\t{indication or ''}"
+
+    # writes ----------------------------------------------------------------
+
+    def _grow(self) -> None:
+        capacity = int(self.capacity * self.GROWTH)
+        descriptors = np.zeros((capacity, self._descriptors.shape[1]), dtype=np.float32)
+        profiles = np.full((capacity, len(PROFILE_COLUMNS)), np.nan)
+        grades = np.zeros((capacity, len(GRADE_FIELDS)))
+        descriptors[: self.count] = self._descriptors[: self.count]
+        profiles[: self.count] = self._profiles[: self.count]
+        grades[: self.count] = self._grades[: self.count]
+        # Readers keep the old arrays they snapshotted; they are never written again
+        self._descriptors, self._profiles, self._grades = descriptors, profiles, grades
+        self.capacity = capacity
+
+    def upsert(
+        self,
+        run_id: str,
+        molecule_name: str,
+        target_indication: str | None,
+        grading: Dict[str, float],
+        results: "Dict[str, AgentPayload | Dict[str, Any]]",
+    ) -> None:
+        """Adds or replaces the entry of a molecule / indication pair."""
+        descriptor = self.embedder.embed([self._text(molecule_name, target_indication)])[0]
+        profile = np.full(len(PROFILE_COLUMNS), np.nan)
+        for col, (source, key) in enumerate(PROFILE_COLUMNS):
+            value = grading.get(key) if source == "grading" else payload_field(results.get(source), key)
+            if isinstance(value, (int, float)):
+                profile[col] = float(value)
+        grades = [float(grading[f]) for f in GRADE_FIELDS]
+
+        key = self._key(molecule_name, target_indication)
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                if self.count == self.capacity:
+                    self._grow()
+                row = self.count
+                self._rows[key] = row
+                self._entries.append((run_id, molecule_name, target_indication))
+                self.count += 1
+            else:
+                self._entries[row] = (run_id, molecule_name, target_indication)
+            self._descriptors[row] = descriptor
+            self._profiles[row] = profile
+            self._grades[row] = grades
+            self._standardised = None
+
+    def add_response(self, request: AnalysisRequest, response: AnalysisResponse) -> bool:
+        """Indexes a pipeline response; requests without a molecule name are not indexable."""
+        if not request.molecule_name:
+            return False
+        self.upsert(
+            response.run_id,
+            request.molecule_name,
+            request.target_indication,
+            response.grading.model_dump(),
+            {r.agent_name: r.raw_data for r in response.results},
+        )
+        return True
+
+    def add_rows(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Indexes rows from RunStore.latest_graded(); returns how many were added."""
+        added = 0
+        for row in rows:
+            if row.get("molecule_name"):
+                self.upsert(
+                    row["run_id"], row["molecule_name"], row["target_indication"], row["grading"], row["results"]
+                )
+                added += 1
+        return added
+
+    async def warm(self, store: RunStore, limit: int) -> int:
+        """Loads the latest graded runs from the store, off the event loop."""
+        rows = await store.latest_graded(limit)
+        # Newest first from the store; index oldest first so the newest run of a pair wins
+        added = await asyncio.to_thread(self.add_rows, reversed(rows))
+        logger.info("Portfolio index warmed with %d molecules", added)
+        return added
+
+    # reads -----------------------------------------------------------------
+
+    def _snapshot(self) -> Tuple[int, np.ndarray, np.ndarray, List[Tuple[str, str, str | None]]]:
+        with self._lock:
+            n = self.count
+            return n, self._descriptors[:n], self._grades[:n], self._entries[:n]
+
+    def _profile_matrix(self) -> np.ndarray:
+        """Row-normalised z-scores of the profiles; missing values sit at the column mean (0)."""
+        with self._lock:
+            if self._standardised is None or len(self._standardised) != self.count:
+                profiles = self._profiles[: self.count]
+                present = ~np.isnan(profiles)
+                counts = present.sum(axis=0)
+                means = np.divide(np.nansum(profiles, axis=0), counts, out=np.zeros(profiles.shape[1]), where=counts > 0)
+                centred = np.where(present, profiles - means, 0.0)
+                stds = np.sqrt((centred ** 2).sum(axis=0) / np.maximum(counts, 1))
+                z = np.divide(centred, stds, out=np.zeros_like(centred), where=stds > 1e-12)
+                norms = np.linalg.norm(z, axis=1, keepdims=True)
+                np.divide(z, norms, out=z, where=norms > 0)
+                self._standardised = z
+            return self._standardised
+
+    def _similar(self, entries, grades, rows: np.ndarray, scores: np.ndarray) -> List[SimilarMolecule]:
+        return [
+            SimilarMolecule(
+                run_id=entries[row][0],
+                molecule_name=entries[row][1],
+                target_indication=entries[row][2],
+                similarity=round(float(score), 4),
+                grading=GradingBreakdown(**dict(zip(GRADE_FIELDS, grades[row].tolist()))),
+            )
+            for row, score in zip(rows.tolist(), scores.tolist())
+        ]
+
+    @staticmethod
+    def _top(scores: np.ndarray, k: int) -> np.ndarray:
+        k = min(k, scores.shape[-1])
+        if k <= 0:
+            return np.empty(scores.shape[:-1] + (0,), dtype=np.int64)
+        top = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+        order = np.argsort(-np.take_along_axis(scores, top, axis=-1), axis=-1)
+        return np.take_along_axis(top, order, axis=-1)
+
+    def similar(
+        self,
+        molecule: str,
+        indication: str | None = None,
+        k: int = 10,
+        basis: Literal["profile", "descriptor"] = "profile",
+    ) -> List[SimilarMolecule]:
+        """
+        Nearest analysed molecules to one molecule / indication pair. "profile" compares agent
+        findings and needs the pair to be analysed (KeyError otherwise); "descriptor" compares
+        names and indications and works for any pair.
+        """
+        # Looked up first: rows only grow, so it is inside the snapshot
+        own = self._rows.get(self._key(molecule, indication))
+        n, descriptors, grades, entries = self._snapshot()
+        if basis == "profile":
+            if own is None:
+                raise KeyError(f"'{molecule}' ({indication or 'any indication'}) has not been analysed")
+            matrix = self._profile_matrix()[:n]
+            scores = matrix @ matrix[own]
+        else:
+            scores = descriptors @ self.embedder.embed([self._text(molecule, indication)])[0]
+        scores = scores.astype(np.float64)
+        if own is not None:
+            scores[own] = -np.inf
+        top = self._top(scores, k)
+        top = top[np.isfinite(scores[top])]
+        return self._similar(entries, grades, top, scores[top])
+
+    def prescreen(
+        self,
+        candidates: Sequence[Tuple[str | None, str | None]],
+        k: int = 10,
+        min_similarity: float = 0.2,
+        include_neighbours: bool = False,
+    ) -> List[PrescreenEstimate]:
+        """
+        Estimated grades for (molecule, indication) candidates: the similarity-weighted mean of
+        the grading vectors of their k nearest analysed molecules (by descriptor), ignoring
+        neighbours below min_similarity. Pairs already analysed return their stored grading.
+        """
+        n, descriptors, grades, entries = self._snapshot()
+        estimates: List[PrescreenEstimate | None] = [None] * len(candidates)
+        pending: List[int] = []
+        for i, (molecule, indication) in enumerate(candidates):
+            row = self._rows.get(self._key(molecule, indication)) if molecule else None
+            if row is not None and row < n:
+                estimates[i] = PrescreenEstimate(
+                    grading=GradingBreakdown(**dict(zip(GRADE_FIELDS, grades[row].tolist()))),
+                    confidence=1.0,
+                    analysed=True,
+                )
+            elif not molecule or n == 0:
+                estimates[i] = PrescreenEstimate(grading=None, confidence=0.0)
+            else:
+                pending.append(i)
+
+        chunk = max(1, self.CHUNK_CELLS // max(n, 1))
+        for start in range(0, len(pending), chunk):
+            part = pending[start: start + chunk]
+            queries = self.embedder.embed([self._text(*candidates[i]) for i in part])
+            scores = queries @ descriptors.T
+            top = self._top(scores, k)
+            top_scores = np.take_along_axis(scores, top, axis=1).astype(np.float64)
+            weights = np.where(top_scores >= min_similarity, top_scores, 0.0)
+            totals = weights.sum(axis=1)
+            # (chunk, k) @ (chunk, k, grades) -> (chunk, grades)
+            estimated = np.einsum("ck,ckg->cg", weights, grades[top])
+            for j, i in enumerate(part):
+                used = weights[j] > 0
+                if totals[j] <= 0:
+                    estimates[i] = PrescreenEstimate(grading=None, confidence=0.0)
+                    continue
+                estimates[i] = PrescreenEstimate(
+                    grading=GradingBreakdown(**dict(zip(GRADE_FIELDS, (estimated[j] / totals[j]).tolist()))),
+                    confidence=round(float(top_scores[j][used].mean()), 4),
+                    neighbours=self._similar(entries, grades, top[j][used], top_scores[j][used])
+                    if include_neighbours
+                    else [],
+                )
+        return estimates
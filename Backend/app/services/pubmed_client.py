@@ -0,0 +1,47 @@
+# backend/app/services/pubmed_client.py
+from typing import Any, AsyncIterator, Dict, List
+from .http import UpstreamClient
+from ..core.config import Settings
+
+
+class PubMedClient(UpstreamClient):
+    """
+    NCBI E-utilities (esearch / esummary) for literature signals.
+    NCBI allows 3 requests/s without an API key and 10/s with one.
+    """
+
+    @classmethod
+    def from_settings(cls, settings: Settings, **overrides: Any) -> "PubMedClient":
+        params = {"db": "pubmed", "retmode": "json"}
+        if settings.NCBI_API_KEY:
+            params["api_key"] = settings.NCBI_API_KEY
+        options: Dict[str, Any] = dict(
+            default_params=params,
+            rate_per_second=10.0 if settings.NCBI_API_KEY else 3.0,
+            **settings.http_client_options(),
+        )
+        options.update(overrides)
+        return cls(settings.PUBMED_BASE_URL, **options)
+
+    async def search_ids(self, term: str, page_size: int = 200, max_results: int = 1000) -> AsyncIterator[str]:
+        """Streams PubMed IDs matching `term`, one esearch page at a time."""
+
+        def next_params(payload: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any] | None:
+            result = payload.get("esearchresult", {})
+            start = params["retstart"] + page_size
+            if start >= min(int(result.get("count", 0)), max_results):
+                return None
+            return {**params, "retstart": start}
+
+        async for pmid in self.paginate(
+            "/esearch.fcgi",
+            {"term": term, "retstart": 0, "retmax": page_size},
+            items=lambda payload: payload.get("esearchresult", {}).get("idlist", []),
+            next_params=next_params,
+        ):
+            yield pmid
+
+    async def summaries(self, pmids: List[str]) -> Dict[str, Any]:
+        payload = await self.get_json("/esummary.fcgi", {"id": ",".join(pmids)})
+        result = payload.get("result", {})
+        return {pmid: result[pmid] for pmid in result.get("uids", [])}
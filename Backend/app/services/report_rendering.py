@@ -0,0 +1,483 @@
+# backend/app/services/report_rendering.py
+"""
+Section-by-section report rendering (text, Markdown, HTML, PDF).
+
+A report is a sequence of sections (title, executive summary, one per agent, conclusion).
+Each section is rendered from a compiled template and cached by the identity of the data it
+shows, so re-rendering a refreshed run only renders the agents that changed. Writers wrap the
+rendered sections into a document and emit bytes as they go, which keeps memory flat for
+portfolio reports spanning hundreds of pages.
+"""
+import asyncio
+import hashlib
+import html
+import os
+import string
+import textwrap
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, AsyncIterable, AsyncIterator, BinaryIO, Callable, Dict, Iterable, Iterator, List, Tuple
+from ..schemas.agent_data import payload_items
+from ..schemas.analysis import AgentResult, AnalysisRequest, GradingBreakdown
+
+# Bump when a template changes so cached sections and documents are not reused
+TEMPLATE_VERSION = "1"
+
+FORMATS = ("text", "md", "html", "pdf")
+MEDIA_TYPES = {
+    "text": "text/plain; charset=utf-8",
+    "md": "text/markdown; charset=utf-8",
+    "html": "text/html; charset=utf-8",
+    "pdf": "application/pdf",
+}
+
+# Source format whose rendered sections each format reuses (PDF lays out the plain text)
+_SOURCE_FORMAT = {"text": "text", "md": "md", "html": "html", "pdf": "text"}
+
+_TEMPLATES: Dict[str, Dict[str, str]] = {
+    "text": {
+        "title": "{title}\n{underline}\n",
+        "summary": (
+            "1. Executive Summary\n"
+            "- Overall feasibility grade: {overall:.1f} / 100\n"
+            "- Market Demand: {market_demand:.1f} / 100\n"
+            "- Production Feasibility: {production_feasibility:.1f} / 100\n"
+            "- Demographic Fit: {demographics:.1f} / 100\n"
+            "- Patents & Trials: {patents_and_trials:.1f} / 100\n"
+            "- Competition Landscape: {competition:.1f} / 100\n"
+        ),
+        "agents_heading": "2. Detailed Agent Insights",
+        "agent": "{index}. {agent_name}\n{underline}\n{summary}\n",
+        "agent_detail": "",
+        "conclusion": "3. Conclusion\n{conclusion}",
+    },
+    "md": {
+        "title": "# {title}\n",
+        "summary": (
+            "## 1. Executive Summary\n\n"
+            "| Dimension | Score |\n|---|---|\n"
+            "| **Overall feasibility grade** | **{overall:.1f} / 100** |\n"
+            "| Market Demand | {market_demand:.1f} / 100 |\n"
+            "| Production Feasibility | {production_feasibility:.1f} / 100 |\n"
+            "| Demographic Fit | {demographics:.1f} / 100 |\n"
+            "| Patents & Trials | {patents_and_trials:.1f} / 100 |\n"
+            "| Competition Landscape | {competition:.1f} / 100 |\n"
+        ),
+        "agents_heading": "## 2. Detailed Agent Insights\n",
+        "agent": "### {index}. {agent_name}\n\n{summary}\n\n{details}",
+        "agent_detail": "- `{key}`: {value}\n",
+        "conclusion": "## 3. Conclusion\n\n{conclusion}\n",
+    },
+    "html": {
+        "title": "<h1>{title}</h1>\n",
+        "summary": (
+            "<section><h2>1. Executive Summary</h2>\n<table>\n"
+            "<tr><th>Overall feasibility grade</th><td>{overall:.1f} / 100</td></tr>\n"
+            "<tr><th>Market Demand</th><td>{market_demand:.1f} / 100</td></tr>\n"
+            "<tr><th>Production Feasibility</th><td>{production_feasibility:.1f} / 100</td></tr>\n"
+            "<tr><th>Demographic Fit</th><td>{demographics:.1f} / 100</td></tr>\n"
+            "<tr><th>Patents &amp; Trials</th><td>{patents_and_trials:.1f} / 100</td></tr>\n"
+            "<tr><th>Competition Landscape</th><td>{competition:.1f} / 100</td></tr>\n"
+            "</table></section>\n"
+        ),
+        "agents_heading": "<h2>2. Detailed Agent Insights</h2>\n",
+        "agent": "<section><h3>{index}. {agent_name}</h3>\n<p>{summary}</p>\n<dl>\n{details}</dl></section>\n",
+        "agent_detail": "<dt>{key}</dt><dd>{value}</dd>\n",
+        "conclusion": "<section><h2>3. Conclusion</h2>\n<p>{conclusion}</p></section>\n",
+    },
+}
+
+# Context values that are already rendered markup and must not be escaped again
+_RAW_FIELDS = {"details"}
+
+
+class CompiledTemplate:
+    """A format-string template parsed once into literal / field parts."""
+
+    def __init__(self, source: str, escape: Callable[[str], str]) -> None:
+        self._parts: List[Tuple[str, str | None, str]] = [
+            (literal, field, spec or "") for literal, field, spec, _ in string.Formatter().parse(source)
+        ]
+        self._escape = escape
+
+    def render(self, context: Dict[str, Any]) -> str:
+        out: List[str] = []
+        for literal, field, spec in self._parts:
+            out.append(literal)
+            if field is not None:
+                value = format(context[field], spec)
+                out.append(value if field in _RAW_FIELDS else self._escape(value))
+        return "".join(out)
+
+
+@lru_cache(maxsize=None)
+def get_template(fmt: str, kind: str) -> CompiledTemplate:
+    escape = html.escape if fmt == "html" else (lambda value: value)
+    return CompiledTemplate(_TEMPLATES[fmt][kind], escape)
+
+
+@dataclass(frozen=True)
+class Section:
+    kind: str
+    # Identifies the data the section shows; equal keys render to identical output
+    key: str
+    context: Dict[str, Any]
+
+
+def _conclusion(overall: float) -> str:
+    if overall >= 0.75:
+        return (
+            "The molecule presents a highly attractive opportunity for generic manufacturing, "
+            "with strong scores across most dimensions."
+        )
+    if overall >= 0.55:
+        return (
+            "The molecule presents a moderately attractive opportunity. "
+            "It can be considered with further due diligence on weaker dimensions."
+        )
+    return (
+        "The molecule currently appears to have limited attractiveness for generic manufacturing. "
+        "Significant risks or constraints have been identified."
+    )
+
+
+def _result_identity(result: AgentResult) -> str:
+    # A result is immutable once generated; fall back to hashing it when it carries no stamp
+    if result.generated_at is not None:
+        return f"{result.agent_name}|{result.input_fingerprint}|{result.generated_at.isoformat()}"
+    return hashlib.sha256(result.model_dump_json().encode()).hexdigest()
+
+
+def build_sections(
+    request: AnalysisRequest, grading: GradingBreakdown, results: List[AgentResult]
+) -> Iterator[Section]:
+    title = f"Generic Opportunity Report for {request.molecule_name or 'Selected Molecule'}"
+    yield Section("title", f"title|{title}", {"title": title, "underline": "=" * len(title)})
+
+    scores = {
+        "overall": grading.overall_score * 100,
+        "market_demand": grading.market_demand * 100,
+        "production_feasibility": grading.production_feasibility * 100,
+        "demographics": grading.demographics * 100,
+        "patents_and_trials": grading.patents_and_trials * 100,
+        "competition": grading.competition * 100,
+    }
+    yield Section("summary", "summary|" + "|".join(f"{v:.1f}" for v in scores.values()), scores)
+    yield Section("agents_heading", "agents_heading", {})
+
+    for index, r in enumerate(results, start=1):
+        yield Section(
+            "agent",
+            f"agent|{index}|{_result_identity(r)}",
+            {"index": index, "agent_name": r.agent_name, "underline": "-" * (len(r.agent_name) + 3),
+             "summary": r.summary, "raw_data": r.raw_data},
+        )
+
+    yield Section("conclusion", f"conclusion|{grading.overall_score:.4f}", {"conclusion": _conclusion(grading.overall_score)})
+
+
+# ---------------------------------------------------------------------------
+# Writers: wrap rendered sections into a document, emitting bytes incrementally
+# ---------------------------------------------------------------------------
+
+
+class TextWriter:
+    separator = "\n"
+
+    def __init__(self) -> None:
+        self._first = True
+
+    def begin(self, title: str) -> bytes:
+        return b""
+
+    def document(self) -> bytes:
+        # Blank line between consecutive documents of a portfolio report
+        return b"" if self._first else b"\n\n"
+
+    def section(self, rendered: str, first_in_document: bool) -> bytes:
+        self._first = False
+        return (rendered if first_in_document else self.separator + rendered).encode()
+
+    def end(self) -> bytes:
+        return b""
+
+
+class MarkdownWriter(TextWriter):
+    pass
+
+
+class HtmlWriter(TextWriter):
+    separator = ""
+
+    def begin(self, title: str) -> bytes:
+        return (
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+            f"<title>{html.escape(title)}</title></head><body>\n"
+        ).encode()
+
+    def document(self) -> bytes:
+        prefix = b"" if self._first else b"</article>\n<hr>\n"
+        return prefix + b"<article>\n"
+
+    def section(self, rendered: str, first_in_document: bool) -> bytes:
+        self._first = False
+        return rendered.encode()
+
+    def end(self) -> bytes:
+        return b"</article>\n</body></html>\n" if not self._first else b"</body></html>\n"
+
+
+class PdfWriter:
+    """
+    Minimal PDF 1.4 writer (Helvetica text pages).
+
+    Pages are written as soon as they fill up; only object offsets are kept, so output size
+    does not affect memory. The page tree and xref table are written at the end.
+    """
+
+    PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+    MARGIN = 54
+    FONT_SIZE = 10
+    LEADING = 14
+    WRAP = 95
+
+    def __init__(self) -> None:
+        self._offset = 0
+        self._offsets: Dict[int, int] = {}
+        self._next_id = 4  # 1 catalog, 2 page tree, 3 font
+        self._pages: List[int] = []
+        self._lines: List[str] = []
+        self._lines_per_page = (self.PAGE_HEIGHT - 2 * self.MARGIN) // self.LEADING
+
+    def _emit(self, data: bytes) -> bytes:
+        self._offset += len(data)
+        return data
+
+    def _object(self, obj_id: int, body: bytes) -> bytes:
+        self._offsets[obj_id] = self._offset
+        return self._emit(f"{obj_id} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    @staticmethod
+    def _pdf_string(text: str) -> str:
+        text = text.encode("latin-1", "replace").decode("latin-1")
+        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    def _flush_page(self) -> bytes:
+        lines, self._lines = self._lines, []
+        ops = [f"BT /F1 {self.FONT_SIZE} Tf {self.LEADING} TL {self.MARGIN} {self.PAGE_HEIGHT - self.MARGIN} Td"]
+        ops.extend(f"({self._pdf_string(line)}) '" for line in lines)
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        content_id, page_id = self._next_id, self._next_id + 1
+        self._next_id += 2
+        self._pages.append(page_id)
+        out = self._object(
+            content_id, f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream"
+        )
+        out += self._object(
+            page_id,
+            (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {self.PAGE_WIDTH} {self.PAGE_HEIGHT}] "
+                f"/Contents {content_id} 0 R /Resources << /Font << /F1 3 0 R >> >> >>"
+            ).encode(),
+        )
+        return out
+
+    def begin(self, title: str) -> bytes:
+        out = self._emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        return out + self._object(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    def document(self) -> bytes:
+        # Every document of a portfolio starts on a new page
+        return self._flush_page() if self._lines else b""
+
+    def section(self, rendered: str, first_in_document: bool) -> bytes:
+        out = b""
+        if not first_in_document:
+            self._lines.append("")
+        for paragraph in rendered.split("\n"):
+            for line in textwrap.wrap(paragraph, self.WRAP) or [""]:
+                self._lines.append(line)
+                if len(self._lines) >= self._lines_per_page:
+                    out += self._flush_page()
+        return out
+
+    def end(self) -> bytes:
+        out = self._flush_page() if self._lines or not self._pages else b""
+        kids = " ".join(f"{page_id} 0 R" for page_id in self._pages)
+        out += self._object(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(self._pages)} >>".encode())
+        out += self._object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        xref_at = self._offset
+        size = self._next_id
+        entries = ["0000000000 65535 f "]
+        entries.extend(
+            f"{self._offsets[i]:010d} 00000 n " if i in self._offsets else "0000000000 65535 f "
+            for i in range(1, size)
+        )
+        out += self._emit(
+            (f"xref\n0 {size}\n" + "\n".join(entries) + f"\ntrailer\n<< /Size {size} /Root 1 0 R >>\n"
+             f"startxref\n{xref_at}\n%%EOF\n").encode()
+        )
+        return out
+
+
+_WRITERS = {"text": TextWriter, "md": MarkdownWriter, "html": HtmlWriter, "pdf": PdfWriter}
+
+Document = Tuple[AnalysisRequest, GradingBreakdown, List[AgentResult]]
+
+
+class ReportRenderer:
+    """Renders reports in any of FORMATS, caching rendered sections (LRU, by section key)."""
+
+    def __init__(self, max_cached_sections: int = 4096) -> None:
+        self.max_cached_sections = max_cached_sections
+        self._sections: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render_section(self, fmt: str, section: Section) -> str:
+        source = _SOURCE_FORMAT[fmt]
+        cache_key = (source, section.key)
+        rendered = self._sections.get(cache_key)
+        if rendered is not None:
+            self.hits += 1
+            self._sections.move_to_end(cache_key)
+            return rendered
+
+        self.misses += 1
+        context = section.context
+        if section.kind == "agent":
+            detail = get_template(source, "agent_detail")
+            context = dict(
+                context,
+                details="".join(
+                    detail.render({"key": key, "value": value})
+                    for key, value in payload_items(context["raw_data"])
+                    if isinstance(value, (str, int, float, bool))
+                ),
+            )
+        rendered = get_template(source, section.kind).render(context)
+        self._sections[cache_key] = rendered
+        while len(self._sections) > self.max_cached_sections:
+            self._sections.popitem(last=False)
+        return rendered
+
+    def _document_chunks(self, writer, fmt: str, document: Document) -> Iterator[bytes]:
+        chunk = writer.document()
+        if chunk:
+            yield chunk
+        for position, section in enumerate(build_sections(*document)):
+            chunk = writer.section(self.render_section(fmt, section), position == 0)
+            if chunk:
+                yield chunk
+
+    def stream(self, fmt: str, documents: Iterable[Document], title: str = "Generic Opportunity Report") -> Iterator[bytes]:
+        """Renders one or more documents (a portfolio) into a single output, chunk by chunk."""
+        writer = _WRITERS[fmt]()
+        yield writer.begin(title)
+        for document in documents:
+            yield from self._document_chunks(writer, fmt, document)
+        yield writer.end()
+
+    async def astream(
+        self, fmt: str, documents: AsyncIterable[Document], title: str = "Generic Opportunity Report"
+    ) -> AsyncIterator[bytes]:
+        """Async variant for documents loaded lazily (e.g. runs fetched from the run store)."""
+        writer = _WRITERS[fmt]()
+        yield writer.begin(title)
+        async for document in documents:
+            for chunk in self._document_chunks(writer, fmt, document):
+                yield chunk
+        yield writer.end()
+
+    def render(self, fmt: str, request: AnalysisRequest, grading: GradingBreakdown, results: List[AgentResult]) -> str:
+        """Whole single-run report as a string (text-based formats only)."""
+        return b"".join(self.stream(fmt, [(request, grading, results)])).decode()
+
+
+class ReportFileCache:
+    """
+    On-disk cache of fully rendered documents, keyed by content.
+
+    A download streams the renderer output to the client and into a temporary file at the same
+    time; the file is only published once the document is complete. Least recently used files
+    are evicted past max_bytes.
+    """
+
+    # Rendered bytes gathered before each write to the temporary file
+    WRITE_BUFFER_BYTES = 256 << 10
+
+    def __init__(self, directory: str | Path, max_bytes: int = 512 << 20) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(fmt: str, parts: Iterable[str]) -> str:
+        digest = hashlib.sha256(f"{TEMPLATE_VERSION}|{fmt}".encode())
+        for part in parts:
+            digest.update(b"|" + part.encode())
+        return digest.hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / key
+
+    async def get(self, key: str) -> Path | None:
+        """The cached document, if any; the stat and mtime touch run off the event loop."""
+        return await asyncio.to_thread(self._touch, key)
+
+    def _touch(self, key: str) -> Path | None:
+        path = self.path(key)
+        try:
+            os.utime(path)  # LRU by mtime
+        except FileNotFoundError:
+            return None
+        return path
+
+    async def tee(self, key: str, chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        """Yields the chunks while copying them to the cache; all file I/O runs off the event loop."""
+        tmp = self.directory / f".{key}.{uuid.uuid4().hex}.tmp"
+        fh = await asyncio.to_thread(open, tmp, "wb")
+        buffer = bytearray()
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                if len(buffer) >= self.WRITE_BUFFER_BYTES:
+                    data, buffer = buffer, bytearray()
+                    await asyncio.to_thread(fh.write, data)
+                yield chunk
+            await asyncio.to_thread(self._publish, fh, buffer, tmp, key)
+        finally:
+            await asyncio.to_thread(self._discard, fh, tmp)
+        await asyncio.to_thread(self._evict)
+
+    def _publish(self, fh: BinaryIO, tail: bytes, tmp: Path, key: str) -> None:
+        fh.write(tail)
+        fh.close()
+        os.replace(tmp, self.path(key))
+
+    @staticmethod
+    def _discard(fh: BinaryIO, tmp: Path) -> None:
+        if not fh.closed:
+            fh.close()
+        tmp.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        files = []
+        for path in self.directory.iterdir():
+            if path.name.startswith("."):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # evicted concurrently
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
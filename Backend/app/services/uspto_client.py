@@ -0,0 +1,46 @@
+# backend/app/services/uspto_client.py
+import json
+from typing import Any, AsyncIterator, Dict
+from .http import UpstreamClient
+from ..core.config import Settings
+
+
+class USPTOClient(UpstreamClient):
+    """
+    Patent search (PatentsView-style API): JSON query in `q`, cursor pagination via `after`.
+    """
+
+    @classmethod
+    def from_settings(cls, settings: Settings, **overrides: Any) -> "USPTOClient":
+        headers = {"X-Api-Key": settings.USPTO_API_KEY} if settings.USPTO_API_KEY else None
+        options: Dict[str, Any] = dict(
+            headers=headers,
+            rate_per_second=settings.USPTO_RATE_PER_SECOND,
+            **settings.http_client_options(),
+        )
+        options.update(overrides)
+        return cls(settings.USPTO_BASE_URL, **options)
+
+    async def patents(self, text: str, page_size: int = 100, max_pages: int | None = 10) -> AsyncIterator[Dict[str, Any]]:
+        """Streams patents whose abstract mentions `text`, oldest patent_id first."""
+        params: Dict[str, Any] = {
+            "q": json.dumps({"_text_any": {"patent_abstract": text}}),
+            "s": json.dumps([{"patent_id": "asc"}]),
+            "o": json.dumps({"size": page_size}),
+        }
+
+        def next_params(payload: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any] | None:
+            patents = payload.get("patents") or []
+            if len(patents) < page_size:
+                return None
+            options = {"size": page_size, "after": patents[-1]["patent_id"]}
+            return {**current, "o": json.dumps(options)}
+
+        async for patent in self.paginate(
+            "/patent/",
+            params,
+            items=lambda payload: payload.get("patents") or [],
+            next_params=next_params,
+            max_pages=max_pages,
+        ):
+            yield patent
@@ -0,0 +1,325 @@
+# backend/app/services/vector_index.py
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+import numpy as np
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Row assignment markers in assignments.i32
+UNASSIGNED = -1
+DELETED = -2
+
+
+class HashingEmbedder:
+    """
+    Offline, CPU-only text embedding: signed feature hashing of unigrams and bigrams,
+    L2-normalised. No model download, deterministic across processes.
+    """
+
+    def __init__(self, dim: int = 256) -> None:
+        self.dim = dim
+
+    def _features(self, text: str) -> Iterable[str]:
+        tokens = _TOKEN.findall(text.lower())
+        yield from tokens
+        for a, b in zip(tokens, tokens[1:]):
+            yield f"{a} {b}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+                out[row, digest % self.dim] += 1.0 if (digest >> 63) else -1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+
+@dataclass
+class Hit:
+    id: str
+    score: float
+    text: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class VectorIndex:
+    """
+    On-disk passage index for knowledge retrieval, fully offline.
+
+    - vectors.f32: memory-mapped float32 matrix, grown in place as passages are upserted
+    - assignments.i32: memory-mapped IVF list id per row (or UNASSIGNED / DELETED)
+    - centroids.npy: IVF coarse quantiser, trained with spherical k-means once the corpus is
+      big enough; until then search is an exact (chunked) scan
+    - passages.sqlite: id, text and metadata per row
+
+    Searches probe the `nprobe` closest lists and score only their rows, so query cost grows
+    with list size rather than corpus size. New passages are assigned to their nearest list on
+    upsert; call train() again after large shifts in the corpus.
+    """
+
+    GROWTH = 2.0
+    # Rows upserted since the last list rebuild are searched from a side buffer up to this size
+    PENDING_LIMIT = 65_536
+
+    def __init__(
+        self,
+        path: str | Path,
+        dim: int = 256,
+        embedder: HashingEmbedder | None = None,
+        initial_capacity: int = 4096,
+        train_threshold: int = 50_000,
+    ) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.embedder = embedder or HashingEmbedder(dim)
+        self.train_threshold = train_threshold
+        self._lock = threading.RLock()
+
+        manifest_path = self.path / "manifest.json"
+        if manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text())
+            self.dim, self.count, self.capacity = manifest["dim"], manifest["count"], manifest["capacity"]
+        else:
+            self.dim, self.count, self.capacity = dim, 0, initial_capacity
+        if self.dim != self.embedder.dim:
+            raise ValueError(f"Index dim {self.dim} does not match embedder dim {self.embedder.dim}")
+
+        self._open_arrays(create=not manifest_path.exists())
+
+        self._db = sqlite3.connect(self.path / "passages.sqlite", check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS passages "
+            "(row INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, text TEXT, metadata TEXT)"
+        )
+
+        centroids_path = self.path / "centroids.npy"
+        self._centroids: np.ndarray | None = np.load(centroids_path) if centroids_path.exists() else None
+        self._lists: List[np.ndarray] = []
+        self._pending: List[int] = []
+        self._rebuild_lists()
+
+    # storage ---------------------------------------------------------------
+
+    def _open_arrays(self, create: bool) -> None:
+        mode = "w+" if create else "r+"
+        self._vectors = np.memmap(
+            self.path / "vectors.f32", dtype=np.float32, mode=mode, shape=(self.capacity, self.dim)
+        )
+        self._assign = np.memmap(
+            self.path / "assignments.i32", dtype=np.int32, mode=mode, shape=(self.capacity,)
+        )
+        if create:
+            self._assign[:] = UNASSIGNED
+
+    def _grow(self, needed: int) -> None:
+        new_capacity = self.capacity
+        while new_capacity < needed:
+            new_capacity = int(new_capacity * self.GROWTH)
+        self._vectors.flush()
+        self._assign.flush()
+        del self._vectors, self._assign
+        with open(self.path / "vectors.f32", "r+b") as fh:
+            fh.truncate(new_capacity * self.dim * 4)
+        with open(self.path / "assignments.i32", "r+b") as fh:
+            fh.truncate(new_capacity * 4)
+        old_capacity, self.capacity = self.capacity, new_capacity
+        self._open_arrays(create=False)
+        self._assign[old_capacity:] = UNASSIGNED
+
+    def _rebuild_lists(self) -> None:
+        self._pending = []
+        if self._centroids is None:
+            self._lists = []
+            return
+        assign = np.asarray(self._assign[: self.count])
+        order = np.argsort(assign, kind="stable")
+        bounds = np.searchsorted(assign[order], np.arange(len(self._centroids) + 1))
+        self._lists = [order[bounds[i]: bounds[i + 1]] for i in range(len(self._centroids))]
+
+    def flush(self) -> None:
+        with self._lock:
+            self._vectors.flush()
+            self._assign.flush()
+            self._db.commit()
+            if self._centroids is not None:
+                np.save(self.path / "centroids.npy", self._centroids)
+            (self.path / "manifest.json").write_text(
+                json.dumps({"dim": self.dim, "count": self.count, "capacity": self.capacity})
+            )
+
+    def close(self) -> None:
+        self.flush()
+        self._db.close()
+
+    # writes ----------------------------------------------------------------
+
+    def upsert(self, passages: Iterable[Tuple[str, str, Dict[str, Any]]], batch_size: int = 1024) -> int:
+        """Adds or replaces (id, text, metadata) passages. Returns how many were written."""
+        written = 0
+        batch: List[Tuple[str, str, Dict[str, Any]]] = []
+        for passage in passages:
+            batch.append(passage)
+            if len(batch) >= batch_size:
+                written += self._upsert_batch(batch)
+                batch = []
+        if batch:
+            written += self._upsert_batch(batch)
+
+        if self._centroids is None and self.count >= self.train_threshold:
+            self.train()
+        self.flush()
+        return written
+
+    def _upsert_batch(self, batch: List[Tuple[str, str, Dict[str, Any]]]) -> int:
+        vectors = self.embedder.embed([text for _, text, _ in batch])
+        with self._lock:
+            rows: List[int] = []
+            for passage_id, text, metadata in batch:
+                existing = self._db.execute("SELECT row FROM passages WHERE id = ?", (passage_id,)).fetchone()
+                if existing is not None:
+                    row = existing[0]
+                else:
+                    if self.count + 1 > self.capacity:
+                        self._grow(self.count + 1)
+                    row = self.count
+                    self.count += 1
+                self._db.execute(
+                    "INSERT OR REPLACE INTO passages (row, id, text, metadata) VALUES (?, ?, ?, ?)",
+                    (row, passage_id, text, json.dumps(metadata)),
+                )
+                rows.append(row)
+
+            row_index = np.asarray(rows)
+            self._vectors[row_index] = vectors
+            if self._centroids is not None:
+                lists = np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+                self._assign[row_index] = lists
+                self._pending.extend(rows)
+                if len(self._pending) > self.PENDING_LIMIT:
+                    self._rebuild_lists()
+        return len(batch)
+
+    def delete(self, ids: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for passage_id in ids:
+                found = self._db.execute("SELECT row FROM passages WHERE id = ?", (passage_id,)).fetchone()
+                if found is None:
+                    continue
+                self._assign[found[0]] = DELETED
+                self._db.execute("DELETE FROM passages WHERE row = ?", (found[0],))
+                removed += 1
+        self.flush()
+        return removed
+
+    def train(self, nlist: int | None = None, sample_size: int = 100_000, iterations: int = 10, seed: int = 0) -> None:
+        """(Re)trains the IVF quantiser with spherical k-means and reassigns every live row."""
+        with self._lock:
+            live = np.flatnonzero(np.asarray(self._assign[: self.count]) != DELETED)
+            if len(live) == 0:
+                return
+            nlist = nlist or max(1, int(np.sqrt(len(live))))
+            rng = np.random.default_rng(seed)
+            sample = np.asarray(self._vectors[rng.choice(live, size=min(sample_size, len(live)), replace=False)])
+            centroids = sample[rng.choice(len(sample), size=min(nlist, len(sample)), replace=False)].copy()
+
+            for _ in range(iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                for c in range(len(centroids)):
+                    members = sample[labels == c]
+                    if len(members):
+                        centroids[c] = members.sum(axis=0)
+                norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+                np.divide(centroids, norms, out=centroids, where=norms > 0)
+
+            for start in range(0, len(live), 65_536):
+                rows = live[start: start + 65_536]
+                self._assign[rows] = np.argmax(np.asarray(self._vectors[rows]) @ centroids.T, axis=1)
+            self._centroids = centroids.astype(np.float32)
+            self._rebuild_lists()
+        self.flush()
+
+    # reads -----------------------------------------------------------------
+
+    def search(self, query: str, k: int = 10, nprobe: int = 8) -> List[Hit]:
+        q = self.embedder.embed([query])[0]
+        with self._lock:
+            if self._centroids is None:
+                scores, rows = self._scan(q, k)
+            else:
+                probes = np.argsort(-(self._centroids @ q))[:nprobe]
+                parts = [self._lists[p] for p in probes]
+                if self._pending:
+                    pending = np.asarray(self._pending)
+                    parts.append(pending[np.isin(np.asarray(self._assign[pending]), probes)])
+                candidates = np.unique(np.concatenate(parts))
+                # Rows re-upserted into another list since the last rebuild drop out here
+                candidates = candidates[np.isin(np.asarray(self._assign[candidates]), probes)]
+                scores = np.asarray(self._vectors[candidates]) @ q
+                rows = candidates
+            if len(rows) == 0:
+                return []
+            top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return self._hits(rows[top], scores[top])
+
+    def _scan(self, q: np.ndarray, k: int, chunk: int = 262_144) -> Tuple[np.ndarray, np.ndarray]:
+        best_scores = np.empty(0, dtype=np.float32)
+        best_rows = np.empty(0, dtype=np.int64)
+        for start in range(0, self.count, chunk):
+            stop = min(self.count, start + chunk)
+            scores = np.asarray(self._vectors[start:stop]) @ q
+            scores[np.asarray(self._assign[start:stop]) == DELETED] = -np.inf
+            best_scores = np.concatenate([best_scores, scores])
+            best_rows = np.concatenate([best_rows, np.arange(start, stop)])
+            if len(best_scores) > k:
+                keep = np.argpartition(-best_scores, k - 1)[:k]
+                best_scores, best_rows = best_scores[keep], best_rows[keep]
+        live = np.isfinite(best_scores)
+        return best_scores[live], best_rows[live]
+
+    def _hits(self, rows: np.ndarray, scores: np.ndarray) -> List[Hit]:
+        placeholders = ",".join("?" * len(rows))
+        found = {
+            row: (pid, text, metadata)
+            for row, pid, text, metadata in self._db.execute(
+                f"SELECT row, id, text, metadata FROM passages WHERE row IN ({placeholders})",
+                [int(r) for r in rows],
+            )
+        }
+        hits: List[Hit] = []
+        for row, score in zip(rows.tolist(), scores.tolist()):
+            if row in found:
+                pid, text, metadata = found[row]
+                hits.append(Hit(id=pid, score=float(score), text=text, metadata=json.loads(metadata or "{}")))
+        return hits
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM passages").fetchone()[0]
+
+
+def load_jsonl(path: str | Path) -> Iterable[Tuple[str, str, Dict[str, Any]]]:
+    """Reads {"id", "text", ...metadata} lines, e.g. exported dossiers or cached literature."""
+    with open(path) as fh:
+        for line in fh:
+            if line.strip():
+                record = json.loads(line)
+                passage_id, text = str(record.pop("id")), record.pop("text")
+                yield passage_id, text, record
+
+
+def weighted_mean(hits: Sequence[Hit], key: str) -> float | None:
+    """Similarity-weighted mean of a numeric metadata field over the hits that carry it."""
+    pairs = [(max(h.score, 0.0), float(h.metadata[key])) for h in hits if key in h.metadata]
+    total = sum(weight for weight, _ in pairs)
+    if not pairs or total == 0:
+        return None
+    return sum(weight * value for weight, value in pairs) / total
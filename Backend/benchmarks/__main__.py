@@ -0,0 +1,70 @@
+# backend/benchmarks/__main__.py
+"""
+Benchmark the analysis pipeline with synthetic agents.
+
+    cd Backend
+    python -m benchmarks --out benchmarks/results/$(git rev-parse --short HEAD).json
+    python -m benchmarks --compare benchmarks/results/<baseline>.json
+
+Exits with status 1 when --compare finds a regression above --threshold.
+"""
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from .harness import compare, save_results
+from .scenarios import run
+
+SCENARIOS = ("pipeline", "grading", "report", "serialization", "prescreen", "techno_economic", "http", "cluster")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="synthetic agent latency")
+    parser.add_argument("--jitter-ms", type=float, default=5.0, help="extra uniform random latency")
+    parser.add_argument("--payload-items", type=int, default=50, help="records per agent raw_data")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--memory", action="store_true", help="track peak allocations (slower)")
+    parser.add_argument("--out", type=Path, help="write results JSON here")
+    parser.add_argument("--compare", type=Path, help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed regression fraction")
+    args = parser.parse_args(argv)
+
+    results = run(
+        scenarios=args.scenarios,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        payload_items=args.payload_items,
+        iterations=args.iterations,
+        concurrency=args.concurrency,
+        trace_memory=args.memory,
+    )
+
+    for r in results:
+        memory = f" peak={r.peak_memory_kb:.0f}KiB" if r.peak_memory_kb is not None else ""
+        print(
+            f"{r.name:<24} {r.throughput_per_second:>10.1f}/s  "
+            f"p50={r.latency_ms['p50']:.3f}ms p95={r.latency_ms['p95']:.3f}ms "
+            f"p99={r.latency_ms['p99']:.3f}ms errors={r.errors}{memory}"
+        )
+
+    document = save_results(results, args.out) if args.out else {
+        "results": [asdict(r) for r in results]
+    }
+
+    if args.compare:
+        regressions = compare(json.loads(args.compare.read_text()), document, threshold=args.threshold)
+        for reg in regressions:
+            print(
+                f"REGRESSION {reg['name']}: p95 {reg['p95_ms'][0]:.3f} -> {reg['p95_ms'][1]:.3f}ms, "
+                f"throughput {reg['throughput_per_second'][0]:.1f} -> {reg['throughput_per_second'][1]:.1f}/s"
+            )
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+# backend/benchmarks/harness.py
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+
+@dataclass
+class BenchResult:
+    """Outcome of one benchmark scenario. Latencies are in milliseconds."""
+    name: str
+    iterations: int
+    concurrency: int
+    total_seconds: float
+    throughput_per_second: float
+    latency_ms: Dict[str, float]
+    peak_memory_kb: float | None = None
+    errors: int = 0
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    values = sorted(latencies)
+    return {
+        "mean": statistics.fmean(values) if values else 0.0,
+        "p50": _percentile(values, 50),
+        "p90": _percentile(values, 90),
+        "p95": _percentile(values, 95),
+        "p99": _percentile(values, 99),
+        "max": values[-1] if values else 0.0,
+    }
+
+
+async def measure_async(
+    name: str,
+    fn: Callable[[], Awaitable[Any]],
+    iterations: int = 200,
+    concurrency: int = 1,
+    warmup: int = 10,
+    trace_memory: bool = False,
+    params: Dict[str, Any] | None = None,
+) -> BenchResult:
+    """Runs `fn` `iterations` times with up to `concurrency` calls in flight."""
+    for _ in range(warmup):
+        await fn()
+
+    latencies: List[float] = []
+    errors = 0
+    remaining = iterations
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                await fn()
+            except Exception:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    total = time.perf_counter() - started
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+
+    return BenchResult(
+        name=name,
+        iterations=iterations,
+        concurrency=concurrency,
+        total_seconds=total,
+        throughput_per_second=iterations / total if total else 0.0,
+        latency_ms=summarize(latencies),
+        peak_memory_kb=peak,
+        errors=errors,
+        params=params or {},
+    )
+
+
+def measure_sync(
+    name: str,
+    fn: Callable[[], Any],
+    iterations: int = 1000,
+    warmup: int = 50,
+    trace_memory: bool = False,
+    params: Dict[str, Any] | None = None,
+) -> BenchResult:
+    for _ in range(warmup):
+        fn()
+
+    latencies: List[float] = []
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    total = time.perf_counter() - started
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+
+    return BenchResult(
+        name=name,
+        iterations=iterations,
+        concurrency=1,
+        total_seconds=total,
+        throughput_per_second=iterations / total if total else 0.0,
+        latency_ms=summarize(latencies),
+        peak_memory_kb=peak,
+        params=params or {},
+    )
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(results: List[BenchResult], path: Path) -> Dict[str, Any]:
+    document = {
+        "commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": [asdict(r) for r in results],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2))
+    return document
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    metric: str = "p95",
+    threshold: float = 0.10,
+) -> List[Dict[str, Any]]:
+    """
+    Scenarios whose `metric` latency grew by more than `threshold` (fraction) versus baseline,
+    or whose throughput dropped by more than `threshold`.
+    """
+    previous = {r["name"]: r for r in baseline["results"]}
+    regressions: List[Dict[str, Any]] = []
+    for result in current["results"]:
+        before = previous.get(result["name"])
+        if before is None:
+            continue
+        old_latency, new_latency = before["latency_ms"][metric], result["latency_ms"][metric]
+        old_tput, new_tput = before["throughput_per_second"], result["throughput_per_second"]
+        latency_change = (new_latency - old_latency) / old_latency if old_latency else 0.0
+        tput_change = (new_tput - old_tput) / old_tput if old_tput else 0.0
+        if latency_change > threshold or tput_change < -threshold:
+            regressions.append(
+                {
+                    "name": result["name"],
+                    f"{metric}_ms": (old_latency, new_latency),
+                    "throughput_per_second": (old_tput, new_tput),
+                    "latency_change": latency_change,
+                    "throughput_change": tput_change,
+                }
+            )
+    return regressions
@@ -0,0 +1,244 @@
+# backend/benchmarks/scenarios.py
+import asyncio
+import time
+from typing import List
+from app.agents.grading import GradingAgent
+from app.agents.master import MasterAgent
+from app.agents.production.techno_economic_engine import TechnoEconomicEngine
+from app.agents.report_generator import ReportGeneratorAgent
+from app.schemas.analysis import AnalysisRequest
+from .harness import BenchResult, measure_async, measure_sync, summarize
+from .synthetic import synthetic_agents
+
+REQUEST = AnalysisRequest(
+    query="Generic opportunity screen",
+    molecule_name="Metformin",
+    target_indication="Type 2 diabetes",
+)
+
+
+async def bench_pipeline(
+    latency_ms: float, jitter_ms: float, payload_items: int, iterations: int, concurrency: int,
+    trace_memory: bool,
+) -> BenchResult:
+    master = MasterAgent(agents=synthetic_agents(latency_ms, jitter_ms, payload_items))
+    return await measure_async(
+        "master.run_pipeline",
+        lambda: master.run_pipeline(REQUEST),
+        iterations=iterations,
+        concurrency=concurrency,
+        trace_memory=trace_memory,
+        params={"latency_ms": latency_ms, "jitter_ms": jitter_ms, "payload_items": payload_items},
+    )
+
+
+async def _sample_results(payload_items: int):
+    master = MasterAgent(agents=synthetic_agents(0, 0, payload_items))
+    outcomes = await master._run_agents_parallel(REQUEST)
+    return master._collect(outcomes)[0]
+
+
+async def bench_grading(payload_items: int, iterations: int, trace_memory: bool) -> BenchResult:
+    results = await _sample_results(payload_items)
+    grading = GradingAgent()
+    return measure_sync(
+        "grading.grade",
+        lambda: grading.grade(results),
+        iterations=iterations,
+        trace_memory=trace_memory,
+        params={"payload_items": payload_items},
+    )
+
+
+async def bench_report(payload_items: int, iterations: int, trace_memory: bool) -> BenchResult:
+    results = await _sample_results(payload_items)
+    grading = GradingAgent().grade(results)
+    generator = ReportGeneratorAgent()
+    return measure_sync(
+        "report.generate_report",
+        lambda: generator.generate_report(request=REQUEST, grading=grading, results=results),
+        iterations=iterations,
+        trace_memory=trace_memory,
+        params={"payload_items": payload_items},
+    )
+
+
+async def bench_serialization(payload_items: int, iterations: int, trace_memory: bool) -> BenchResult:
+    from app.core.serialization import model_response
+
+    master = MasterAgent(agents=synthetic_agents(0, 0, payload_items))
+    response = await master.run_pipeline(REQUEST)
+    return measure_sync(
+        "response.serialize",
+        lambda: model_response(response),
+        iterations=iterations,
+        trace_memory=trace_memory,
+        params={"payload_items": payload_items},
+    )
+
+
+async def bench_prescreen(iterations: int, trace_memory: bool) -> BenchResult:
+    """Pre-screen of 1,000 untested candidates against 10,000 indexed molecules."""
+    from app.services.portfolio_index import PortfolioIndex
+
+    index = PortfolioIndex()
+    for i in range(10_000):
+        grading = {"market_demand": 0.5, "production_feasibility": 0.5, "demographics": 0.5,
+                   "patents_and_trials": 0.5, "competition": 0.5, "overall_score": (i % 100) / 100}
+        index.upsert(f"run-{i}", f"molecule{i}", f"indication {i % 40}", grading, {})
+    candidates = [(f"candidate{i}", f"indication {i % 40}") for i in range(1000)]
+    return measure_sync(
+        "portfolio.prescreen",
+        lambda: index.prescreen(candidates),
+        iterations=iterations,
+        trace_memory=trace_memory,
+        params={"indexed": 10_000, "candidates": 1000},
+    )
+
+
+async def bench_techno_economic(iterations: int, trace_memory: bool) -> BenchResult:
+    engine = TechnoEconomicEngine()
+    return measure_sync(
+        "techno_economic.simulate",
+        lambda: engine.simulate(100_000, seed=0),
+        iterations=iterations,
+        trace_memory=trace_memory,
+        params={"scenarios": 100_000},
+    )
+
+
+async def bench_http(
+    latency_ms: float, jitter_ms: float, payload_items: int, iterations: int, concurrency: int,
+    trace_memory: bool,
+) -> BenchResult:
+    """Full POST /analysis/analyze path in-process (ASGI transport, no sockets)."""
+    import httpx
+    from fastapi import FastAPI
+    from app.api.V1.router import api_router
+    from app.db.run_store import InMemoryRunStore
+    from app.services.idempotency import RequestDeduplicator
+
+    app = FastAPI()
+    app.include_router(api_router, prefix="/api/v1")
+    app.state.master_agent = MasterAgent(agents=synthetic_agents(latency_ms, jitter_ms, payload_items))
+    app.state.run_store = InMemoryRunStore(retention_seconds=60)
+    # No replay window: concurrent identical calls still share a run, later ones run again
+    app.state.request_deduplicator = RequestDeduplicator(replay_seconds=0)
+    # Measures the pipeline path, not shedding
+    app.state.admission = None
+
+    body = REQUEST.model_dump()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def call() -> None:
+            response = await client.post("/api/v1/analysis/analyze", json=body)
+            response.raise_for_status()
+
+        return await measure_async(
+            "http.analyze",
+            call,
+            iterations=iterations,
+            concurrency=concurrency,
+            trace_memory=trace_memory,
+            params={"latency_ms": latency_ms, "jitter_ms": jitter_ms, "payload_items": payload_items},
+        )
+
+
+async def bench_cluster(
+    latency_ms: float, jitter_ms: float, payload_items: int, iterations: int, nodes: int,
+    workers_per_node: int = 4,
+) -> BenchResult:
+    """
+    Job-mode throughput of `nodes` workers sharing one coordination backend (LocalRedis) and one
+    run store. Every run is submitted to node 0; the others only get work by stealing it.
+    """
+    from app.db.run_store import InMemoryRunStore, RunStore
+    from app.services.coordination import Coordinator
+    from app.services.jobs import JobRunner
+    from app.services.local_redis import LocalRedis
+
+    client, store = LocalRedis(), InMemoryRunStore(retention_seconds=600)
+    coordinators = [Coordinator(client, worker_id=f"node-{i}", steal_interval=0.01) for i in range(nodes)]
+    runners = []
+    for coordinator in coordinators:
+        await coordinator.start()
+        master = MasterAgent(agents=synthetic_agents(latency_ms, jitter_ms, payload_items))
+        runners.append(
+            JobRunner(master, store, workers=workers_per_node, report_workers=workers_per_node,
+                      max_queue_size=iterations, coordinator=coordinator)
+        )
+    for runner in runners:
+        await runner.start()
+
+    started = time.perf_counter()
+    submitted = [
+        await runners[0].submit(
+            AnalysisRequest(query=REQUEST.query, molecule_name=f"molecule-{i}", target_indication=REQUEST.target_indication)
+        )
+        for i in range(iterations)
+    ]
+    finished = {}
+    while len(finished) < len(submitted):
+        await asyncio.sleep(0.005)
+        for run in submitted:
+            if run.run_id not in finished:
+                stored = await store.get(run.run_id)
+                if stored.status in RunStore.TERMINAL_STATUSES:
+                    finished[run.run_id] = stored
+    total = time.perf_counter() - started
+
+    for runner in runners:
+        await runner.stop()
+    for coordinator in coordinators:
+        await coordinator.close()
+    latencies = [(run.updated_at - run.created_at).total_seconds() * 1000 for run in finished.values()]
+    return BenchResult(
+        name=f"jobs.cluster[nodes={nodes}]",
+        iterations=iterations,
+        concurrency=nodes * workers_per_node,
+        total_seconds=total,
+        throughput_per_second=iterations / total if total else 0.0,
+        latency_ms=summarize(latencies),
+        errors=sum(run.status == "FAILED" for run in finished.values()),
+        params={"latency_ms": latency_ms, "jitter_ms": jitter_ms, "payload_items": payload_items,
+                "nodes": nodes, "workers_per_node": workers_per_node},
+    )
+
+
+async def run_all(
+    scenarios: List[str],
+    latency_ms: float,
+    jitter_ms: float,
+    payload_items: int,
+    iterations: int,
+    concurrency: int,
+    trace_memory: bool,
+) -> List[BenchResult]:
+    results: List[BenchResult] = []
+    if "pipeline" in scenarios:
+        results.append(
+            await bench_pipeline(latency_ms, jitter_ms, payload_items, iterations, concurrency, trace_memory)
+        )
+    if "grading" in scenarios:
+        results.append(await bench_grading(payload_items, iterations * 10, trace_memory))
+    if "report" in scenarios:
+        results.append(await bench_report(payload_items, iterations * 10, trace_memory))
+    if "serialization" in scenarios:
+        results.append(await bench_serialization(payload_items, iterations * 10, trace_memory))
+    if "prescreen" in scenarios:
+        results.append(await bench_prescreen(max(1, iterations // 10), trace_memory))
+    if "techno_economic" in scenarios:
+        results.append(await bench_techno_economic(max(1, iterations // 10), trace_memory))
+    if "http" in scenarios:
+        results.append(
+            await bench_http(latency_ms, jitter_ms, payload_items, iterations, concurrency, trace_memory)
+        )
+    if "cluster" in scenarios:
+        # Agents ten times slower than the pipeline scenario, so waiting on them (not this
+        # process's CPU) bounds a node, as it does for real upstream calls
+        for nodes in (1, 2, 4):
+            results.append(await bench_cluster(latency_ms * 10, jitter_ms, payload_items, iterations, nodes))
+    return results
+
+
+def run(**kwargs) -> List[BenchResult]:
+    return asyncio.run(run_all(**kwargs))
@@ -0,0 +1,70 @@
+# backend/benchmarks/synthetic.py
+import asyncio
+import random
+from typing import Any, Dict, List
+from app.agents.base import BaseAgent
+from app.agents.grading import DIMENSION_SOURCES
+from app.schemas.analysis import AnalysisRequest, AgentResult
+
+
+class SyntheticAgent(BaseAgent):
+    """
+    Stand-in for a real domain agent with controllable cost.
+
+    latency_ms / jitter_ms set how long run() awaits, payload_items how many extra records
+    go into raw_data (to exercise validation and serialization), failure_rate how often it raises.
+    When impersonating a registered agent name, it emits that agent's score keys so grading
+    has real work to do.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        latency_ms: float = 5.0,
+        jitter_ms: float = 0.0,
+        payload_items: int = 0,
+        failure_rate: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__(name=name)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.payload_items = payload_items
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        # Benchmarks measure the pipeline, not the result cache
+        self.cache_ttl = 0
+
+    async def run(self, request: AnalysisRequest) -> AgentResult:
+        delay = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if self._rng.random() < self.failure_rate:
+            raise RuntimeError(f"{self.name} synthetic failure")
+
+        data: Dict[str, Any] = {}
+        source = DIMENSION_SOURCES.get(self.name)
+        if source is not None:
+            for key in source.score_keys:
+                data[key] = self._rng.random()
+        if self.payload_items:
+            data["series"] = [
+                {"period": i, "value": self._rng.random(), "label": f"item-{i}"}
+                for i in range(self.payload_items)
+            ]
+        return self._result(summary=f"Synthetic output of {self.name}.", raw_data=data)
+
+
+def synthetic_agents(
+    latency_ms: float = 5.0,
+    jitter_ms: float = 0.0,
+    payload_items: int = 0,
+    failure_rate: float = 0.0,
+    seed: int = 0,
+) -> List[SyntheticAgent]:
+    """One synthetic agent per built-in agent name (plus the two knowledge agents)."""
+    names = list(DIMENSION_SOURCES) + ["WebIntelligenceAgent", "InternalKnowledgeAgent"]
+    return [
+        SyntheticAgent(name, latency_ms, jitter_ms, payload_items, failure_rate, seed=seed + i)
+        for i, name in enumerate(names)
+    ]
@@ -0,0 +1,12 @@
+# backend/tests/conftest.py
+import sys
+from pathlib import Path
+import pytest
+
+# Lets `pytest` run from the repository root as well as from Backend/
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
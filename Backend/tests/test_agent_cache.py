@@ -0,0 +1,145 @@
+# backend/tests/test_agent_cache.py
+import asyncio
+import pytest
+from app.agents.base import BaseAgent
+from app.agents.cache import AgentResultCache
+from app.agents.master import MasterAgent
+from app.schemas.analysis import AgentResult, AnalysisRequest
+from app.services.local_redis import LocalRedis
+
+pytestmark = pytest.mark.anyio
+
+REQUEST = AnalysisRequest(query="screen", molecule_name="Metformin", target_indication="Type 2 diabetes")
+
+
+class VersionedAgent(BaseAgent):
+    """Returns the data version it read, so stale results are visible."""
+
+    cache_ttl = 3600
+
+    def __init__(self) -> None:
+        super().__init__("VersionedAgent")
+        self.version = "1"
+        self.calls = 0
+
+    async def data_version(self) -> str:
+        return self.version
+
+    async def run(self, request: AnalysisRequest) -> AgentResult:
+        self.calls += 1
+        return self._result("versioned", {"v": self.version})
+
+
+async def test_data_version_bump_misses_the_cache():
+    agent, cache = VersionedAgent(), AgentResultCache()
+    first = await cache.get_or_compute(agent, REQUEST)
+    assert await cache.get_or_compute(agent, REQUEST) is first
+    agent.version = "2"
+    second = await cache.get_or_compute(agent, REQUEST)
+    assert second.raw_data == {"v": "2"}
+    assert second.input_fingerprint == await agent.fingerprint(REQUEST) != first.input_fingerprint
+    assert agent.calls == 2
+
+
+async def test_shared_tier_never_serves_old_version_under_new_fingerprint():
+    redis = LocalRedis()
+    agent = VersionedAgent()
+    other_worker = AgentResultCache(redis_client=redis)
+    await other_worker.get_or_compute(agent, REQUEST)
+
+    cache = AgentResultCache(redis_client=redis)
+    master = MasterAgent(agents=[agent], cache=cache)
+    previous = await master.run_pipeline(REQUEST)
+    assert previous.results[0].raw_data == {"v": "1"} and agent.calls == 1
+
+    agent.version = "2"
+    refreshed = await master.refresh_pipeline(previous, REQUEST)
+    result = refreshed.results[0]
+    assert result.raw_data == {"v": "2"}
+    assert result.input_fingerprint == await agent.fingerprint(REQUEST)
+    assert refreshed.reused_agents == []
+    # The worker that cached v1 sees v2 from the shared tier, not its old entry
+    assert (await other_worker.get_or_compute(agent, REQUEST)).raw_data == {"v": "2"}
+    assert agent.calls == 2
+
+
+async def test_discard_removes_shared_entries():
+    redis = LocalRedis()
+    agent, cache = VersionedAgent(), AgentResultCache(redis_client=redis)
+    await cache.get_or_compute(agent, REQUEST)
+    await cache.discard(agent, REQUEST)
+    await AgentResultCache(redis_client=redis).get_or_compute(agent, REQUEST)
+    assert agent.calls == 2
+
+
+class SlowAgent(BaseAgent):
+    """Counts runs; each takes a moment so concurrent misses overlap."""
+
+    def __init__(self, cache_ttl: float = 3600) -> None:
+        super().__init__("SlowAgent")
+        self.cache_ttl = cache_ttl
+        self.calls = 0
+
+    async def run(self, request: AnalysisRequest) -> AgentResult:
+        self.calls += 1
+        await asyncio.sleep(0.02)
+        return self._result("slow", {"call": self.calls})
+
+
+def _request(molecule: str) -> AnalysisRequest:
+    return AnalysisRequest(query="screen", molecule_name=molecule, target_indication="Type 2 diabetes")
+
+
+async def test_concurrent_misses_share_one_run():
+    agent, cache = SlowAgent(), AgentResultCache()
+    results = await asyncio.gather(*(cache.get_or_compute(agent, REQUEST) for _ in range(5)))
+    assert agent.calls == 1 and all(result is results[0] for result in results)
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert await cache.get_or_compute(agent, REQUEST) is results[0]
+    assert cache.hits == 1 and not cache._in_flight
+
+
+async def test_shared_run_outlives_a_cancelled_caller():
+    agent, cache = SlowAgent(), AgentResultCache()
+    leaving = asyncio.create_task(cache.get_or_compute(agent, REQUEST))
+    staying = asyncio.create_task(cache.get_or_compute(agent, REQUEST))
+    await asyncio.sleep(0)
+    leaving.cancel()
+    assert (await staying).raw_data == {"call": 1}
+
+    # Once every caller has gone the run is abandoned, and the next call starts afresh
+    alone = asyncio.create_task(cache.get_or_compute(agent, _request("Sitagliptin")))
+    await asyncio.sleep(0.005)
+    alone.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await alone
+    await asyncio.sleep(0)
+    assert not cache._in_flight
+    assert (await cache.get_or_compute(agent, _request("Sitagliptin"))).raw_data == {"call": 3}
+
+
+async def test_lru_evicts_the_least_recently_used_entry():
+    agent, cache = SlowAgent(), AgentResultCache(max_entries=2)
+    first = await cache.get_or_compute(agent, _request("Metformin"))
+    await cache.get_or_compute(agent, _request("Sitagliptin"))
+    assert await cache.get_or_compute(agent, _request("Metformin")) is first  # now most recent
+    await cache.get_or_compute(agent, _request("Ibuprofen"))  # evicts Sitagliptin
+    assert len(cache._entries) == 2 and agent.calls == 3
+    assert await cache.get_or_compute(agent, _request("Metformin")) is first
+    await cache.get_or_compute(agent, _request("Sitagliptin"))
+    assert agent.calls == 4
+
+
+async def test_entries_expire_after_the_agent_ttl():
+    agent, cache = SlowAgent(cache_ttl=0.1), AgentResultCache(default_ttl=3600)
+    first = await cache.get_or_compute(agent, REQUEST)
+    assert await cache.get_or_compute(agent, REQUEST) is first
+    await asyncio.sleep(0.1)
+    assert (await cache.get_or_compute(agent, REQUEST)).raw_data == {"call": 2}
+    assert cache.ttl_for(SlowAgent(cache_ttl=None)) == 3600
+
+    # A zero TTL bypasses the cache entirely
+    uncached = SlowAgent(cache_ttl=0)
+    await cache.get_or_compute(uncached, REQUEST)
+    await cache.get_or_compute(uncached, REQUEST)
+    assert uncached.calls == 2 and len(cache._entries) == 1
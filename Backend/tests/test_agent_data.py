@@ -0,0 +1,30 @@
+# backend/tests/test_agent_data.py
+import pickle
+from app.schemas.agent_data import ClinicalTrialData, payload_field, payload_items
+from app.schemas.analysis import AgentResult
+
+TRIALS = ClinicalTrialData(
+    ongoing_trials_count=3,
+    indication_expansion_potential_score=0.6,
+    safety_signal_risk_score=0.2,
+    patents_and_trials_score=0.7,
+)
+
+
+def test_typed_payload_round_trips_through_json_and_pickle():
+    result = AgentResult.model_construct(agent_name="ClinicalTrialAgent", summary="s", raw_data=TRIALS)
+    decoded = AgentResult.model_validate_json(result.model_dump_json())
+    assert decoded.raw_data == TRIALS
+    assert result.model_dump()["raw_data"]["kind"] == "clinical_trial"
+    assert pickle.loads(pickle.dumps(result)).raw_data == TRIALS
+
+
+def test_untagged_and_plugin_payloads():
+    stored = {k: v for k, v in payload_items(TRIALS)}
+    # Stored before payloads were tagged: typed by agent name
+    assert AgentResult(agent_name="ClinicalTrialAgent", summary="s", raw_data=stored).raw_data == TRIALS
+    # Plugin agents (and payloads that do not fit their type) stay plain dicts
+    plugin = AgentResult(agent_name="PluginAgent", summary="s", raw_data={"score": 0.4})
+    assert plugin.raw_data == {"score": 0.4}
+    assert payload_field(plugin.raw_data, "score") == 0.4
+    assert payload_field(TRIALS, "ongoing_trials_count") == 3
@@ -0,0 +1,101 @@
+# backend/tests/test_agents.py
+from abc import abstractmethod
+import pytest
+from app.agents.base import BaseAgent
+from app.agents.registry import DEFAULT_AGENTS, build_default_registry
+from app.core.config import Settings
+from app.knowledge.internal_knowledge import InternalKnowledgeAgent
+from app.schemas.analysis import AnalysisRequest
+from app.services.compute import ComputePools
+from app.services.vector_index import VectorIndex
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_default_registry_starts_every_builtin_agent():
+    registry = build_default_registry(Settings(AGENT_ENTRY_POINT_GROUP=None))
+    await registry.startup()
+    try:
+        assert registry.names == [path.rpartition(":")[2] for path in DEFAULT_AGENTS]
+        assert [agent.name for agent in registry.agents()] == registry.names
+    finally:
+        await registry.shutdown()
+
+
+async def test_default_agents_return_results():
+    registry = build_default_registry(Settings(AGENT_ENTRY_POINT_GROUP=None))
+    await registry.startup()
+    request = AnalysisRequest(query="screen", molecule_name="Metformin", target_indication="Type 2 diabetes")
+    try:
+        for agent in registry.agents():
+            if agent.depends_on:
+                continue
+            result = await agent.run(request)
+            assert result.agent_name == agent.name
+    finally:
+        await registry.shutdown()
+
+
+class _EmptyIndex:
+    def search(self, query, top_k, nprobe):
+        return []
+
+
+async def test_knowledge_index_search_runs_on_the_agent_pool():
+    pools = ComputePools(thread_workers=1, process_workers=1)
+    used = []
+    submit = pools.get("thread").submit
+
+    async def recording_submit(fn, *args):
+        used.append(fn.__name__)
+        return await submit(fn, *args)
+
+    pools.get("thread").submit = recording_submit
+    registry = build_default_registry(Settings(AGENT_ENTRY_POINT_GROUP=None), compute_pools=pools)
+    await registry.startup()
+    try:
+        agents = {agent.name: agent for agent in registry.agents()}
+        for name in ("InternalKnowledgeAgent", "WebIntelligenceAgent"):
+            agents[name].index = _EmptyIndex()
+            await agents[name].run(AnalysisRequest(query="screen", molecule_name="Metformin"))
+        assert used == ["search", "search"]
+    finally:
+        await registry.shutdown()
+        pools.shutdown()
+
+
+async def test_knowledge_scores_keep_a_retrieved_zero(tmp_path):
+    index = VectorIndex(tmp_path)
+    index.upsert([("d1", "Metformin screen dossier", {"capability_fit": 0.0, "therapy_area_success": 0.0})])
+    agent = InternalKnowledgeAgent()
+    agent.index = index
+    try:
+        result = await agent.run(AnalysisRequest(query="screen", molecule_name="Metformin"))
+    finally:
+        index.close()
+    assert result.raw_data.manufacturing_capability_fit_score == 0.0
+    # No hit carries a synergy score, so retrieval relevance stands in
+    assert result.raw_data.portfolio_synergy_score > 0.0
+    assert result.raw_data.historical_success_in_therapy_area is False
+
+
+def test_agents_without_a_body_fail_at_class_definition():
+    with pytest.raises(TypeError, match="must implement run"):
+        class NoBody(BaseAgent):
+            pass
+
+    with pytest.raises(TypeError, match="must implement run"):
+        class NoCompute(BaseAgent):
+            cpu_bound = "thread"
+
+    class Computed(BaseAgent):
+        cpu_bound = "thread"
+
+        def compute(self, request):
+            return self._result("computed")
+
+    class Intermediate(BaseAgent):
+        @abstractmethod
+        def describe(self) -> str: ...
+
+    assert Computed().cpu_bound == "thread" and Intermediate.__abstractmethods__ == {"describe"}
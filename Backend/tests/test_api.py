@@ -0,0 +1,183 @@
+# backend/tests/test_api.py
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import ClientDisconnect
+from app import main
+from app.api.V1.endpoints import analysis
+
+BODY = {"query": "screen", "molecule_name": "Metformin", "target_indication": "Type 2 diabetes"}
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(main.settings, "RUN_STORE_BACKEND", "memory")
+    monkeypatch.setattr(main.settings, "AGENT_PREWARM", "blocking")
+    monkeypatch.setattr(main.settings, "AGENT_ENTRY_POINT_GROUP", None)
+    monkeypatch.setattr(main.settings, "REPORT_CACHE_DIR", str(tmp_path / "reports"))
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def test_health_and_agents(client):
+    assert client.get("/health").json()["status"] == "ok"
+    agents = client.get("/api/v1/analysis/agents").json()["agents"]
+    assert "PatentLandscapeAgent" in agents and "InternalKnowledgeAgent" in agents
+
+
+def test_analyze_returns_graded_response(client):
+    response = client.post("/api/v1/analysis/analyze", json=BODY)
+    assert response.status_code == 200
+    payload = response.json()
+    assert 0.0 <= payload["grading"]["overall_score"] <= 1.0
+    assert {result["agent_name"] for result in payload["results"]} >= {"CompetitionAgent", "DemographicAgent"}
+
+
+def test_job_completes_and_serves_report(client):
+    run_id = client.post("/api/v1/analysis/jobs", json=BODY).json()["run_id"]
+    deadline = time.monotonic() + 10
+    while (status := client.get(f"/api/v1/analysis/jobs/{run_id}").json()["status"]) != "COMPLETED":
+        assert status != "FAILED" and time.monotonic() < deadline
+        time.sleep(0.05)
+    report = client.get(f"/api/v1/analysis/runs/{run_id}/report", params={"format": "md"})
+    assert report.status_code == 200 and "Metformin" in report.text
+    # Served from the file cache the first download filled
+    cached = client.get(f"/api/v1/analysis/runs/{run_id}/report", params={"format": "md"})
+    assert cached.text == report.text and "content-length" in cached.headers
+
+
+def test_batch_is_ranked_and_swept(client):
+    items = [
+        BODY,
+        {"query": "screen", "molecule_name": "Ibuprofen", "target_indication": "Pain"},
+        {"query": "screen", "molecule_name": "metformin ", "target_indication": "type 2 diabetes"},
+    ]
+    batch = client.post("/api/v1/analysis/analyze/batch", json={"items": items}).json()["items"]
+    scores = [item["response"]["grading"]["overall_score"] for item in batch]
+    assert scores == sorted(scores, reverse=True)
+    run_ids = sorted({item["response"]["run_id"] for item in batch})
+    assert len(run_ids) == 2
+
+    sweep = client.post(
+        "/api/v1/analysis/reports/portfolio/sweep", json={"run_ids": run_ids, "scenarios": 50, "seed": 7}
+    ).json()
+    assert sweep["scenarios"] == 50
+    assert [item["rank"] for item in sweep["items"]] == [0, 1]
+    for item in sweep["items"]:
+        assert item["best_rank"] <= item["median_rank"] <= item["worst_rank"]
+
+    bad = client.post(
+        "/api/v1/analysis/reports/portfolio/sweep", json={"run_ids": run_ids, "weights": [{"price": 1.0}]}
+    )
+    assert bad.status_code == 422
+
+
+def test_stream_persists_run_and_releases_admission(client):
+    with client.stream("POST", "/api/v1/analysis/analyze/stream", json=BODY) as response:
+        events = [json.loads(line) for line in response.iter_lines() if line]
+    run_id = events[0]["run_id"]
+    assert events[0]["event"] == "started" and events[-1]["event"] == "response"
+
+    assert client.get(f"/api/v1/analysis/jobs/{run_id}").json()["status"] == "COMPLETED"
+    report = client.get(f"/api/v1/analysis/runs/{run_id}/report", params={"format": "md"})
+    assert report.status_code == 200 and "Metformin" in report.text
+    # Served from the file cache the first download filled
+    cached = client.get(f"/api/v1/analysis/runs/{run_id}/report", params={"format": "md"})
+    assert cached.text == report.text and "content-length" in cached.headers
+    assert main.app.state.admission.in_flight == 0
+
+
+@pytest.mark.anyio
+async def test_stream_closes_body_when_client_disconnects():
+    closed, released = [], []
+
+    async def body():
+        try:
+            yield b"first"
+            yield b"second"
+        finally:
+            closed.append(True)
+
+    async def send(message):
+        if message.get("body"):
+            raise OSError("client went away")
+
+    response = analysis._ClosingStreamingResponse(body(), on_close=lambda: released.append(True))
+    with pytest.raises(ClientDisconnect):
+        await response({"type": "http", "asgi": {"spec_version": "2.4"}}, None, send)
+    assert closed == [True] and released == [True]
+
+
+def test_saturated_server_sheds_load_with_retry_after(client):
+    admission = main.app.state.admission
+    admission.in_flight, admission.max_queue = int(admission.limit), 0
+    try:
+        response = client.post("/api/v1/analysis/analyze", json=BODY, headers={"Cache-Control": "no-cache"})
+    finally:
+        admission.in_flight = 0
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_idempotency_key_replays_the_response(client):
+    headers = {"Idempotency-Key": "retry-1"}
+    first = client.post("/api/v1/analysis/analyze", json=BODY, headers=headers)
+    again = client.post("/api/v1/analysis/analyze", json=BODY, headers=headers)
+    assert first.status_code == again.status_code == 200
+    assert again.headers["Idempotent-Replayed"] == "true"
+    assert again.json()["run_id"] == first.json()["run_id"]
+
+    reused = client.post("/api/v1/analysis/analyze", json={**BODY, "molecule_name": "Ibuprofen"}, headers=headers)
+    assert reused.status_code == 422
+
+
+def test_cold_start_does_not_import_numpy():
+    loaded = subprocess.run(
+        [sys.executable, "-c", "import sys, app.main; print(sorted({'numpy', 'app.agents.grading_engine'} & set(sys.modules)))"],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert loaded.stdout.strip() == "[]"
+
+
+def test_portfolio_similar_and_prescreen(client):
+    client.post("/api/v1/analysis/analyze", json=BODY)
+    missing = client.get("/api/v1/analysis/portfolio/similar", params={"molecule": "Phenformin"})
+    assert missing.status_code == 404
+    similar = client.get(
+        "/api/v1/analysis/portfolio/similar",
+        params={"molecule": "Phenformin", "indication": "Type 2 diabetes", "basis": "descriptor"},
+    ).json()
+    assert similar[0]["molecule_name"] == "Metformin"
+
+    items = [{"query": "screen", "molecule_name": "Qzxwv"}, {**BODY, "molecule_name": "metformin"}]
+    screened = client.post("/api/v1/analysis/portfolio/prescreen", json={"items": items}).json()
+    assert screened["indexed_molecules"] >= 1
+    analysed, unknown = screened["items"]
+    assert (analysed["index"], analysed["analysed"], analysed["confidence"]) == (1, True, 1.0)
+    assert (unknown["index"], unknown["estimated_grading"]) == (0, None)
+
+
+def test_metrics_and_startup_report(client):
+    client.post("/api/v1/analysis/analyze", json=BODY, headers={"Cache-Control": "no-cache"})
+    exposition = client.get("/metrics")
+    assert exposition.status_code == 200 and exposition.headers["content-type"].startswith("text/plain")
+    lines = exposition.text.splitlines()
+    assert "# TYPE agent_run_duration_seconds histogram" in lines
+    bucket = 'agent_run_duration_seconds_bucket{agent="DemographicAgent",status="COMPLETED",le="+Inf"}'
+    assert any(line.startswith(bucket) for line in lines)
+    assert any(line.startswith('pipeline_stage_duration_seconds_count{stage="grading"}') for line in lines)
+    assert any(line.startswith("pipeline_runs_total{status=") for line in lines)
+    assert any(line.startswith('analyze_requests_total{outcome="executed"}') for line in lines)
+
+    report = client.get("/health/startup").json()
+    assert {"import", "agents"} <= set(report["phases_ms"])
+    assert report["time_to_ready_ms"] > 0
+    assert report["import_ms"]["modules"] > 0 and report["slowest_imports"]
+    assert report["agents"]["loaded"] and report["agents"]["prewarm"] == "blocking"
@@ -0,0 +1,62 @@
+# backend/tests/test_coordination.py
+import asyncio
+import pytest
+from app.services.coordination import Coordinator
+from app.services.local_redis import LocalRedis
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def workers():
+    """Two Coordinators sharing one LocalRedis, like two workers sharing a Redis server."""
+    client = LocalRedis()
+    a = Coordinator(client, worker_id="a", heartbeat_interval=0.02, steal_interval=0.01)
+    b = Coordinator(client, worker_id="b", heartbeat_interval=0.02, steal_interval=0.01)
+    await a.start()
+    await b.start()
+    yield a, b
+    for worker in (a, b):
+        if worker._heartbeat is not None:
+            worker._heartbeat.cancel()
+            await asyncio.gather(worker._heartbeat, return_exceptions=True)
+    await client.aclose()
+
+
+async def test_lock_excludes_the_other_worker_until_released(workers):
+    a, b = workers
+    async with a.lock("run:metformin", ttl=1.0, wait=0) as held:
+        assert held.acquired
+        async with b.lock("run:metformin", ttl=1.0, wait=0.05) as contended:
+            assert not contended.acquired
+    async with b.lock("run:metformin", ttl=1.0, wait=0) as released:
+        assert released.acquired
+
+
+async def test_idle_worker_steals_the_newest_job(workers):
+    a, b = workers
+    for payload in ("job-1", "job-2", "job-3"):
+        await a.enqueue(payload)
+
+    assert await asyncio.wait_for(b.claim(), 1) == "job-3"
+    assert await a.claim() == "job-1"
+    stats = {w["worker_id"]: w for w in (await a.stats())["workers"]}
+    assert (stats["a"]["queued"], stats["a"]["claimed"], stats["b"]["claimed"]) == (1, 1, 1)
+
+    await b.ack("job-3")
+    assert (await b.stats())["workers"][1]["claimed"] == 0
+
+
+async def test_jobs_of_a_dead_worker_are_recovered(workers):
+    a, b = workers
+    await a.enqueue("claimed")
+    await a.enqueue("queued")
+    assert await a.claim() == "claimed"
+
+    # Worker a crashes: its heartbeat stops and the alive key lapses
+    a._heartbeat.cancel()
+    await asyncio.sleep(a.heartbeat_interval * 4)
+
+    recovered = [await asyncio.wait_for(b.claim(), 1) for _ in range(2)]
+    assert recovered == ["claimed", "queued"]
+    assert [w["worker_id"] for w in (await b.stats())["workers"]] == ["b"]
@@ -0,0 +1,37 @@
+# backend/tests/test_grading.py
+import pytest
+from app.agents.grading import GradingAgent, GradingWeights
+from app.schemas.agent_data import CompetitionData, EXIMTrendData, IQVIAInsightsData
+from app.schemas.analysis import AgentResult
+
+
+def _results(market: float, competition: float) -> list:
+    payloads = {
+        "IQVIAInsightsAgent": IQVIAInsightsData(1.8, 0.09, ["US"], market_demand_score=market),
+        "EXIMTrendAgent": EXIMTrendData(0.3, 0.7, overall_market_demand_score=0.4),
+        "CompetitionAgent": CompetitionData(6, 0.6, 0.7, competition_overall_score=competition),
+        # Not a grading source
+        "UnknownAgent": {"market_demand_score": 1.0},
+    }
+    return [AgentResult(agent_name=name, summary="", raw_data=data) for name, data in payloads.items()]
+
+
+def test_grade_many_matches_grade():
+    grader = GradingAgent()
+    portfolio = [_results(0.9, 0.2), _results(0.1, 0.8), []]
+    for breakdown, results in zip(grader.grade_many(portfolio), portfolio):
+        assert breakdown.model_dump() == pytest.approx(grader.grade(results).model_dump())
+
+
+def test_weight_sensitivity_ranks_under_every_scenario():
+    grader = GradingAgent()
+    portfolio = [_results(0.9, 0.2), _results(0.1, 0.8)]
+    market_only = GradingWeights(1.0, 0.0, 0.0, 0.0, 0.0)
+    competition_only = GradingWeights(0.0, 0.0, 0.0, 0.0, 1.0)
+
+    overall, rank, stability = grader.weight_sensitivity(portfolio, [market_only, competition_only])
+
+    assert overall.tolist() == pytest.approx([g.overall_score for g in grader.grade_many(portfolio)])
+    assert sorted(rank.tolist()) == [0, 1]
+    # Each molecule wins one scenario and loses the other
+    assert stability[:, 0].tolist() == [0, 0] and stability[:, 2].tolist() == [1, 1]
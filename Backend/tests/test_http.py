@@ -0,0 +1,146 @@
+# backend/tests/test_http.py
+import asyncio
+import time
+import httpx
+import pytest
+from app.agents.registry import AgentRegistry
+from app.schemas.analysis import AnalysisRequest
+from app.services.clinicaltrials_client import ClinicalTrialsClient
+from app.services.http import UpstreamClient, UpstreamError
+
+pytestmark = pytest.mark.anyio
+
+
+def _client(handler, cls=UpstreamClient, **options) -> UpstreamClient:
+    options.setdefault("backoff_base", 0.001)
+    return cls("https://upstream.test", transport=httpx.MockTransport(handler), **options)
+
+
+async def test_retries_transient_failures():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        if len(calls) == 2:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"ok": True})
+
+    async with _client(handler) as client:
+        assert await client.get_json("/thing") == {"ok": True}
+    assert len(calls) == 3
+
+
+async def test_gives_up_after_max_retries():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(500)
+
+    async with _client(handler, max_retries=2) as client:
+        with pytest.raises(UpstreamError):
+            await client.request("GET", "/thing")
+    assert len(calls) == 3
+
+
+async def test_honours_retry_after():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0.2"})
+        return httpx.Response(200, json={})
+
+    async with _client(handler, backoff_base=0.0) as client:
+        started = time.monotonic()
+        await client.request("GET", "/thing")
+    assert time.monotonic() - started >= 0.2
+    assert len(calls) == 2
+
+
+async def test_post_is_not_retried_unless_requested():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503) if len(calls) <= 2 else httpx.Response(201)
+
+    async with _client(handler) as client:
+        with pytest.raises(UpstreamError):
+            await client.request("POST", "/orders", json_body={})
+        assert len(calls) == 1
+        response = await client.request("POST", "/orders", json_body={}, retry=True)
+    assert response.status_code == 201 and len(calls) == 3
+
+
+async def test_client_errors_are_not_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(404)
+
+    async with _client(handler) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.request("GET", "/missing")
+    assert len(calls) == 1
+
+
+async def test_identical_concurrent_gets_are_coalesced():
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"q": request.url.params["q"]})
+
+    async with _client(handler) as client:
+        results = await asyncio.gather(
+            *(client.get_json("/search", {"q": "a"}) for _ in range(5)),
+            client.get_json("/search", {"q": "b"}),
+        )
+    assert results == [{"q": "a"}] * 5 + [{"q": "b"}]
+    assert len(calls) == 2
+
+
+def _trials_handler(request):
+    pages = {
+        None: {"studies": [_study("RECRUITING", ["Type 2 Diabetes"])], "nextPageToken": "p2"},
+        "p2": {"studies": [_study("TERMINATED", ["Obesity"])], "nextPageToken": "p3"},
+        "p3": {"studies": [_study("ACTIVE_NOT_RECRUITING", ["PCOS", "Obesity"])]},
+    }
+    return httpx.Response(200, json=pages[request.url.params.get("pageToken")])
+
+
+def _study(status, conditions):
+    return {"protocolSection": {"statusModule": {"overallStatus": status}, "conditionsModule": {"conditions": conditions}}}
+
+
+async def test_paginates_with_next_page_token():
+    async with _client(_trials_handler, ClinicalTrialsClient) as client:
+        studies = [s async for s in client.studies("metformin")]
+    assert [s["protocolSection"]["statusModule"]["overallStatus"] for s in studies] == [
+        "RECRUITING", "TERMINATED", "ACTIVE_NOT_RECRUITING",
+    ]
+
+
+async def test_registry_injects_clients_into_agents():
+    client = _client(_trials_handler, ClinicalTrialsClient)
+    registry = AgentRegistry(upstream_clients={"clinicaltrials": client})
+    registry.register("ClinicalTrialAgent", "app.agents.patent_trials.clinical_trials:ClinicalTrialAgent")
+    await registry.startup()
+    try:
+        agent = registry.get("ClinicalTrialAgent")
+        assert agent.upstream("clinicaltrials") is client
+        result = await agent.run(
+            AnalysisRequest(query="screen", molecule_name="Metformin", target_indication="Type 2 diabetes")
+        )
+    finally:
+        await registry.shutdown()
+        await client.aclose()
+    assert result.raw_data.ongoing_trials_count == 2
+    assert result.raw_data.safety_signal_risk_score == round(1 / 3, 4)
+    assert "3 registered trials" in result.summary
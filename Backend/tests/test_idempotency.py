@@ -0,0 +1,68 @@
+# backend/tests/test_idempotency.py
+import asyncio
+import pytest
+from app.schemas.analysis import AnalysisRequest, AnalysisResponse, GradingBreakdown
+from app.services.idempotency import IdempotencyKeyReuseError, RequestDeduplicator
+
+pytestmark = pytest.mark.anyio
+
+REQUEST = AnalysisRequest(query="screen", molecule_name="Metformin", target_indication="Type 2 diabetes")
+
+
+class Pipeline:
+    """Counts executions; each takes a moment so concurrent calls overlap."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.calls = 0
+        self.fail = fail
+
+    async def __call__(self) -> AnalysisResponse:
+        self.calls += 1
+        await asyncio.sleep(0.02)
+        if self.fail:
+            raise RuntimeError("agents down")
+        grading = GradingBreakdown(
+            market_demand=0.5, production_feasibility=0.5, demographics=0.5,
+            patents_and_trials=0.5, competition=0.5, overall_score=0.5,
+        )
+        return AnalysisResponse(run_id=f"run-{self.calls}", grading=grading, results=[])
+
+
+async def test_identical_requests_join_then_replay():
+    dedup, pipeline = RequestDeduplicator(), Pipeline()
+    normalised = REQUEST.model_copy(update={"molecule_name": " metformin"})
+    first, second = await asyncio.gather(dedup.run(REQUEST, pipeline), dedup.run(normalised, pipeline))
+    assert [first[1], second[1]] == ["executed", "joined"]
+    assert first[0] is second[0]
+
+    assert (await dedup.run(REQUEST, pipeline))[1] == "replayed"
+    fresh, outcome = await dedup.run(REQUEST, pipeline, replay=False)
+    assert outcome == "executed" and fresh.run_id == "run-2"
+
+
+async def test_idempotency_key_replays_and_rejects_other_bodies():
+    dedup, pipeline = RequestDeduplicator(replay_seconds=0), Pipeline()
+    response, _ = await dedup.run(REQUEST, pipeline, idempotency_key="k1")
+    # Honoured even with replay=False, and after the content replay window
+    assert await dedup.run(REQUEST, pipeline, idempotency_key="k1", replay=False) == (response, "replayed")
+    with pytest.raises(IdempotencyKeyReuseError):
+        await dedup.run(REQUEST.model_copy(update={"molecule_name": "Ibuprofen"}), pipeline, idempotency_key="k1")
+    assert pipeline.calls == 1
+
+
+async def test_failures_are_not_replayed():
+    dedup, pipeline = RequestDeduplicator(), Pipeline(fail=True)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await dedup.run(REQUEST, pipeline, idempotency_key="k1")
+    assert pipeline.calls == 2
+
+
+async def test_shared_run_survives_until_the_last_caller_leaves():
+    dedup, pipeline = RequestDeduplicator(), Pipeline()
+    leaving = asyncio.create_task(dedup.run(REQUEST, pipeline))
+    staying = asyncio.create_task(dedup.run(REQUEST, pipeline))
+    await asyncio.sleep(0)
+    leaving.cancel()
+    response, outcome = await staying
+    assert outcome == "joined" and response.run_id == "run-1"
@@ -0,0 +1,65 @@
+# backend/tests/test_jobs.py
+import asyncio
+import pytest
+from app.agents.base import BaseAgent
+from app.agents.master import MasterAgent
+from app.db.run_store import InMemoryRunStore
+from app.schemas.analysis import AgentResult, AnalysisRequest
+from app.services.jobs import JobRunner
+
+pytestmark = pytest.mark.anyio
+
+REQUEST = AnalysisRequest(query="screen", molecule_name="Metformin", target_indication="Type 2 diabetes")
+
+
+class QuickAgent(BaseAgent):
+    async def run(self, request: AnalysisRequest) -> AgentResult:
+        return self._result("quick", {})
+
+
+class SlowQueuedWritesStore(InMemoryRunStore):
+    """Delays QUEUED writes and records the order statuses are written in."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes = []
+
+    async def save(self, run):
+        if run.status == "QUEUED":
+            await asyncio.sleep(0.05)
+        self.writes.append(run.status)
+        await super().save(run)
+
+
+async def _finished(runner: JobRunner, run_id: str) -> str:
+    async for run in runner.subscribe(run_id):
+        status = run.status
+    return status
+
+
+async def test_queued_write_never_overtakes_running():
+    store = SlowQueuedWritesStore()
+    runner = JobRunner(MasterAgent(agents=[QuickAgent()]), store, workers=1, report_workers=1)
+    await runner.start()
+    try:
+        run = await runner.submit(REQUEST)
+        assert await asyncio.wait_for(_finished(runner, run.run_id), 5) == "COMPLETED"
+        assert store.writes == ["QUEUED", "RUNNING", "REPORT_PENDING", "COMPLETED"]
+    finally:
+        await runner.stop()
+
+
+async def test_report_queue_is_bounded():
+    runner = JobRunner(
+        MasterAgent(agents=[QuickAgent()]), InMemoryRunStore(), workers=3, report_workers=0, max_report_queue_size=1
+    )
+    await runner.start()
+    try:
+        runs = [await runner.submit(REQUEST) for _ in range(3)]
+        await asyncio.sleep(0.2)
+        # One graded run queued for its report; the other workers wait for room
+        assert runner._reports.qsize() == 1
+        statuses = [(await runner.get(run.run_id)).status for run in runs]
+        assert statuses == ["REPORT_PENDING"] * 3
+    finally:
+        await runner.stop()
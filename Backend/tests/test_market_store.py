@@ -0,0 +1,108 @@
+# backend/tests/test_market_store.py
+import pyarrow.dataset as ds
+import pytest
+from app.agents.market.exim_trends import EXIMTrendAgent
+from app.agents.market.iqvia_insights import IQVIAInsightsAgent
+from app.schemas.analysis import AnalysisRequest
+from app.services.market_store import (
+    MarketStore,
+    ingest_hs_codes_csv,
+    ingest_sales_csv,
+    ingest_trade_csv,
+    molecule_bucket,
+)
+
+pytestmark = pytest.mark.anyio
+
+SALES = """molecule,region,year,units,value_usd
+ Metformin ,US,2020,10,400
+metformin,EU5,2020,10,100
+METFORMIN,US,2022,10,600
+Metformin,India,2022,10,300
+Metformin,EU5,2022,10,200
+Metformin,Japan,2022,10,50
+Ibuprofen,US,2022,10,9999
+"""
+
+TRADE = """hs_code,reporter,partner,flow,year,value_usd
+300490,IN,US,export,2020,100
+300490,IN,US,EXPORT,2022,144
+300490,IN,CN,import,2022,36
+294200,IN,CN,import,2022,64
+300490,US,IN,import,2022,5000
+300410,IN,US,export,2022,7777
+"""
+
+HS_CODES = """molecule,hs_code
+Metformin ,300490
+metformin,294200
+"""
+
+
+@pytest.fixture
+def store(tmp_path) -> MarketStore:
+    for name, text in (("sales.csv", SALES), ("trade.csv", TRADE), ("hs.csv", HS_CODES)):
+        (tmp_path / name).write_text(text)
+    root = tmp_path / "market"
+    root.mkdir()
+    # A small block size streams the CSV in several batches
+    ingest_sales_csv(tmp_path / "sales.csv", root, block_size=128)
+    ingest_trade_csv(tmp_path / "trade.csv", root, block_size=128)
+    ingest_hs_codes_csv(tmp_path / "hs.csv", root)
+    return MarketStore(root)
+
+
+def test_sales_summary_aggregates_one_molecule(store):
+    summary = store.sales_summary("  METFORMIN")
+    # 2020: 400 + 100 = 500; 2022: 600 + 300 + 200 + 50 = 1150
+    assert summary["latest_year"] == 2022
+    assert summary["market_size_usd"] == 1150
+    assert summary["cagr"] == pytest.approx((1150 / 500) ** 0.5 - 1)
+    assert summary["key_regions"] == ["US", "India", "EU5"]
+    assert store.sales_summary("Aspirin") is None
+
+
+def test_partitions_prune_by_molecule_bucket_and_hs_chapter(store):
+    bucket = molecule_bucket("metformin")
+    partitions = {path.name for path in (store.root / "sales").iterdir()}
+    assert f"molecule_bucket={bucket}" in partitions and len(partitions) == 2
+    fragments = list(store._sales.get_fragments(filter=ds.field("molecule_bucket") == bucket))
+    assert fragments and all(f"molecule_bucket={bucket}/" in fragment.path for fragment in fragments)
+
+    chapters = list(store._trade.get_fragments(filter=ds.field("hs_chapter") == "29"))
+    assert chapters and all("hs_chapter=29/" in fragment.path for fragment in chapters)
+
+
+def test_trade_summary_filters_codes_and_reporter(store):
+    hs_codes = store.hs_codes_for("METFORMIN")
+    assert sorted(hs_codes) == ["294200", "300490"]
+    # 300410 (same chapter, other code) and the US reporter's rows are excluded
+    assert store.trade_summary(hs_codes, "IN") == {
+        "imports_by_year": {2022: 100.0},
+        "exports_by_year": {2020: 100.0, 2022: 144.0},
+    }
+    assert store.trade_summary(["300490"], "DE") is None
+    assert store.trade_summary([], "IN") is None
+
+
+def test_missing_datasets_read_as_empty(tmp_path):
+    store = MarketStore(tmp_path)
+    assert store.sales_summary("Metformin") is None
+    assert store.hs_codes_for("Metformin") == []
+
+
+async def test_market_agents_read_the_store(store):
+    request = AnalysisRequest(query="screen", molecule_name="Metformin", target_indication="Type 2 diabetes")
+    iqvia, exim = IQVIAInsightsAgent(), EXIMTrendAgent()
+    iqvia.store = exim.store = store
+
+    sales = (await iqvia.run(request)).raw_data
+    assert (sales.data_year, sales.key_regions, sales.cagr) == (2022, ["US", "India", "EU5"], 0.5166)
+    growth_score = 0.5 + ((1150 / 500) ** 0.5 - 1) * 2.5
+    assert sales.market_demand_score == pytest.approx(0.5 * 1150 / 5e9 + 0.5 * min(1.0, growth_score), abs=1e-4)
+
+    trade = (await exim.run(request)).raw_data
+    # 2022: imports 100, exports 144; exports grew 20% a year over 2020-2022
+    assert trade.data_year == 2022
+    assert trade.import_dependency_score == pytest.approx(100 / 244, abs=1e-4)
+    assert trade.export_opportunity_score == 1.0
@@ -0,0 +1,185 @@
+# backend/tests/test_master_agent.py
+import asyncio
+import pytest
+from app.agents.base import BaseAgent
+from app.agents.master import MasterAgent
+from app.agents.production.process_design import ProcessDesignAgent
+from app.agents.production.techno_economic import TechnoEconomicAgent
+from app.schemas.analysis import AgentResult, AnalysisRequest
+from app.services.compute import ComputePools
+
+pytestmark = pytest.mark.anyio
+
+
+def _request(molecule: str, indication: str = "Type 2 diabetes") -> AnalysisRequest:
+    return AnalysisRequest(query="screen", molecule_name=molecule, target_indication=indication)
+
+
+@pytest.fixture
+def pools():
+    pools = ComputePools(thread_workers=2, process_workers=2)
+    yield pools
+    pools.shutdown()
+
+
+def _record_pool_use(pools, monkeypatch):
+    used = []
+    for kind in ("thread", "process"):
+        pool = pools.get(kind)
+
+        async def submit(fn, *args, _submit=pool.submit, _kind=kind):
+            used.append((_kind, fn.__name__))
+            return await _submit(fn, *args)
+
+        monkeypatch.setattr(pool, "submit", submit)
+    return used
+
+
+def _techno_economic_master(pools) -> MasterAgent:
+    agents = [ProcessDesignAgent(), TechnoEconomicAgent()]
+    for agent in agents:
+        agent.compute_pools = pools
+    return MasterAgent(agents=agents)
+
+
+async def test_batch_runs_simulations_on_the_process_pool(pools, monkeypatch):
+    used = _record_pool_use(pools, monkeypatch)
+    master = _techno_economic_master(pools)
+    items = await master.run_batch([_request("Metformin"), _request("Sitagliptin"), _request("Metformin")])
+    assert all(item.error is None for item in items)
+    assert used == [("process", "simulate_plant")] * 2
+
+
+async def test_single_pipeline_runs_simulation_on_threads(pools, monkeypatch):
+    used = _record_pool_use(pools, monkeypatch)
+    response = await _techno_economic_master(pools).run_pipeline(_request("Metformin"))
+    assert response.agent_statuses["TechnoEconomicAgent"] == "COMPLETED"
+    assert used == [("thread", "simulate_plant")]
+
+
+class SleepyAgent(BaseAgent):
+    """Sleeps, then returns; skips itself when an upstream result says so."""
+
+    def __init__(self, name: str, delay: float, depends_on=(), skip_if_upstream_says=False) -> None:
+        super().__init__(name)
+        self.delay = delay
+        self.depends_on = tuple(depends_on)
+        self.skip_if_upstream_says = skip_if_upstream_says
+
+    def skip_reason(self, upstream):
+        if self.skip_if_upstream_says and any(r.raw_data.get("skip_dependents") for r in upstream.values()):
+            return "upstream says skip"
+        return None
+
+    async def run(self, request: AnalysisRequest) -> AgentResult:
+        await asyncio.sleep(self.delay)
+        return self._result(self.name, {"skip_dependents": request.query == "skip"})
+
+
+async def test_agent_durations_start_at_each_agent_launch():
+    master = MasterAgent(
+        agents=[
+            SleepyAgent("Upstream", 0.2),
+            SleepyAgent("Downstream", 0.02, depends_on=["Upstream"]),
+            SleepyAgent("Gated", 0.02, depends_on=["Upstream"], skip_if_upstream_says=True),
+        ]
+    )
+    outcomes = await master._run_agents_parallel(_request("Metformin"))
+    assert outcomes["Upstream"].duration >= 0.2
+    # Measured from its own launch, not from fan-out start
+    assert outcomes["Downstream"].duration < 0.15
+
+    outcomes = await master._run_agents_parallel(AnalysisRequest(query="skip", molecule_name="Metformin"))
+    assert outcomes["Gated"].status == "SKIPPED" and outcomes["Gated"].duration is None
+
+
+async def test_batch_deadline_excludes_queueing_for_agent_slots(monkeypatch):
+    master = MasterAgent(agents=[SleepyAgent("Slow", 0.1)])
+    monkeypatch.setattr(master.settings, "PIPELINE_TIMEOUT_SECONDS", 0.25)
+    monkeypatch.setattr(master.settings, "BATCH_AGENT_CONCURRENCY", 1)
+    # Five pipelines share one slot: the last waits 0.4s, past the deadline if queueing counted
+    items = await master.run_batch([_request(f"Molecule {i}") for i in range(5)])
+    assert [item.response.agent_statuses["Slow"] for item in items] == ["COMPLETED"] * 5
+
+
+def _gated_master() -> MasterAgent:
+    # Patents are gated on the demographics result; trials depend on patents, so the skip cascades
+    return MasterAgent(
+        agents=[
+            SleepyAgent("DemographicAgent", 0.02),
+            SleepyAgent("PatentLandscapeAgent", 0, depends_on=["DemographicAgent"], skip_if_upstream_says=True),
+            SleepyAgent("ClinicalTrialAgent", 0, depends_on=["PatentLandscapeAgent"]),
+            SleepyAgent("CompetitionAgent", 0, depends_on=["DemographicAgent"]),
+        ]
+    )
+
+
+async def test_skip_gate_cascades_down_the_dependency_graph():
+    request = AnalysisRequest(query="skip", molecule_name="Metformin", target_indication="Type 2 diabetes")
+    outcomes = [outcome async for outcome in _gated_master()._iter_agent_outcomes(request)]
+    assert outcomes[0].agent_name == "DemographicAgent"
+    by_name = {outcome.agent_name: outcome for outcome in outcomes}
+    assert by_name["PatentLandscapeAgent"].error == "upstream says skip"
+    assert by_name["ClinicalTrialAgent"].error == "upstream PatentLandscapeAgent skipped"
+    assert by_name["CompetitionAgent"].status == "COMPLETED"
+
+    response = await _gated_master().run_pipeline(request)
+    assert response.agent_statuses == {
+        "DemographicAgent": "COMPLETED",
+        "PatentLandscapeAgent": "SKIPPED",
+        "ClinicalTrialAgent": "SKIPPED",
+        "CompetitionAgent": "COMPLETED",
+    }
+    # A gated skip still counts as a complete analysis, with the dimension reported as skipped
+    assert response.status == "COMPLETED"
+    assert response.missing_dimensions == {"patents_and_trials": "SKIPPED"}
+
+    response = await _gated_master().run_pipeline(_request("Metformin"))
+    assert set(response.agent_statuses.values()) == {"COMPLETED"}
+    assert response.missing_dimensions == {}
+
+
+class VersionedAgent(BaseAgent):
+    """Counts its runs; its fingerprint follows `version`, like a data source that was updated."""
+
+    cache_ttl = 3600
+
+    def __init__(self, name: str, depends_on=()) -> None:
+        super().__init__(name)
+        self.depends_on = tuple(depends_on)
+        self.version = "1"
+        self.calls = 0
+
+    async def data_version(self) -> str:
+        return self.version
+
+    async def run(self, request: AnalysisRequest) -> AgentResult:
+        self.calls += 1
+        return self._result(f"{self.name} v{self.version}", {"version": self.version})
+
+
+async def test_refresh_reruns_only_agents_whose_inputs_changed():
+    patents = VersionedAgent("PatentLandscapeAgent")
+    trials = VersionedAgent("ClinicalTrialAgent", depends_on=["PatentLandscapeAgent"])
+    demographics = VersionedAgent("DemographicAgent")
+    master = MasterAgent(agents=[patents, trials, demographics])
+    request = _request("Metformin")
+    first = await master.run_pipeline(request)
+
+    unchanged = await master.refresh_pipeline(first, request)
+    assert unchanged.reused_agents == ["PatentLandscapeAgent", "ClinicalTrialAgent", "DemographicAgent"]
+    assert unchanged.parent_run_id == first.run_id and unchanged.run_id != first.run_id
+    assert [agent.calls for agent in (patents, trials, demographics)] == [1, 1, 1]
+
+    # A new patent data version reruns the agent and, downstream of it, the trials agent
+    patents.version = "2"
+    refreshed = await master.refresh_pipeline(unchanged, request)
+    assert refreshed.reused_agents == ["DemographicAgent"]
+    assert [agent.calls for agent in (patents, trials, demographics)] == [2, 2, 1]
+    results = {result.agent_name: result for result in refreshed.results}
+    assert results["PatentLandscapeAgent"].raw_data == {"version": "2"}
+    assert results["DemographicAgent"] == {r.agent_name: r for r in first.results}["DemographicAgent"]
+
+    forced = await master.refresh_pipeline(refreshed, request, force_agents=["DemographicAgent"])
+    assert forced.reused_agents == ["PatentLandscapeAgent", "ClinicalTrialAgent"]
+    assert demographics.calls == 2
@@ -0,0 +1,50 @@
+# backend/tests/test_metrics.py
+from app.core.metrics import MetricsRegistry
+from app.core.startup import ImportProfiler, StartupReport
+
+
+def test_exposition_format():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", ("stage",), buckets=(0.1, 1.0))
+    runs = registry.counter("runs_total", "Runs.", ("status",))
+    depth = registry.gauge("queue_depth", "Depth.")
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, stage='say "hi"')
+    runs.inc(status="COMPLETED")
+    runs.inc(2, status="COMPLETED")
+    depth.inc(3)
+    depth.dec()
+
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{stage="say \\"hi\\"",le="0.1"} 2',
+        'latency_seconds_bucket{stage="say \\"hi\\"",le="1.0"} 3',
+        'latency_seconds_bucket{stage="say \\"hi\\"",le="+Inf"} 4',
+        'latency_seconds_sum{stage="say \\"hi\\""} 3.65',
+        'latency_seconds_count{stage="say \\"hi\\""} 4',
+        "# HELP runs_total Runs.",
+        "# TYPE runs_total counter",
+        'runs_total{status="COMPLETED"} 3.0',
+        "# HELP queue_depth Depth.",
+        "# TYPE queue_depth gauge",
+        "queue_depth 2.0",
+    ]
+
+
+def test_startup_report_times_phases_and_nested_imports():
+    profiler, report = ImportProfiler(), StartupReport()
+    with report.phase("agents"):
+        with profiler.timing("outer"):
+            with profiler.timing("inner"):
+                pass
+    report.checkpoint("import")
+    report.mark_ready()
+
+    summary = report.as_dict(profiler, top_imports=1)
+    assert set(summary["phases_ms"]) == {"agents", "import"}
+    assert summary["time_to_ready_ms"] >= summary["phases_ms"]["agents"]
+    assert summary["import_ms"]["modules"] == 2 and len(summary["slowest_imports"]) == 1
+    outer_self, outer_total = profiler.timings["outer"]
+    # Time spent importing "inner" counts towards outer's cumulative time only
+    assert outer_total >= outer_self + profiler.timings["inner"][1] - 1e-9
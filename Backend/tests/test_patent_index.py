@@ -0,0 +1,109 @@
+# backend/tests/test_patent_index.py
+from datetime import date, timedelta
+import pytest
+from app.agents.patent_trials.patent_landscape import PatentLandscapeAgent
+from app.schemas.analysis import AnalysisRequest
+from app.services.patent_index import PatentIndex
+
+pytestmark = pytest.mark.anyio
+
+HEADER = "patent_id,family_id,molecule,active_ingredient,kind,jurisdiction,filing_date,expiry_date,extension_days"
+ON = date(2025, 6, 1)
+
+
+def _row(patent_id: str, molecule: str, kind: str, filed: date, expires: date, extension: int = 0) -> str:
+    return f"{patent_id},F-{patent_id},{molecule},{molecule},{kind},US,{filed},{expires},{extension}"
+
+
+def _index(tmp_path, rows, litigation=None) -> PatentIndex:
+    patents = tmp_path / "patents.csv"
+    patents.write_text("\n".join([HEADER, *rows]) + "\n")
+    cases = None
+    if litigation:
+        cases = tmp_path / "litigation.csv"
+        cases.write_text("case_id,patent_id,status,filed_date\n" + "\n".join(litigation) + "\n")
+    return PatentIndex.from_bulk(patents, cases)
+
+
+@pytest.fixture
+def index(tmp_path) -> PatentIndex:
+    return _index(
+        tmp_path,
+        [
+            _row("P-expires-on", "Metformin", "primary", date(2005, 1, 1), ON),
+            _row("P-day-after", "Metformin", "secondary", date(2006, 1, 1), ON + timedelta(days=1)),
+            _row("P-filed-after", "Metformin", "secondary", ON + timedelta(days=1), date(2040, 1, 1)),
+            # Expires before ON, but a 10-day extension keeps it in force through ON
+            _row("P-extended", "Sitagliptin", "primary", date(2006, 1, 1), ON - timedelta(days=5), 10),
+            _row("P-old", "Ibuprofen", "primary", date(1990, 1, 1), date(2010, 1, 1)),
+        ],
+        ["C1,P-day-after,open,2024-01-01", "C2,P-expires-on,closed,2020-01-01"],
+    )
+
+
+def test_expiry_day_is_not_in_force(index):
+    assert {p.patent_id for p in index.in_force(ON)} == {"P-day-after", "P-extended"}
+    assert {p.patent_id for p in index.in_force(ON + timedelta(days=1))} == {"P-filed-after", "P-extended"}
+
+    fto = index.fto("metformin", on=ON)
+    assert [p.patent_id for p in fto.blocking_patents] == ["P-day-after"]
+    assert fto.primary_patents_expired
+    assert [c.case_id for c in fto.open_litigation] == ["C1"]
+    assert fto.clear_from == ON + timedelta(days=1)
+
+    previous_day = index.fto("Metformin", on=ON - timedelta(days=1))
+    assert not previous_day.primary_patents_expired and previous_day.clear_from == ON + timedelta(days=1)
+    assert index.fto("Ibuprofen", on=ON).clear_from is None
+
+
+def test_blocked_in_year_boundaries(tmp_path):
+    index = _index(
+        tmp_path,
+        [
+            _row("ends-jan-1", "A", "primary", date(2000, 1, 1), date(2025, 1, 1)),
+            _row("ends-jan-2", "B", "primary", date(2000, 1, 1), date(2025, 1, 2)),
+            _row("filed-dec-31", "C", "primary", date(2025, 12, 31), date(2045, 1, 1)),
+            _row("filed-next-year", "D", "primary", date(2026, 1, 1), date(2046, 1, 1)),
+        ],
+    )
+    # Expiring on Jan 1 means never in force that year; in force on Jan 1 or Dec 31 counts
+    assert sorted(index.blocked_in_year(2025)) == ["b", "c"]
+
+
+def test_delta_removes_and_replaces_patents(index, tmp_path):
+    version = index.version
+    delta = tmp_path / "delta-2025-23.csv"
+    delta.write_text(
+        "\n".join(
+            [
+                "op," + HEADER,
+                "delete,P-day-after,,Metformin,,,,,,",
+                "upsert," + _row("P-extended", "Sitagliptin", "primary", date(2006, 1, 1), ON - timedelta(days=5)),
+            ]
+        )
+        + "\n"
+    )
+    assert index.apply_delta(delta) == 2
+    assert index.version == f"{version}+delta-2025-23.csv" != version
+    assert len(index) == 4
+    assert index.fto("Metformin", on=ON).blocking_patents == []
+    # Re-inserted without the extension, so its old expiry entry is gone too
+    assert list(index.in_force(ON)) == []
+
+
+async def test_agent_reports_clear_from(tmp_path):
+    today = date.today()
+    index = _index(
+        tmp_path,
+        [
+            _row("P1", "Metformin", "primary", date(2005, 1, 1), today + timedelta(days=30)),
+            _row("P2", "Metformin", "secondary", date(2006, 1, 1), today + timedelta(days=400)),
+        ],
+    )
+    agent = PatentLandscapeAgent()
+    agent.index = index
+    data = (await agent.run(AnalysisRequest(query="screen", molecule_name="Metformin"))).raw_data
+    assert not data.primary_patents_expired
+    assert data.blocking_patents == ["P1", "P2"]
+    assert data.clear_from == (today + timedelta(days=400)).isoformat()
+    assert await agent.data_version() == "bulk:patents.csv"
@@ -0,0 +1,90 @@
+# backend/tests/test_portfolio_index.py
+import math
+import pytest
+from app.agents.grading import DIMENSIONS
+from app.db.run_store import InMemoryRunStore
+from app.schemas.agent_data import DemographicData
+from app.schemas.analysis import AnalysisRequest, AnalysisResponse, GradingBreakdown, RunStatus
+from app.services.portfolio_index import PortfolioIndex
+
+pytestmark = pytest.mark.anyio
+
+PORTFOLIO = [
+    ("Atorvastatin", "Hyperlipidemia", 0.8),
+    ("Simvastatin", "Hyperlipidemia", 0.7),
+    ("Sitagliptin", "Type 2 diabetes", 0.4),
+    ("Ibuprofen", "Pain", 0.2),
+]
+
+
+def _grading(score: float) -> dict:
+    return {**{d: score for d in DIMENSIONS}, "overall_score": score}
+
+
+def _demographics(score: float) -> dict:
+    return {"DemographicAgent": DemographicData(score, score, 1 - score, demographic_overall_score=score)}
+
+
+@pytest.fixture
+def index() -> PortfolioIndex:
+    index = PortfolioIndex(initial_capacity=2)
+    for i, (molecule, indication, score) in enumerate(PORTFOLIO):
+        index.upsert(f"run-{i}", molecule, indication, _grading(score), _demographics(score))
+    return index
+
+
+def test_upsert_grows_and_replaces_pairs(index):
+    assert len(index) == 4 and index.capacity == 4
+    index.upsert("run-new", " atorvastatin ", "HYPERLIPIDEMIA", _grading(0.9), {})
+    assert len(index) == 4
+    # Rows copied across the growth keep their grades; the replaced pair has the new ones
+    analysed = index.prescreen([("Atorvastatin", "Hyperlipidemia"), ("Ibuprofen", "Pain")])
+    assert [e.grading.overall_score for e in analysed] == [0.9, 0.2]
+    assert [m.run_id for m in index.similar("Rosuvastatin", "Hyperlipidemia", basis="descriptor")][0] == "run-new"
+
+
+def test_prescreen_estimates_from_nearest_analogues(index):
+    statin, known, unrelated, nameless = index.prescreen(
+        [("Rosuvastatin", "Hyperlipidemia"), ("Sitagliptin", "type 2 diabetes"), ("Qzxwv", None), (None, "Pain")],
+        k=10,
+        min_similarity=0.2,
+        include_neighbours=True,
+    )
+    assert statin.neighbours[0].molecule_name in {"Atorvastatin", "Simvastatin"}
+    assert {m.molecule_name for m in statin.neighbours} <= {"Atorvastatin", "Simvastatin"}
+    assert all(m.similarity >= 0.2 for m in statin.neighbours)
+    assert 0.7 <= statin.grading.overall_score <= 0.8 and 0.2 <= statin.confidence < 1.0
+    assert not statin.analysed
+
+    assert known.analysed and known.confidence == 1.0
+    assert known.grading == GradingBreakdown(**_grading(0.4))
+    assert (unrelated.grading, unrelated.confidence) == (None, 0.0)
+    assert nameless.grading is None
+
+
+def test_prescreen_of_an_empty_index():
+    assert PortfolioIndex().prescreen([("Atorvastatin", "Hyperlipidemia")])[0].grading is None
+
+
+def test_similar_by_profile_handles_missing_payloads(index):
+    index.upsert("run-bare", "Metformin", "Type 2 diabetes", _grading(0.75), {})  # NaN payload columns
+    neighbours = index.similar("Atorvastatin", "Hyperlipidemia", k=10)
+    # k larger than the portfolio: every other pair once, never the pair itself
+    assert len(neighbours) == 4 and "Atorvastatin" not in {m.molecule_name for m in neighbours}
+    assert neighbours[0].molecule_name == "Simvastatin"
+    assert all(math.isfinite(m.similarity) for m in neighbours)
+
+    with pytest.raises(KeyError):
+        index.similar("Rosuvastatin", "Hyperlipidemia", basis="profile")
+    assert index.similar("Rosuvastatin", "Hyperlipidemia", k=1, basis="descriptor")[0].molecule_name.endswith("statin")
+
+
+async def test_warm_keeps_the_newest_run_of_each_pair():
+    store = InMemoryRunStore()
+    for run_id, score in (("old", 0.3), ("new", 0.6)):
+        request = AnalysisRequest(query="screen", molecule_name="Metformin", target_indication="Type 2 diabetes")
+        response = AnalysisResponse(run_id=run_id, grading=GradingBreakdown(**_grading(score)), results=[])
+        await store.save(RunStatus(run_id=run_id, status="COMPLETED", request=request, response=response))
+    index = PortfolioIndex()
+    assert await index.warm(store, limit=10) == 1
+    assert index.prescreen([("metformin", "type 2 diabetes")])[0].grading.overall_score == 0.6
@@ -0,0 +1,96 @@
+# backend/tests/test_report_rendering.py
+import re
+from datetime import datetime, timezone
+import pytest
+from app.schemas.agent_data import DemographicData
+from app.schemas.analysis import AgentResult, AnalysisRequest, GradingBreakdown
+from app.services.report_rendering import ReportFileCache, ReportRenderer
+
+pytestmark = pytest.mark.anyio
+
+GRADING = GradingBreakdown(
+    market_demand=0.8, production_feasibility=0.7, demographics=0.6,
+    patents_and_trials=0.5, competition=0.4, overall_score=0.65,
+)
+
+
+def _result(name: str, summary: str, stamp: int = 0) -> AgentResult:
+    return AgentResult(
+        agent_name=name,
+        summary=summary,
+        raw_data=DemographicData(0.8, 0.7, 0.6, demographic_overall_score=0.7),
+        generated_at=datetime(2025, 1, 1, stamp, tzinfo=timezone.utc),
+        input_fingerprint="fp",
+    )
+
+
+def _document(molecule: str = "Metformin", results=None):
+    request = AnalysisRequest(query="screen", molecule_name=molecule, target_indication="Type 2 diabetes")
+    return request, GRADING, results if results is not None else [_result("DemographicAgent", "Large & growing")]
+
+
+def test_pdf_envelope_and_xref_offsets():
+    results = [_result(f"Agent{i}", "finding " * 200) for i in range(8)]
+    pdf = b"".join(ReportRenderer().stream("pdf", [_document(results=results), _document("Sitagliptin")]))
+    assert pdf.startswith(b"%PDF-1.4\n") and pdf.endswith(b"%%EOF\n")
+
+    startxref = int(re.search(rb"startxref\n(\d+)\n", pdf).group(1))
+    assert pdf[startxref:].startswith(b"xref\n")
+    offsets = [int(entry) for entry in re.findall(rb"(\d{10}) 00000 n ", pdf)]
+    for obj_id, offset in enumerate(offsets, start=1):
+        assert pdf[offset:].startswith(f"{obj_id} 0 obj\n".encode())
+    pages = int(re.search(rb"/Type /Pages /Kids \[[^\]]*\] /Count (\d+)", pdf).group(1))
+    # Eight long agent sections overflow one page; the second document starts a new one
+    assert pages >= 3 and pdf.count(b"/Type /Page ") == pages
+
+
+def test_html_escapes_request_and_agent_text():
+    html = ReportRenderer().render("html", *_document("<b>Mol</b>"))
+    assert "<b>Mol</b>" not in html
+    assert "Generic Opportunity Report for &lt;b&gt;Mol&lt;/b&gt;" in html
+    assert "<p>Large &amp; growing</p>" in html
+    assert "<dt>disease_burden_score</dt><dd>0.8</dd>" in html
+    assert html.startswith("<!DOCTYPE html>") and html.endswith("</article>\n</body></html>\n")
+
+
+def test_markdown_lists_payload_fields():
+    md = ReportRenderer().render("md", *_document())
+    assert md.startswith("# Generic Opportunity Report for Metformin\n")
+    assert "| **Overall feasibility grade** | **65.0 / 100** |" in md
+    assert "### 1. DemographicAgent\n\nLarge & growing\n\n- `disease_burden_score`: 0.8\n" in md
+    assert "`kind`" not in md
+
+
+def test_sections_are_reused_across_renders_and_formats():
+    renderer = ReportRenderer()
+    results = [_result("DemographicAgent", "first"), _result("CompetitionAgent", "second")]
+    renderer.render("text", *_document(results=results))
+    assert (renderer.hits, renderer.misses) == (0, 6)
+
+    # PDF lays out the cached text sections
+    b"".join(renderer.stream("pdf", [_document(results=results)]))
+    assert (renderer.hits, renderer.misses) == (6, 6)
+
+    # A refreshed agent result re-renders only its own section
+    refreshed = [results[0], _result("CompetitionAgent", "updated", stamp=1)]
+    assert "updated" in renderer.render("text", *_document(results=refreshed))
+    assert (renderer.hits, renderer.misses) == (11, 7)
+
+
+async def test_report_cache_tee_publishes_only_complete_documents(tmp_path):
+    cache = ReportFileCache(tmp_path)
+    cache.WRITE_BUFFER_BYTES = 4
+    chunks = [b"abc", b"defg", b"h"]
+
+    async def render():
+        for chunk in chunks:
+            yield chunk
+
+    assert [chunk async for chunk in cache.tee("done", render())] == chunks
+    assert (await cache.get("done")).read_bytes() == b"abcdefgh"
+
+    stream = cache.tee("partial", render())
+    assert await stream.__anext__() == b"abc"
+    await stream.aclose()
+    assert await cache.get("partial") is None
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["done"]
@@ -0,0 +1,131 @@
+# backend/tests/test_run_store.py
+import asyncio
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.db.sqlite_store import SQLiteRunStore
+from app.schemas.agent_data import DemographicData
+from app.schemas.analysis import AgentResult, AnalysisRequest, AnalysisResponse, GradingBreakdown, RunStatus
+
+pytestmark = pytest.mark.anyio
+
+NOW = datetime.now(timezone.utc)
+
+
+def _run(
+    run_id: str, molecule: str, score: float, days_ago: float, status: str = "COMPLETED", indication: str = "Pain"
+) -> RunStatus:
+    grading = GradingBreakdown(
+        market_demand=score, production_feasibility=score, demographics=score,
+        patents_and_trials=score, competition=score, overall_score=score,
+    )
+    result = AgentResult(
+        agent_name="DemographicAgent",
+        summary="demographics",
+        raw_data=DemographicData(0.8, 0.7, 0.6, demographic_overall_score=score),
+        generated_at=NOW,
+        input_fingerprint="fp",
+    )
+    created = NOW - timedelta(days=days_ago)
+    return RunStatus(
+        run_id=run_id,
+        status=status,
+        request=AnalysisRequest(query="screen", molecule_name=molecule, target_indication=indication),
+        created_at=created,
+        updated_at=created,
+        response=AnalysisResponse(run_id=run_id, grading=grading, results=[result])
+        if status == "COMPLETED"
+        else None,
+    )
+
+
+@pytest.fixture
+async def store(tmp_path):
+    store = SQLiteRunStore(tmp_path / "runs.sqlite", flush_interval=60)
+    await store.start()
+    yield store
+    await store.close()
+
+
+async def test_runs_round_trip_before_and_after_flush(store):
+    run = _run("r1", "Ibuprofen", 0.7, 0)
+    await store.save(run)
+    assert await store.get("r1") is run  # pending, not written yet
+    await store.flush()
+    stored = await store.get("r1")
+    assert stored == run
+    assert isinstance(stored.response.results[0].raw_data, DemographicData)
+    assert await store.get("missing") is None
+
+
+async def test_top_molecules_and_score_trend(store):
+    for run in (
+        _run("a1", "Ibuprofen", 0.6, 3),
+        _run("a2", "Ibuprofen", 0.8, 1),
+        _run("b1", "Naproxen", 0.9, 2),
+        _run("c1", "Aspirin", 0.95, 40),  # outside the window
+        _run("d1", "Celecoxib", 0.99, 0, status="FAILED"),
+    ):
+        await store.save(run)
+
+    top = await store.top_molecules(days=30, limit=5)
+    assert [(m.molecule_name, m.best_score, m.runs) for m in top] == [("Naproxen", 0.9, 1), ("Ibuprofen", 0.8, 2)]
+    assert top[1].latest_score == 0.8
+
+    trend = await store.score_trend("ibuprofen", bucket="day")
+    assert [(p.runs, p.avg_score) for p in trend] == [(1, 0.6), (1, 0.8)]
+    assert trend[0].period == (NOW - timedelta(days=3)).strftime("%Y-%m-%d")
+
+    latest = await store.latest_graded()
+    assert [row["run_id"] for row in latest] == ["a2", "b1", "c1"]
+    assert isinstance(latest[0]["results"]["DemographicAgent"], DemographicData)
+
+
+async def test_top_molecules_latest_score_respects_the_filters(store):
+    # Same molecule, same instant: the latest run must come from the filtered indication
+    for run in (
+        _run("pain", "Ibuprofen", 0.9, 1),
+        _run("fever", "Ibuprofen", 0.2, 1, indication="Fever"),
+        _run("failed", "Naproxen", 0.0, 1, status="FAILED"),
+        _run("naproxen", "Naproxen", 0.5, 1, indication="Fever"),
+    ):
+        await store.save(run)
+
+    (pain,) = await store.top_molecules(indication="pain")
+    assert (pain.molecule_name, pain.best_score, pain.latest_score, pain.runs) == ("Ibuprofen", 0.9, 0.9, 1)
+    fever = await store.top_molecules(indication="Fever")
+    assert [(m.molecule_name, m.latest_score) for m in fever] == [("Naproxen", 0.5), ("Ibuprofen", 0.2)]
+
+
+async def test_prune_deletes_only_old_finished_runs(store):
+    for run in (
+        _run("old", "Ibuprofen", 0.6, 400),
+        _run("old-failed", "Naproxen", 0.5, 400, status="FAILED"),
+        _run("old-running", "Aspirin", 0.5, 400, status="RUNNING"),
+        _run("new", "Ibuprofen", 0.8, 1),
+    ):
+        await store.save(run)
+    await store.flush()
+
+    assert await store.prune(NOW - timedelta(days=365)) == 2
+    assert [run_id for run_id in ("old", "old-failed", "old-running", "new") if await store.get(run_id)] == [
+        "old-running",
+        "new",
+    ]
+    assert store._run("SELECT run_id FROM agent_results") == [("new",)]
+
+
+async def test_retention_prunes_in_the_background(tmp_path):
+    store = SQLiteRunStore(tmp_path / "runs.sqlite", retention_days=30, prune_interval=0.01)
+    await store.start()
+    try:
+        await store.save(_run("old", "Ibuprofen", 0.6, 60))
+        await store.flush()
+        for _ in range(100):
+            if await store.get("old") is None:
+                break
+            await asyncio.sleep(0.01)
+        assert await store.get("old") is None
+    finally:
+        await store.close()
+
+
@@ -0,0 +1,63 @@
+# backend/tests/test_vector_index.py
+from app.services.vector_index import VectorIndex, load_jsonl
+
+TOPICS = ["statin", "gliptin", "ibuprofen", "insulin", "vaccine", "antibody", "biosimilar", "inhaler"]
+
+
+def _passages(n: int):
+    for i in range(n):
+        topic = TOPICS[i % len(TOPICS)]
+        yield f"doc-{i}", f"{topic} dossier {i} manufacturing notes for {topic} plant {i // len(TOPICS)}", {"n": i}
+
+
+def test_round_trip_with_growth_and_reload(tmp_path):
+    index = VectorIndex(tmp_path, initial_capacity=4)
+    assert index.upsert(_passages(40), batch_size=7) == 40
+    assert index.capacity == 64 and len(index) == 40
+
+    hits = index.search("statin dossier 8 manufacturing notes for statin plant 1", k=3)
+    assert hits[0].id == "doc-8" and hits[0].metadata == {"n": 8}
+    assert hits[0].score > hits[1].score
+    index.close()
+
+    # The memory-mapped vectors and the manifest bring the same index back
+    reopened = VectorIndex(tmp_path)
+    assert (reopened.count, reopened.capacity) == (40, 64)
+    assert reopened.search("statin dossier 8 manufacturing notes for statin plant 1", k=1)[0].id == "doc-8"
+    reopened.close()
+
+
+def test_upsert_replaces_and_delete_excludes(tmp_path):
+    index = VectorIndex(tmp_path)
+    index.upsert(_passages(16))
+    index.upsert([("doc-0", "inhaler device patent", {"n": "replaced"})])
+    assert len(index) == 16 and index.count == 16
+    assert index.search("inhaler device patent", k=1)[0].metadata == {"n": "replaced"}
+
+    assert index.delete(["doc-0", "missing"]) == 1
+    assert "doc-0" not in {h.id for h in index.search("inhaler device patent", k=16)}
+    assert len(index) == 15
+    index.close()
+
+
+def test_trained_index_recalls_exact_neighbours(tmp_path):
+    index = VectorIndex(tmp_path, train_threshold=200)
+    index.upsert(_passages(400))
+    assert index._centroids is not None
+    index.delete(["doc-3"])
+    index.upsert([("late", "gliptin dossier late manufacturing notes", {})])  # assigned without a rebuild
+
+    # Probing every list is exact, so each passage's own text finds it first
+    for i in range(0, 400, 37):
+        query = f"{TOPICS[i % len(TOPICS)]} dossier {i} manufacturing notes"
+        assert index.search(query, k=1, nprobe=len(index._centroids))[0].id == f"doc-{i}"
+    probed = {h.id for h in index.search("ibuprofen dossier 3 manufacturing notes", k=50, nprobe=4)}
+    assert "doc-3" not in probed
+    assert index.search("gliptin dossier late manufacturing notes", k=1)[0].id == "late"
+    index.close()
+
+
+def test_load_jsonl_splits_metadata(tmp_path):
+    path = tmp_path / "docs.jsonl"
+    path.write_text('{"id": 1, "text": "statin", "source": "dossier"}\n\n')
+    assert list(load_jsonl(path)) == [("1", "statin", {"source": "dossier"})]